@@ -0,0 +1,138 @@
+"""
+Проверка того, что задержка обработчиков не растет во время тяжелой выгрузки /export.
+
+Обработчик имитируется операциями асинхронного доступа к базе данных, которые выполняет
+cmd_playlist: чтение сохраненного плейлиста и запись ответа. Операции выполняются с заданным
+интервалом, и для каждой измеряется время от запланированного запуска до завершения,
+то есть с учетом задержки цикла событий.
+
+Режимы:
+    idle      — без выгрузки;
+    export    — одновременно выполняется AsyncDataBase.export_playlist_info (поток чтения);
+    blocking  — выгрузка вызывается прямо в корутине, как вызывались запросы SQLite до AsyncDataBase.
+
+Проверка: если выполнены режимы idle и export, p99 задержки в режиме export не должен превышать
+p99 в режиме idle больше чем на --max-p99-increase миллисекунд; иначе скрипт завершается с кодом 1,
+поэтому его можно запускать в CI как проверку.
+
+Запуск из корня репозитория (рядом с .env):
+    python telegram_bot/benchmarks/bench_database_concurrency.py --rows 100000
+    python telegram_bot/benchmarks/bench_database_concurrency.py --modes idle export --max-p99-increase 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.bench_handlers import fill_playlist_info, percentile
+
+
+async def handler_operations(adb, rows: int, operations: int, interval: float) -> list[float]:
+    """Выполняет operations операций обработчика с интервалом interval и возвращает их задержки"""
+    latencies: list[float] = []
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    for number in range(operations):
+        scheduled_at = started_at + number * interval
+        await asyncio.sleep(max(scheduled_at - loop.time(), 0))
+        stored = await adb.get_playlist_info(f'PL{number * 7919 % rows:032d}')
+        if stored is not None:
+            await adb.save_playlist_info(stored[0])
+        latencies.append(loop.time() - scheduled_at)
+    return latencies
+
+
+async def run_mode(adb, mode: str, args: argparse.Namespace) -> dict:
+    from service.telegram_db_excel_service import build_excel_file
+
+    async def export() -> float:
+        # Выгрузка начинается после первых операций, чтобы они попали в интервал выгрузки
+        await asyncio.sleep(args.interval * 5)
+        started_at = perf_counter()
+        if mode == 'export':
+            excel_path = await adb.export_playlist_info()
+        else:
+            excel_path = build_excel_file(adb.database.path_database)
+        os.remove(excel_path)
+        return perf_counter() - started_at
+
+    tasks = [handler_operations(adb, args.rows, args.operations, args.interval)]
+    if mode != 'idle':
+        tasks.append(export())
+    latencies, *export_time = await asyncio.gather(*tasks)
+    await adb.flush()
+    return {
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'max_ms': round(max(latencies) * 1000, 1),
+        'export_s': round(export_time[0], 2) if export_time else None,
+    }
+
+
+def check_latency(results: dict[str, dict], max_increase_ms: float) -> bool:
+    """
+    Проверяет, что выгрузка не увеличила задержку обработчиков.
+
+    Args:
+        results (dict[str, dict]): Результаты по режимам.
+        max_increase_ms (float): Допустимое увеличение p99 в режиме export относительно idle, мс.
+
+    Returns:
+        bool: True, если проверка пройдена или режимы idle и export не выполнялись.
+    """
+    if 'idle' not in results or 'export' not in results:
+        return True
+    increase = results['export']['p99_ms'] - results['idle']['p99_ms']
+    passed = increase <= max_increase_ms
+    print(
+        f'{"OK" if passed else "FAIL"}: p99 во время выгрузки выше, чем без нее, на {increase:.1f} мс '
+        f'(допустимо {max_increase_ms:.1f} мс)'
+    )
+    return passed
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    from models.async_methods import AsyncDataBase
+    from models.methods import DataBase
+
+    database = DataBase()
+    database.flush()
+    fill_playlist_info(database.path_database, args.rows)
+    adb = AsyncDataBase(database)
+    results: dict[str, dict] = {}
+    try:
+        for mode in args.modes:
+            results[mode] = await run_mode(adb, mode, args)
+            print(f'{mode:<9} {results[mode]}')
+    finally:
+        await adb.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='строк в playlist_info')
+    parser.add_argument('--operations', type=int, default=400, help='операций обработчика на режим')
+    parser.add_argument('--interval', type=float, default=0.01, help='интервал между операциями, с')
+    parser.add_argument('--modes', nargs='+', default=['idle', 'export', 'blocking'])
+    parser.add_argument(
+        '--max-p99-increase', type=float, default=50.0,
+        help='допустимое увеличение p99 в режиме export относительно idle, мс'
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['PATH_DATABASE'] = os.path.join(directory, 'bench.sqlite3')
+        results = asyncio.run(run(args))
+
+    if not check_latency(results, args.max_p99_increase):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
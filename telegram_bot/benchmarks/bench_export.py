@@ -0,0 +1,121 @@
+"""
+Бенчмарк экспорта /export: прирост пиковой памяти процесса и время построения файла Excel.
+
+Запуск из корня репозитория (рядом с .env):
+    python telegram_bot/benchmarks/bench_export.py --sizes 10000 100000 1000000
+
+Для сравнения тот же набор данных выгружается прежним способом (fetchall и обычная
+книга openpyxl) для размеров не больше --legacy-max.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from openpyxl import Workbook
+
+from models.methods import PLAYLIST_INFO_FIELDS
+from service.telegram_db_excel_service import build_excel_file
+
+
+def create_database(path_database: str, rows: int) -> None:
+    """Создает базу данных с таблицей playlist_info из rows синтетических строк"""
+    columns = ', '.join(PLAYLIST_INFO_FIELDS)
+    with sqlite3.connect(path_database) as connection:
+        connection.execute(f'CREATE TABLE playlist_info (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})')
+        connection.executemany(
+            f'INSERT INTO playlist_info ({columns}) VALUES ({", ".join("?" * len(PLAYLIST_INFO_FIELDS))})',
+            (
+                (
+                    'youtube#playlist', f'etag{i}', f'PL{i:032d}', '2024-01-01T00:00:00Z', 'UC' + 'x' * 22,
+                    f'Плейлист №{i}', f'https://i.ytimg.com/vi/{i}/sddefault.jpg', 640, 480, 'Канал',
+                    'public', i % 500, f'{i % 100}:{i % 60}:{i % 60}'
+                )
+                for i in range(rows)
+            )
+        )
+
+
+def build_excel_file_legacy(path_database: str) -> str:
+    """Прежний способ экспорта: вся таблица и вся книга в памяти"""
+    connection = sqlite3.connect(path_database)
+    try:
+        workbook = Workbook()
+        cursor = connection.execute('SELECT * FROM playlist_info')
+        data = cursor.fetchall()
+        sheet = workbook.create_sheet(title='Playlist Info')
+        for col, header in enumerate((description[0] for description in cursor.description), start=1):
+            sheet.cell(row=1, column=col, value=header)
+        for row, row_data in enumerate(data, start=2):
+            for col, value in enumerate(row_data, start=1):
+                sheet.cell(row=row, column=col, value=value)
+        workbook.remove(workbook['Sheet'])
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as excel_file:
+            workbook.save(excel_file)
+        return excel_file.name
+    finally:
+        connection.close()
+
+
+ENGINES = {
+    'stream': build_excel_file,
+    'legacy': build_excel_file_legacy,
+}
+
+
+def run_engine(name: str, path_database: str, results: multiprocessing.Queue) -> None:
+    """Выполняет экспорт в отдельном процессе и передает время, прирост пиковой памяти процесса и размер файла"""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started_at = perf_counter()
+    excel_path = ENGINES[name](path_database)
+    elapsed = perf_counter() - started_at
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    size = os.path.getsize(excel_path)
+    os.remove(excel_path)
+    results.put((elapsed, peak / 2 ** 10, size))
+
+
+def measure(name: str, path_database: str) -> tuple[float, float, int]:
+    """Возвращает время выполнения в секундах, прирост пиковой памяти в МиБ и размер файла в байтах.
+
+    Каждый замер выполняется в новом процессе, чтобы пиковая память не наследовалась от предыдущих.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run_engine, args=(name, path_database, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max', type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f'{"строк":>10} {"способ":>10} {"время, с":>10} {"пик, МиБ":>10} {"файл, МиБ":>10}')
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.sizes:
+            path_database = os.path.join(directory, f'bench_{rows}.sqlite3')
+            create_database(path_database, rows)
+
+            engines = ['stream']
+            if rows <= args.legacy_max:
+                engines.append('legacy')
+
+            for name in engines:
+                elapsed, peak, size = measure(name, path_database)
+                print(f'{rows:>10} {name:>10} {elapsed:>10.2f} {peak:>10.1f} {size / 2 ** 20:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
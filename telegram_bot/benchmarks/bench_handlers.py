@@ -0,0 +1,217 @@
+"""
+Офлайн-бенчмарк обработчиков бота: пропускная способность и задержки p50/p95/p99.
+
+Синтетические обновления подаются настоящему handler_router через Dispatcher.feed_update.
+Бот обращается к фейковым YouTube Data API и Telegram Bot API (benchmarks/fake_servers.py),
+запущенным в отдельном процессе, и к временной базе данных. Ключи и сеть не нужны.
+
+Сценарии: /playlist для плейлистов заданных размеров (каждый запрос — новый плейлист,
+то есть холодный кеш) и /export при заданном количестве строк в базе данных.
+
+Результат сохраняется в JSON (--output); с --baseline выводится сравнение с прошлым запуском.
+
+Запуск из корня репозитория (рядом с .env):
+    python telegram_bot/benchmarks/bench_handlers.py --output bench.json
+    python telegram_bot/benchmarks/bench_handlers.py --baseline bench.json --output bench2.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.fake_servers import FakeYouTubeOptions, make_playlist_id, run_fake_servers
+from benchmarks.synthetic_updates import make_message_update
+
+
+def free_port() -> int:
+    """Возвращает свободный TCP-порт на 127.0.0.1"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Перцентиль по методу ближайшего ранга"""
+    ordered = sorted(values)
+    return ordered[max(int(len(ordered) * share + 0.999999) - 1, 0)]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int) -> dict:
+    """Сводка сценария: количество, пропускная способность и задержки в миллисекундах"""
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 3),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+async def drive(dp, bot, texts: list[str], concurrency: int) -> dict:
+    """Подает обновления с текстами texts не более concurrency одновременно и возвращает сводку"""
+    from aiogram.types import Update
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def feed(chat_id: int, text: str) -> None:
+        nonlocal errors
+        update = Update.model_validate(make_message_update(chat_id=chat_id, text=text), context={'bot': bot})
+        async with semaphore:
+            started_at = perf_counter()
+            try:
+                await dp.feed_update(bot, update)
+            except Exception:
+                errors += 1
+            latencies.append(perf_counter() - started_at)
+
+    started_at = perf_counter()
+    await asyncio.gather(*(feed(1000 + index, text) for index, text in enumerate(texts)))
+    return summarize(latencies, perf_counter() - started_at, errors)
+
+
+def fill_playlist_info(path_database: str, rows: int) -> None:
+    """Заменяет содержимое playlist_info на rows синтетических строк"""
+    from models.methods import PLAYLIST_INFO_FIELDS
+
+    columns = ', '.join(PLAYLIST_INFO_FIELDS)
+    with sqlite3.connect(path_database) as connection:
+        connection.execute('DELETE FROM playlist_info')
+        connection.executemany(
+            f'INSERT INTO playlist_info ({columns}) VALUES ({", ".join("?" * len(PLAYLIST_INFO_FIELDS))})',
+            (
+                (
+                    'youtube#playlist', f'etag{i}', f'PL{i:032d}', '2024-01-01T00:00:00Z', 'UC' + 'x' * 22,
+                    f'Плейлист №{i}', 'https://i.ytimg.com/vi/x/sddefault.jpg', 640, 480, 'Канал',
+                    'public', i % 500, f'{i % 100}:{i % 60}:{i % 60}'
+                )
+                for i in range(rows)
+            )
+        )
+
+
+async def run_scenarios(args: argparse.Namespace, path_database: str) -> dict:
+    """Выполняет сценарии на настоящем handler_router"""
+    from aiogram import Dispatcher
+    from config.config import bot
+    from handlers.handler import get_database, handler_router
+
+    dp = Dispatcher()
+    dp.include_router(handler_router)
+    await dp.emit_startup(bot=bot, dispatcher=dp)
+
+    results = {}
+    try:
+        for size in args.sizes:
+            texts = [f'https://www.youtube.com/playlist?list={make_playlist_id(size)}' for _ in range(args.requests)]
+            results[f'playlist_{size}'] = await drive(dp, bot, texts, args.concurrency)
+            print(f'playlist_{size}: {results[f"playlist_{size}"]}')
+
+        for rows in args.export_rows:
+            await asyncio.to_thread(get_database().flush)
+            fill_playlist_info(path_database, rows)
+            results[f'export_{rows}'] = await drive(dp, bot, ['/export'] * args.export_requests, 1)
+            print(f'export_{rows}: {results[f"export_{rows}"]}')
+    finally:
+        await dp.emit_shutdown(bot=bot, dispatcher=dp)
+        await bot.session.close()
+    return results
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Выводит отношение текущих показателей к показателям прошлого запуска"""
+    print(f'\n{"scenario":<16} {"p50":>14} {"p95":>14} {"throughput":>16}')
+    for name, current in results.items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        cells = [
+            f'{previous[key]:.0f}->{current[key]:.0f}'
+            for key in ('p50_ms', 'p95_ms', 'throughput_rps')
+        ]
+        print(f'{name:<16} {cells[0]:>14} {cells[1]:>14} {cells[2]:>16}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 500, 5000])
+    parser.add_argument('--requests', type=int, default=20, help='запросов /playlist на каждый размер')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--export-rows', type=int, nargs='*', default=[1000, 10000, 50000])
+    parser.add_argument('--export-requests', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.05, help='задержка фейкового YouTube, с')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--unavailable-every', type=int, default=0)
+    parser.add_argument('--quota-rate', type=float, default=1000.0, help='YOUTUBE_QUOTA_RATE для бота')
+    parser.add_argument('--output', help='файл JSON с результатами')
+    parser.add_argument('--baseline', help='файл JSON прошлого запуска для сравнения')
+    args = parser.parse_args()
+
+    options = FakeYouTubeOptions(
+        latency=args.latency,
+        page_size=args.page_size,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        unavailable_every=args.unavailable_every
+    )
+    youtube_port, telegram_port = free_port(), free_port()
+    context = multiprocessing.get_context('spawn')
+    ready = context.Event()
+    servers = context.Process(target=run_fake_servers, args=(options, youtube_port, telegram_port, ready), daemon=True)
+    servers.start()
+    ready.wait(30)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path_database = os.path.join(directory, 'bench.sqlite3')
+        # Переменные окружения имеют приоритет над .env: бот работает с заменителями и временной базой
+        os.environ.update({
+            'YOUTUBE_API_ENDPOINT': f'http://127.0.0.1:{youtube_port}/',
+            'TELEGRAM_API_BASE_URL': f'http://127.0.0.1:{telegram_port}',
+            'API_KEY_SERVICE_YOUTUBE': 'A' * 39,
+            'PATH_DATABASE': path_database,
+            'YOUTUBE_CACHE_PATH': os.path.join(directory, 'youtube_cache.sqlite3'),
+            'YOUTUBE_QUOTA_RATE': str(args.quota_rate),
+            'YOUTUBE_QUOTA_BURST': str(max(int(args.quota_rate), 1)),
+            'YOUTUBE_DAILY_QUOTA': str(10 ** 9),
+        })
+        try:
+            results = asyncio.run(run_scenarios(args, path_database))
+        finally:
+            servers.terminate()
+            servers.join()
+
+    report = {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'options': {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')},
+        },
+        'scenarios': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f'Результаты сохранены в {args.output}')
+    if args.baseline:
+        compare(results, json.loads(Path(args.baseline).read_text(encoding='utf-8')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Бенчмарк обхода плейлиста: конвейер playlistItems.list → videos.list при разной глубине.
+
+Плейлисты заданных размеров обходятся клиентом YouTubeAPIClientV3 через фейковый YouTube
+(benchmarks/fake_servers.py) без базы данных и без кеша ответов, то есть каждый раз полностью.
+Глубина 0 — прежний последовательный обход: страница, затем продолжительность ее видео.
+Для сравнения выводится нижняя граница — длина цепочки страниц: страниц × задержка сервера.
+
+Запуск из корня репозитория (рядом с .env):
+    python telegram_bot/benchmarks/bench_pagination.py --sizes 500 5000 --depths 0 1 2 4
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.bench_handlers import free_port, percentile
+from benchmarks.fake_servers import FakeYouTubeOptions, make_playlist_id, run_fake_servers
+
+
+def walk_times(depth: int, size: int, repeats: int) -> tuple[list[float], str]:
+    """Обходит repeats новых плейлистов из size видео при глубине конвейера depth"""
+    from config.config import load_config_service_youtube
+    from service.youtubeapiclientv3 import YouTubeAPIClientV3
+
+    os.environ['YOUTUBE_PIPELINE_DEPTH'] = str(depth)
+    load_config_service_youtube.cache_clear()
+    client = YouTubeAPIClientV3()
+    times = []
+    duration = ''
+    try:
+        for _ in range(repeats):
+            started_at = perf_counter()
+            duration = client.playlist.get_info(make_playlist_id(size))['duration']
+            times.append(perf_counter() - started_at)
+    finally:
+        client.close()
+    return times, duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 5000])
+    parser.add_argument('--depths', type=int, nargs='+', default=[0, 1, 2, 4])
+    parser.add_argument('--repeats', type=int, default=3, help='обходов на каждую пару размер/глубина')
+    parser.add_argument('--latency', type=float, default=0.05, help='задержка фейкового YouTube, с')
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    options = FakeYouTubeOptions(latency=args.latency, page_size=args.page_size)
+    youtube_port, telegram_port = free_port(), free_port()
+    context = multiprocessing.get_context('spawn')
+    ready = context.Event()
+    servers = context.Process(target=run_fake_servers, args=(options, youtube_port, telegram_port, ready), daemon=True)
+    servers.start()
+    ready.wait(30)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update({
+            'YOUTUBE_API_ENDPOINT': f'http://127.0.0.1:{youtube_port}/',
+            'API_KEY_SERVICE_YOUTUBE': 'A' * 39,
+            'PATH_DATABASE': os.path.join(directory, 'bench.sqlite3'),
+            'YOUTUBE_CACHE_PATH': '',
+            'YOUTUBE_QUOTA_RATE': '100000',
+            'YOUTUBE_QUOTA_BURST': '100000',
+            'YOUTUBE_DAILY_QUOTA': str(10 ** 9),
+        })
+        try:
+            for size in args.sizes:
+                pages = -(-size // args.page_size)
+                print(f'{size} видео, {pages} страниц, цепочка страниц ≈ {pages * args.latency:.2f} с')
+                for depth in args.depths:
+                    times, duration = walk_times(depth, size, args.repeats)
+                    print(
+                        f'  глубина {depth}: p50 {percentile(times, 0.5):.2f} с, '
+                        f'max {max(times):.2f} с, продолжительность {duration}'
+                    )
+        finally:
+            servers.terminate()
+            servers.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Микробенчмарк извлечения идентификаторов плейлистов из текста сообщений.
+
+Сравнивается прежний путь сообщения (urlparse/parse_qs в фильтре и повторно в клиенте
+YouTube API) с одним проходом предкомпилированного выражения из utils/playlist_identifier.py,
+результат которого фильтр передает обработчику. Корпус — типичные тексты сообщений
+пользователей: ссылки разных видов, ссылки с лишними параметрами, обычный текст без ссылок.
+
+Запуск из корня репозитория:
+    python telegram_bot/benchmarks/bench_playlist_identifier.py --number 20000
+"""
+import argparse
+import sys
+from pathlib import Path
+from timeit import timeit
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.playlist_identifier import extract_playlist_identifiers, is_playlist_identifier
+
+
+CORPUS = [
+    'https://www.youtube.com/playlist?list=PLQOaTSbfxUtCrKs0nicOg2npJQYSPGO9r',
+    'https://youtube.com/playlist?list=PLQOaTSbfxUtCrKs0nicOg2npJQYSPGO9r&si=Xk2c9Zq_3VtqYb1R',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLQOaTSbfxUtCrKs0nicOg2npJQYSPGO9r&index=3',
+    'https://m.youtube.com/playlist?list=PL590L5WQmH8fJ54F369BLDSqIwcs-TCfs',
+    'https://music.youtube.com/playlist?list=OLAK5uy_kxyzabcdefghijklmnopqrstuvwxyz0123',
+    'https://youtu.be/dQw4w9WgXcQ?list=PL590L5WQmH8fJ54F369BLDSqIwcs-TCfs',
+    'PL590L5WQmH8fJ54F369BLDSqIwcs-TCfs',
+    'Посмотри курс https://www.youtube.com/playlist?list=PLQOaTSbfxUtCrKs0nicOg2npJQYSPGO9r — очень полезный',
+    'Вот мои курсы:\n'
+    '1. https://www.youtube.com/playlist?list=PLQOaTSbfxUtCrKs0nicOg2npJQYSPGO9r\n'
+    '2. https://www.youtube.com/playlist?list=PL590L5WQmH8fJ54F369BLDSqIwcs-TCfs\n'
+    '3. https://www.youtube.com/playlist?list=PLlrxD0HtieHhS8VzuMCfQD4uJ9yne1mE6',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=RDdQw4w9WgXcQ&start_radio=1',
+    'Привет! Сколько длится этот плейлист?',
+    'как пользоваться ботом',
+    'спасибо',
+    'https://example.com/page?list=PLQOaTSbfxUtCrKs0nicOg2npJQYSPGO9r',
+    'Очень длинное сообщение без ссылок. ' * 20,
+]
+
+
+def legacy_filter(text: str) -> bool:
+    """Прежний PlaylistIdentifierFilter: весь текст разбирается как одна ссылка"""
+    query_params = parse_qs(urlparse(text).query)
+    if 'list' not in query_params:
+        return False
+    playlist_identifier = query_params['list'][0]
+    return playlist_identifier.startswith('PL') and len(playlist_identifier) == 34
+
+
+def legacy_extract(text: str) -> str:
+    """Прежнее извлечение идентификатора в клиенте YouTube API: повторный разбор того же текста"""
+    query_params = parse_qs(urlparse(text).query)
+    return query_params['list'][0] if 'list' in query_params else text
+
+
+def legacy_pipeline(text: str) -> list[str]:
+    return [legacy_extract(text)] if legacy_filter(text) else []
+
+
+def current_pipeline(text: str) -> list[str]:
+    # Фильтр находит идентификаторы, клиент только проверяет уже извлеченный идентификатор
+    playlist_identifiers = extract_playlist_identifiers(text)
+    for playlist_identifier in playlist_identifiers:
+        is_playlist_identifier(playlist_identifier)
+    return playlist_identifiers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20000, help='проходов по корпусу')
+    args = parser.parse_args()
+
+    matched_legacy = sum(bool(legacy_pipeline(text)) for text in CORPUS)
+    matched_current = sum(bool(current_pipeline(text)) for text in CORPUS)
+    print(f'Распознано сообщений: прежний способ {matched_legacy}, текущий {matched_current} из {len(CORPUS)}')
+
+    for title, pipeline in (('legacy', legacy_pipeline), ('current', current_pipeline)):
+        elapsed = timeit(lambda: [pipeline(text) for text in CORPUS], number=args.number)
+        print(f'{title:<8} {elapsed / (args.number * len(CORPUS)) * 1e6:>8.2f} мкс на сообщение')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Бенчмарк времени запуска бота: от начала импорта до момента перед запуском опроса обновлений.
+
+Каждый замер выполняется в новом процессе интерпретатора: импортируется bot.py, создается
+диспетчер с роутерами — все, что main() делает до первого обращения к Telegram. Отдельно
+измеряется создание клиента YouTube API и базы данных (в боте его выполняет обработчик запуска
+в отдельном потоке) и стоимость создания ресурса YouTube API через build() и через build_from_document().
+
+Запуск из корня репозитория (рядом с .env):
+    python telegram_bot/benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+STARTUP_PROBE = f"""
+import json, sys
+from time import perf_counter
+started_at = perf_counter()
+sys.path.insert(0, {str(ROOT)!r})
+import bot
+from aiogram import Dispatcher
+dp = Dispatcher()
+dp.include_router(bot.handler_router)
+ready_at = perf_counter()
+from handlers.handler import get_service
+get_service()
+first_use_at = perf_counter()
+print(json.dumps({{'import_to_polling': ready_at - started_at, 'first_use': first_use_at - ready_at}}))
+"""
+
+RESOURCE_PROBE = f"""
+import json, sys
+from time import perf_counter
+sys.path.insert(0, {str(ROOT)!r})
+from googleapiclient.discovery import build, build_from_document
+from service.youtubeapiclientv3 import load_discovery_document
+keys = ['A' * 39, 'B' * 39, 'C' * 39]
+started_at = perf_counter()
+for key in keys:
+    build(serviceName='youtube', version='v3', developerKey=key)
+built_at = perf_counter()
+for key in keys:
+    build_from_document(load_discovery_document(), developerKey=key)
+from_document_at = perf_counter()
+print(json.dumps({{'build': built_at - started_at, 'build_from_document': from_document_at - built_at}}))
+"""
+
+
+def run_probe(code: str) -> dict:
+    """Выполняет замер в новом процессе интерпретатора и возвращает его результат"""
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    for title, code in (('startup', STARTUP_PROBE), ('youtube resource, 3 keys', RESOURCE_PROBE)):
+        results = [run_probe(code) for _ in range(args.runs)]
+        print(f'{title} (median of {args.runs} runs):')
+        for metric in results[0]:
+            print(f'  {metric:<20} {statistics.median(result[metric] for result in results) * 1000:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Бенчмарк многопроцессного режима: пропускная способность при 1 и N рабочих процессах.
+
+Синтетические обновления из множества чатов проходят через Supervisor так же, как в рабочем
+режиме. Обработчик вместо запросов к YouTube API выполняет работу процессора, сопоставимую
+с подсчетом продолжительности большого плейлиста (разбор ISO 8601 длительностей видео).
+
+Запуск из корня репозитория (рядом с .env):
+    python telegram_bot/benchmarks/bench_supervisor.py --updates 400 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aiogram import Dispatcher, Router
+from aiogram.types import Message
+from isodate import parse_duration
+
+from benchmarks.synthetic_updates import make_message_update
+from supervisor import Supervisor
+
+
+# Количество видео в «плейлисте», длительности которых суммирует обработчик
+VIDEOS_PER_UPDATE = 5000
+
+
+def build_bench_dispatcher(index: int) -> Dispatcher:
+    """Диспетчер с обработчиком, нагружающим процессор и не обращающимся к сети"""
+    router = Router()
+
+    @router.message()
+    async def sum_durations(message: Message) -> None:
+        sum(parse_duration(f'PT{i % 3}H{i % 60}M{i % 59}S').total_seconds() for i in range(VIDEOS_PER_UPDATE))
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+def measure(workers: int, updates: int, chats: int) -> float:
+    """Возвращает время обработки updates обновлений пулом из workers процессов без учета запуска"""
+    supervisor = Supervisor(workers, dispatcher_factory=build_bench_dispatcher)
+    supervisor.start()
+    started_at = perf_counter()
+    for i in range(updates):
+        supervisor.dispatch(make_message_update(chat_id=1000 + i % chats, text='/playlist'))
+    supervisor.stop()
+    return perf_counter() - started_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', type=int, default=400)
+    parser.add_argument('--chats', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    print(f'{"workers":>8} {"time, s":>10} {"updates/s":>10} {"speedup":>8}')
+    baseline = None
+    for workers in args.workers:
+        elapsed = measure(workers, args.updates, args.chats)
+        baseline = baseline or elapsed
+        print(f'{workers:>8} {elapsed:>10.2f} {args.updates / elapsed:>10.1f} {baseline / elapsed:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
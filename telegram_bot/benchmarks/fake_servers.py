@@ -0,0 +1,200 @@
+"""
+Локальные заменители YouTube Data API и Telegram Bot API для бенчмарков.
+
+Фейковый YouTube отвечает на playlists.list, playlistItems.list (с постраничной выдачей)
+и videos.list. Размер плейлиста закодирован в его идентификаторе (см. make_playlist_id),
+поэтому сервер не хранит состояния. Задержка, размер страницы, доля недоступных видео
+и доля ответов с ошибкой задаются параметрами FakeYouTubeOptions.
+
+Фейковый Telegram принимает любые методы Bot API и возвращает правдоподобный результат,
+чтобы настоящие обработчики handler_router работали без сети.
+
+Бот направляется на заменители переменными окружения YOUTUBE_API_ENDPOINT и TELEGRAM_API_BASE_URL.
+"""
+import asyncio
+import itertools
+import random
+from dataclasses import dataclass
+from time import time
+
+from aiohttp import web
+
+
+@dataclass
+class FakeYouTubeOptions:
+    """Параметры поведения фейкового YouTube Data API"""
+    latency: float = 0.05
+    page_size: int = 50
+    error_rate: float = 0.0
+    error_status: int = 500
+    unavailable_every: int = 0
+
+
+# Уникальная часть идентификаторов плейлистов в пределах процесса
+_playlist_seeds = itertools.count(random.randrange(16 ** 8))
+
+
+def make_playlist_id(size: int) -> str:
+    """
+    Создает идентификатор плейлиста из size видео, который понимает фейковый YouTube.
+
+    Формат: PL + 8 цифр размера + 24 шестнадцатеричных символа; у каждого плейлиста свои видео.
+    """
+    return f'PL{size:08d}{next(_playlist_seeds):024x}'
+
+
+def playlist_size(playlist_id: str) -> int | None:
+    """Возвращает размер плейлиста из идентификатора или None для неизвестного плейлиста"""
+    digits = playlist_id[2:10]
+    return int(digits) if playlist_id.startswith('PL') and digits.isdigit() else None
+
+
+def video_id(playlist_id: str, index: int) -> str:
+    """Идентификатор видео на позиции index плейлиста: 11 символов, как у YouTube"""
+    return f'{playlist_id[-6:]}{index:05d}'
+
+
+def error_response(status: int) -> web.Response:
+    """Ответ с ошибкой в формате Google API"""
+    reason, domain = ('quotaExceeded', 'youtube.quota') if status == 403 else ('backendError', 'global')
+    return web.json_response(
+        {'error': {'code': status, 'message': reason, 'errors': [{'reason': reason, 'domain': domain}]}},
+        status=status
+    )
+
+
+def build_fake_youtube_app(options: FakeYouTubeOptions) -> web.Application:
+    """
+    Создает приложение фейкового YouTube Data API v3.
+
+    Args:
+        options (FakeYouTubeOptions): Параметры поведения.
+
+    Returns:
+        web.Application: Приложение с маршрутами /youtube/v3/{playlists,playlistItems,videos}.
+    """
+    rng = random.Random(0)
+
+    async def prepare() -> web.Response | None:
+        if options.latency:
+            await asyncio.sleep(options.latency)
+        if options.error_rate and rng.random() < options.error_rate:
+            return error_response(options.error_status)
+        return None
+
+    async def playlists(request: web.Request) -> web.Response:
+        if (error := await prepare()) is not None:
+            return error
+        items = []
+        for playlist_id in request.query.get('id', '').split(','):
+            size = playlist_size(playlist_id)
+            if size is None:
+                continue
+            items.append({
+                'kind': 'youtube#playlist',
+                'etag': f'etag-{playlist_id}',
+                'id': playlist_id,
+                'snippet': {
+                    'publishedAt': '2024-01-01T00:00:00Z',
+                    'channelId': 'UC' + playlist_id[-22:],
+                    'title': f'Плейлист из {size} видео',
+                    'channelTitle': 'Фейковый канал',
+                    'thumbnails': {'standard': {'url': 'https://i.ytimg.com/vi/x/sddefault.jpg', 'width': 640, 'height': 480}},
+                },
+                'status': {'privacyStatus': 'public'},
+                'contentDetails': {'itemCount': size},
+            })
+        return web.json_response({'kind': 'youtube#playlistListResponse', 'items': items})
+
+    async def playlist_items(request: web.Request) -> web.Response:
+        if (error := await prepare()) is not None:
+            return error
+        playlist_id = request.query.get('playlistId', '')
+        size = playlist_size(playlist_id) or 0
+        start = int(request.query.get('pageToken') or 0)
+        end = min(start + min(int(request.query.get('maxResults', 5)), options.page_size), size)
+        response = {
+            'kind': 'youtube#playlistItemListResponse',
+            'items': [{'contentDetails': {'videoId': video_id(playlist_id, index)}} for index in range(start, end)],
+            'pageInfo': {'totalResults': size, 'resultsPerPage': options.page_size},
+        }
+        if end < size:
+            response['nextPageToken'] = str(end)
+        return web.json_response(response)
+
+    async def videos(request: web.Request) -> web.Response:
+        if (error := await prepare()) is not None:
+            return error
+        items = []
+        for requested_id in request.query.get('id', '').split(','):
+            index = int(requested_id[-5:]) if requested_id[-5:].isdigit() else 0
+            if options.unavailable_every and index % options.unavailable_every == options.unavailable_every - 1:
+                continue
+            items.append({'id': requested_id, 'contentDetails': {'duration': f'PT{index % 60}M{index % 59 + 1}S'}})
+        return web.json_response({'kind': 'youtube#videoListResponse', 'items': items})
+
+    app = web.Application()
+    app.router.add_get('/youtube/v3/playlists', playlists)
+    app.router.add_get('/youtube/v3/playlistItems', playlist_items)
+    app.router.add_get('/youtube/v3/videos', videos)
+    return app
+
+
+def build_fake_telegram_app(latency: float = 0.0) -> web.Application:
+    """
+    Создает приложение фейкового Telegram Bot API: /bot{token}/{method}.
+
+    Методы send* и edit* возвращают сообщение, остальные — True.
+
+    Args:
+        latency (float): Задержка ответа в секундах.
+
+    Returns:
+        web.Application: Приложение фейкового Bot API.
+    """
+    message_ids = itertools.count(1)
+
+    async def call_method(request: web.Request) -> web.Response:
+        # Тело читается целиком, как при настоящей отправке файлов
+        form = await request.post()
+        if latency:
+            await asyncio.sleep(latency)
+        method = request.match_info['method']
+        if not method.startswith(('send', 'edit')):
+            return web.json_response({'ok': True, 'result': True})
+        chat_id = int(form.get('chat_id', 0))
+        return web.json_response({'ok': True, 'result': {
+            'message_id': next(message_ids),
+            'date': int(time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'text': str(form.get('text', '')),
+        }})
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post('/bot{token}/{method}', call_method)
+    return app
+
+
+async def serve_fake_servers(options: FakeYouTubeOptions, youtube_port: int, telegram_port: int, ready=None) -> None:
+    """Запускает оба заменителя на 127.0.0.1 и работает до отмены"""
+    runners = []
+    for app, port in ((build_fake_youtube_app(options), youtube_port), (build_fake_telegram_app(), telegram_port)):
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host='127.0.0.1', port=port).start()
+        runners.append(runner)
+    if ready is not None:
+        ready.set()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def run_fake_servers(options: FakeYouTubeOptions, youtube_port: int, telegram_port: int, ready=None) -> None:
+    """Точка входа отдельного процесса с заменителями: не отнимает процессор у измеряемого бота"""
+    try:
+        asyncio.run(serve_fake_servers(options, youtube_port, telegram_port, ready))
+    except KeyboardInterrupt:
+        pass
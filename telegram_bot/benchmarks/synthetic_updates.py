@@ -0,0 +1,93 @@
+"""
+Генератор синтетических обновлений Telegram.
+
+Используется бенчмарками и для локальной проверки режима webhook: обновления в формате
+Bot API отправляются POST-запросами на сервер вебхука с секретным заголовком.
+
+Запуск из корня репозитория:
+    python telegram_bot/benchmarks/synthetic_updates.py --url http://127.0.0.1:8080/webhook \\
+        --secret <WEBHOOK_SECRET> --count 100 --text /help
+"""
+import argparse
+import asyncio
+import itertools
+from collections import Counter
+from time import perf_counter, time
+
+from aiohttp import ClientSession
+
+
+# Идентификаторы синтетических обновлений и сообщений
+_update_ids = itertools.count(1)
+
+
+def make_message_update(chat_id: int, text: str, update_id: int | None = None) -> dict:
+    """
+    Создает обновление с текстовым сообщением в личном чате в формате Bot API.
+
+    Args:
+        chat_id (int): Идентификатор чата, он же идентификатор пользователя.
+        text (str): Текст сообщения; команда в начале текста размечается сущностью bot_command.
+        update_id (int, optional): Идентификатор обновления. По умолчанию следующий по порядку.
+
+    Returns:
+        dict: Обновление, которое можно передать в Update.model_validate или отправить на вебхук.
+    """
+    update_id = update_id if update_id is not None else next(_update_ids)
+    message = {
+        'message_id': update_id,
+        'date': int(time()),
+        'chat': {'id': chat_id, 'type': 'private', 'username': f'user{chat_id}'},
+        'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Bench', 'username': f'user{chat_id}'},
+        'text': text,
+    }
+    if text.startswith('/'):
+        message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+    return {'update_id': update_id, 'message': message}
+
+
+async def post_updates(url: str, secret: str, updates: list[dict], concurrency: int) -> Counter:
+    """
+    Отправляет обновления на вебхук и возвращает количество ответов по HTTP-статусам.
+
+    Args:
+        url (str): Адрес вебхука.
+        secret (str): Значение заголовка X-Telegram-Bot-Api-Secret-Token.
+        updates (list[dict]): Обновления.
+        concurrency (int): Количество одновременных запросов.
+
+    Returns:
+        Counter: Количество ответов по статусам.
+    """
+    statuses: Counter = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {'X-Telegram-Bot-Api-Secret-Token': secret}
+
+    async with ClientSession() as session:
+        async def post(update: dict) -> None:
+            async with semaphore, session.post(url, json=update, headers=headers) as response:
+                statuses[response.status] += 1
+
+        await asyncio.gather(*(post(update) for update in updates))
+    return statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8080/webhook')
+    parser.add_argument('--secret', required=True)
+    parser.add_argument('--count', type=int, default=1)
+    parser.add_argument('--chats', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--text', default='/help')
+    args = parser.parse_args()
+
+    updates = [make_message_update(chat_id=1000 + i % args.chats, text=args.text) for i in range(args.count)]
+    started_at = perf_counter()
+    statuses = asyncio.run(post_updates(args.url, args.secret, updates, args.concurrency))
+    elapsed = perf_counter() - started_at
+    print(f'Отправлено {args.count} обновлений за {elapsed:.2f} с ({args.count / elapsed:.0f}/с): {dict(statuses)}')
+
+
+if __name__ == '__main__':
+    main()
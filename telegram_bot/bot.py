@@ -2,17 +2,18 @@
 from asyncio import run
 from aiogram import Dispatcher
 from config.config import bot
-from handlers.handler import handler_router
+from handlers.handler import handler_router, register_background_tasks
 from keyboards.set_menu import set_main_menu
-from config.config import load_config_telegram_bot
+from config.config import load_config_webhook
+from server.webhook import run_webhook
 from utils.logger import logger
 
 
 # Инициализируем журналирование с информационным сообщением о запуске бота
 logger.info('Starting bot')
 
-# Переменная для настройки телеграм бота
-config = load_config_telegram_bot('.env')
+# Переменная для настройки способа получения обновлений: polling или webhook
+config_webhook = load_config_webhook('.env')
 
 # Определяем главную функцию для запуска бота
 async def main() -> None:
@@ -25,9 +26,17 @@ async def main() -> None:
     # Включаем роутер обработчиков сообщений
     dp.include_router(handler_router)
     
+    # Сервер метрик Prometheus и фоновое обновление плейлистов запускаются и останавливаются вместе с диспетчером
+    register_background_tasks(dp)
+    
     # Устанавливаем основное меню команд
     await set_main_menu(bot)
     
+    # В режиме webhook Telegram сам присылает обновления на наш HTTP-сервер
+    if config_webhook.mode == 'webhook':
+        await run_webhook(dp, bot, config_webhook.webhook)
+        return
+    
     # Удаляем вебхук и начинаем опрос обновлений от Telegram
     await bot.delete_webhook(drop_pending_updates=True)
     await dp.start_polling(bot)
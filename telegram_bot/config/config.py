@@ -1,6 +1,11 @@
+import os
+import re
 from aiogram import Bot
-from dataclasses import dataclass
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from dataclasses import dataclass, field
 from environs import Env
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -8,6 +13,8 @@ from pathlib import Path
 class TelegramBot:
     """Презентационный класс для телеграм-бота"""
     api_key_telegram_bot: str
+    # Адрес собственного сервера Bot API; пусто — api.telegram.org
+    api_base_url: str = ''
 
 
 @dataclass
@@ -16,6 +23,7 @@ class ConfigTelegramBot:
     telegram_bot: TelegramBot
 
 
+@lru_cache
 def load_config_telegram_bot(path_env: str = '.env') -> ConfigTelegramBot:
     """Функция загрузки конфигурации бота Telegram
 
@@ -28,19 +36,19 @@ def load_config_telegram_bot(path_env: str = '.env') -> ConfigTelegramBot:
     Возврат:
         ConfigTelegramBot: класс конфигурации для бота Telegram.
     """
-    validate_env_file(path_env)
-    
-    env = Env()
-    env.read_env(path_env)
+    env = read_env(path_env)
     
     API_KEY_TELEGRAM_BOT: str = env.str('API_KEY_TELEGRAM_BOT')
     if not API_KEY_TELEGRAM_BOT or len(API_KEY_TELEGRAM_BOT) != 46:
         #logger.error(f'Произошла ошибка при инициализации API_KEY_TELEGRAM_BOT из {path_env}\nКлюч: {API_KEY_TELEGRAM_BOT}')
         raise ValueError(f'Произошла ошибка при инициализации API_KEY_TELEGRAM_BOT из {path_env}\nКлюч: {API_KEY_TELEGRAM_BOT}')
     
+    TELEGRAM_API_BASE_URL: str = env.str('TELEGRAM_API_BASE_URL', '').rstrip('/')
+    
     return ConfigTelegramBot(
         telegram_bot=TelegramBot(
-            api_key_telegram_bot=API_KEY_TELEGRAM_BOT
+            api_key_telegram_bot=API_KEY_TELEGRAM_BOT,
+            api_base_url=TELEGRAM_API_BASE_URL
         )
     )
 
@@ -49,6 +57,30 @@ def load_config_telegram_bot(path_env: str = '.env') -> ConfigTelegramBot:
 class ServiceYouTubeV3:
     """Класс представления для ServiceYouTubeV3"""
     api_key_service_youtube_v3: str
+    api_keys_service_youtube_v3: list[str] = field(default_factory=list)
+    max_concurrency: int = 4
+    request_timeout: float = 120.0
+    playlist_cache_size: int = 256
+    playlist_cache_ttl: float = 3600.0
+    video_duration_ttl: float = 7 * 24 * 3600.0
+    # Суточная квота одного ключа (проекта Google Cloud)
+    daily_quota: int = 10000
+    quota_rate: float = 10.0
+    quota_burst: int = 50
+    quota_reserve: int = 1000
+    # Адрес YouTube Data API; пусто — адрес из документа обнаружения
+    api_endpoint: str = ''
+    # Дисковый кеш ответов YouTube API; пустой путь отключает кеш
+    response_cache_path: str = ''
+    response_cache_max_bytes: int = 256 * 1024 * 1024
+    response_cache_ttls: dict[str, float] = field(default_factory=dict)
+    # Пул HTTP-соединений и повторы запросов при ошибках 5xx/429 и сбоях соединения
+    http_pool_size: int = 4
+    http_timeout: float = 30.0
+    http_retries: int = 3
+    http_backoff: float = 0.5
+    # Сколько страниц плейлиста ждут продолжительности видео, пока запрашивается следующая; 0 — без конвейера
+    pipeline_depth: int = 2
 
 
 @dataclass
@@ -57,6 +89,7 @@ class ConfigServiceYouTubeV3:
     service_youtube: ServiceYouTubeV3
 
 
+@lru_cache
 def load_config_service_youtube(path_env: str = '.env'):
     """Функция загрузки конфигурации ServiceYouTubeV3
 
@@ -64,24 +97,118 @@ def load_config_service_youtube(path_env: str = '.env'):
         path_env (str): путь к файлу .env. По умолчанию «.env»
 
     Поднимает:
-        ValueError: неверный формат API_KEY_SERVICE_YOUTUBE
+        ValueError: неверный формат API_KEY_SERVICE_YOUTUBE, YOUTUBE_MAX_CONCURRENCY, YOUTUBE_REQUEST_TIMEOUT,
+            PLAYLIST_CACHE_SIZE, PLAYLIST_CACHE_TTL, VIDEO_DURATION_TTL, параметров квоты YOUTUBE_QUOTA_*,
+            кеша ответов YOUTUBE_CACHE_*, HTTP-соединений YOUTUBE_HTTP_* или YOUTUBE_PIPELINE_DEPTH
 
     Возврат:
         ConfigServiceYouTubeV3: класс конфигурации для ServiceYouTubeV3.
     """
-    validate_env_file(path_env)  
-
-    env = Env()
-    env.read_env(path_env)
+    env = read_env(path_env)
+    
+    # Допускается несколько ключей через запятую: вызовы распределяются между ними
+    API_KEYS_SERVICE_YOUTUBE: list[str] = env.list('API_KEY_SERVICE_YOUTUBE')
+    if not API_KEYS_SERVICE_YOUTUBE:
+        raise ValueError(f'Произошла ошибка при инициализации API_KEY_SERVICE_YOUTUBE из {path_env}\nКлюч не задан')
+    for API_KEY_SERVICE_YOUTUBE in API_KEYS_SERVICE_YOUTUBE:
+        if not API_KEY_SERVICE_YOUTUBE or len(API_KEY_SERVICE_YOUTUBE) != 39:
+            #logger.error(f'Произошла ошибка при инициализации API_KEY_SERVICE_YOUTUBE из {path_env}\nКлюч: {API_KEY_SERVICE_YOUTUBE}')
+            raise ValueError(f'Произошла ошибка при инициализации API_KEY_SERVICE_YOUTUBE из {path_env}\nКлюч: {API_KEY_SERVICE_YOUTUBE}')
+    
+    YOUTUBE_MAX_CONCURRENCY: int = env.int('YOUTUBE_MAX_CONCURRENCY', 4)
+    if YOUTUBE_MAX_CONCURRENCY < 1:
+        raise ValueError(f'YOUTUBE_MAX_CONCURRENCY должен быть положительным числом: {YOUTUBE_MAX_CONCURRENCY}')
+    
+    YOUTUBE_REQUEST_TIMEOUT: float = env.float('YOUTUBE_REQUEST_TIMEOUT', 120.0)
+    if YOUTUBE_REQUEST_TIMEOUT <= 0:
+        raise ValueError(f'YOUTUBE_REQUEST_TIMEOUT должен быть положительным числом: {YOUTUBE_REQUEST_TIMEOUT}')
+    
+    PLAYLIST_CACHE_SIZE: int = env.int('PLAYLIST_CACHE_SIZE', 256)
+    if PLAYLIST_CACHE_SIZE < 1:
+        raise ValueError(f'PLAYLIST_CACHE_SIZE должен быть положительным числом: {PLAYLIST_CACHE_SIZE}')
+    
+    PLAYLIST_CACHE_TTL: float = env.float('PLAYLIST_CACHE_TTL', 3600.0)
+    if PLAYLIST_CACHE_TTL < 0:
+        raise ValueError(f'PLAYLIST_CACHE_TTL не может быть отрицательным: {PLAYLIST_CACHE_TTL}')
+    
+    VIDEO_DURATION_TTL: float = env.float('VIDEO_DURATION_TTL', 7 * 24 * 3600.0)
+    if VIDEO_DURATION_TTL < 0:
+        raise ValueError(f'VIDEO_DURATION_TTL не может быть отрицательным: {VIDEO_DURATION_TTL}')
+    
+    YOUTUBE_DAILY_QUOTA: int = env.int('YOUTUBE_DAILY_QUOTA', 10000)
+    YOUTUBE_QUOTA_RATE: float = env.float('YOUTUBE_QUOTA_RATE', 10.0)
+    YOUTUBE_QUOTA_BURST: int = env.int('YOUTUBE_QUOTA_BURST', 50)
+    YOUTUBE_QUOTA_RESERVE: int = env.int('YOUTUBE_QUOTA_RESERVE', 1000)
+    if YOUTUBE_DAILY_QUOTA < 1 or YOUTUBE_QUOTA_RATE <= 0 or YOUTUBE_QUOTA_BURST < 1:
+        raise ValueError(
+            f'YOUTUBE_DAILY_QUOTA, YOUTUBE_QUOTA_RATE и YOUTUBE_QUOTA_BURST должны быть положительными числами: '
+            f'{YOUTUBE_DAILY_QUOTA}, {YOUTUBE_QUOTA_RATE}, {YOUTUBE_QUOTA_BURST}'
+        )
+    if not 0 <= YOUTUBE_QUOTA_RESERVE < YOUTUBE_DAILY_QUOTA:
+        raise ValueError(f'YOUTUBE_QUOTA_RESERVE должен быть в диапазоне [0, YOUTUBE_DAILY_QUOTA): {YOUTUBE_QUOTA_RESERVE}')
+    
+    YOUTUBE_API_ENDPOINT: str = env.str('YOUTUBE_API_ENDPOINT', '')
+    
+    # Время жизни ответов по методам в секундах; страницы playlistItems.list хранятся с etag плейлиста,
+    # поэтому устаревают вместе с ним. playlists.list проверяет актуальность и по умолчанию не кешируется
+    YOUTUBE_CACHE_PATH: str = env.str('YOUTUBE_CACHE_PATH', 'youtube_cache.sqlite3')
+    YOUTUBE_CACHE_MAX_MB: int = env.int('YOUTUBE_CACHE_MAX_MB', 256)
+    YOUTUBE_CACHE_TTLS: dict[str, float] = {
+        'playlists.list': 0.0,
+        'playlistItems.list': 24 * 3600.0,
+        'videos.list': 7 * 24 * 3600.0,
+        **env.dict('YOUTUBE_CACHE_TTLS', {}, subcast_values=float),
+    }
+    if YOUTUBE_CACHE_MAX_MB < 1 or any(ttl < 0 for ttl in YOUTUBE_CACHE_TTLS.values()):
+        raise ValueError(
+            f'YOUTUBE_CACHE_MAX_MB должен быть положительным, а YOUTUBE_CACHE_TTLS — неотрицательными: '
+            f'{YOUTUBE_CACHE_MAX_MB}, {YOUTUBE_CACHE_TTLS}'
+        )
     
-    API_KEY_SERVICE_YOUTUBE: str = env.str('API_KEY_SERVICE_YOUTUBE')
-    if not API_KEY_SERVICE_YOUTUBE or len(API_KEY_SERVICE_YOUTUBE) != 39:
-        #logger.error(f'Произошла ошибка при инициализации API_KEY_SERVICE_YOUTUBE из {path_env}\nКлюч: {API_KEY_SERVICE_YOUTUBE}')
-        raise ValueError(f'Произошла ошибка при инициализации API_KEY_SERVICE_YOUTUBE из {path_env}\nКлюч: {API_KEY_SERVICE_YOUTUBE}')
+    YOUTUBE_PIPELINE_DEPTH: int = env.int('YOUTUBE_PIPELINE_DEPTH', 2)
+    if YOUTUBE_PIPELINE_DEPTH < 0:
+        raise ValueError(f'YOUTUBE_PIPELINE_DEPTH не может быть отрицательным: {YOUTUBE_PIPELINE_DEPTH}')
+    
+    # По умолчанию у каждого одновременного обхода свое «теплое» соединение для страниц плейлиста
+    # и по одному на каждую страницу, ожидающую продолжительности видео
+    YOUTUBE_HTTP_POOL_SIZE: int = env.int('YOUTUBE_HTTP_POOL_SIZE', YOUTUBE_MAX_CONCURRENCY * (YOUTUBE_PIPELINE_DEPTH + 1))
+    if YOUTUBE_HTTP_POOL_SIZE < 1:
+        raise ValueError(f'YOUTUBE_HTTP_POOL_SIZE должен быть положительным числом: {YOUTUBE_HTTP_POOL_SIZE}')
+    
+    YOUTUBE_HTTP_TIMEOUT: float = env.float('YOUTUBE_HTTP_TIMEOUT', 30.0)
+    if YOUTUBE_HTTP_TIMEOUT <= 0:
+        raise ValueError(f'YOUTUBE_HTTP_TIMEOUT должен быть положительным числом: {YOUTUBE_HTTP_TIMEOUT}')
+    
+    YOUTUBE_HTTP_RETRIES: int = env.int('YOUTUBE_HTTP_RETRIES', 3)
+    YOUTUBE_HTTP_BACKOFF: float = env.float('YOUTUBE_HTTP_BACKOFF', 0.5)
+    if YOUTUBE_HTTP_RETRIES < 0 or YOUTUBE_HTTP_BACKOFF < 0:
+        raise ValueError(
+            f'YOUTUBE_HTTP_RETRIES и YOUTUBE_HTTP_BACKOFF не могут быть отрицательными: '
+            f'{YOUTUBE_HTTP_RETRIES}, {YOUTUBE_HTTP_BACKOFF}'
+        )
     
     return ConfigServiceYouTubeV3(
         service_youtube=ServiceYouTubeV3(
-            api_key_service_youtube_v3=API_KEY_SERVICE_YOUTUBE
+            api_key_service_youtube_v3=API_KEYS_SERVICE_YOUTUBE[0],
+            api_keys_service_youtube_v3=API_KEYS_SERVICE_YOUTUBE,
+            max_concurrency=YOUTUBE_MAX_CONCURRENCY,
+            request_timeout=YOUTUBE_REQUEST_TIMEOUT,
+            playlist_cache_size=PLAYLIST_CACHE_SIZE,
+            playlist_cache_ttl=PLAYLIST_CACHE_TTL,
+            video_duration_ttl=VIDEO_DURATION_TTL,
+            daily_quota=YOUTUBE_DAILY_QUOTA,
+            quota_rate=YOUTUBE_QUOTA_RATE,
+            quota_burst=YOUTUBE_QUOTA_BURST,
+            quota_reserve=YOUTUBE_QUOTA_RESERVE,
+            api_endpoint=YOUTUBE_API_ENDPOINT,
+            response_cache_path=YOUTUBE_CACHE_PATH,
+            response_cache_max_bytes=YOUTUBE_CACHE_MAX_MB * 1024 * 1024,
+            response_cache_ttls=YOUTUBE_CACHE_TTLS,
+            http_pool_size=YOUTUBE_HTTP_POOL_SIZE,
+            http_timeout=YOUTUBE_HTTP_TIMEOUT,
+            http_retries=YOUTUBE_HTTP_RETRIES,
+            http_backoff=YOUTUBE_HTTP_BACKOFF,
+            pipeline_depth=YOUTUBE_PIPELINE_DEPTH
         )
     )
     
@@ -89,6 +216,9 @@ def load_config_service_youtube(path_env: str = '.env'):
 @dataclass
 class Logger:
     path_log: str
+    max_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 5
+    rotate_when: str = ''
 
 
 @dataclass 
@@ -96,11 +226,9 @@ class ConfigLogger:
     logger: Logger
 
 
+@lru_cache
 def load_config_logger(path_env: str = '.env') -> ConfigLogger:
-    validate_env_file(path_env)
-    
-    env = Env()
-    env.read_env(path_env)
+    env = read_env(path_env)
     
     PATH_LOG: str = env.str('PATH_LOG')
     path_log_obj = Path(PATH_LOG)
@@ -110,9 +238,19 @@ def load_config_logger(path_env: str = '.env') -> ConfigLogger:
         #logger.error(f'Имя файла в path_log должно быть bot.log | Имя файла: {path_log_obj.name}')
         raise ValueError(f'Имя файла в path_log должно быть bot.log | Имя файла: {path_log_obj.name}')
     
+    # Ротация по размеру файла; если задан LOG_ROTATE_WHEN (например, midnight), то по времени
+    LOG_MAX_BYTES: int = env.int('LOG_MAX_BYTES', 10 * 1024 * 1024)
+    LOG_BACKUP_COUNT: int = env.int('LOG_BACKUP_COUNT', 5)
+    LOG_ROTATE_WHEN: str = env.str('LOG_ROTATE_WHEN', '')
+    if LOG_MAX_BYTES < 0 or LOG_BACKUP_COUNT < 0:
+        raise ValueError(f'LOG_MAX_BYTES и LOG_BACKUP_COUNT не могут быть отрицательными: {LOG_MAX_BYTES}, {LOG_BACKUP_COUNT}')
+    
     return ConfigLogger(
         logger=Logger(
-            path_log=PATH_LOG
+            path_log=PATH_LOG,
+            max_bytes=LOG_MAX_BYTES,
+            backup_count=LOG_BACKUP_COUNT,
+            rotate_when=LOG_ROTATE_WHEN
         )
     )
 
@@ -120,6 +258,8 @@ def load_config_logger(path_env: str = '.env') -> ConfigLogger:
 @dataclass
 class DataBase:
     path_database: str
+    flush_interval_ms: int = 200
+    readers: int = 2
 
 
 @dataclass
@@ -148,17 +288,295 @@ def __create_database_file(path: str) -> None:
         database_path_obj.touch()
 
 
+@lru_cache
 def load_config_database(path_env: str = '.env') -> ConfigDataBase:
-    validate_env_file(path_env)
-    
-    env = Env()
-    env.read_env(path_env)
+    env = read_env(path_env)
     
     PATH_DATABASE = env.str('PATH_DATABASE')
     __validate_database_path(PATH_DATABASE)
     __create_database_file(PATH_DATABASE)
     
-    return ConfigDataBase(database=DataBase(path_database=PATH_DATABASE))
+    DATABASE_FLUSH_INTERVAL_MS: int = env.int('DATABASE_FLUSH_INTERVAL_MS', 200)
+    if DATABASE_FLUSH_INTERVAL_MS < 0:
+        raise ValueError(f'DATABASE_FLUSH_INTERVAL_MS не может быть отрицательным: {DATABASE_FLUSH_INTERVAL_MS}')
+    
+    # Потоки чтения асинхронного доступа к базе данных: запросы /export не задерживают остальные чтения
+    DATABASE_READERS: int = env.int('DATABASE_READERS', 2)
+    if DATABASE_READERS < 1:
+        raise ValueError(f'DATABASE_READERS должен быть положительным числом: {DATABASE_READERS}')
+    
+    return ConfigDataBase(
+        database=DataBase(
+            path_database=PATH_DATABASE,
+            flush_interval_ms=DATABASE_FLUSH_INTERVAL_MS,
+            readers=DATABASE_READERS
+        )
+    )
+
+
+@dataclass
+class Webhook:
+    """Класс представления для режима вебхука"""
+    base_url: str
+    path: str
+    secret_token: str
+    host: str
+    port: int
+
+
+@dataclass
+class ConfigWebhook:
+    """Класс конфигурации способа получения обновлений: polling или webhook"""
+    mode: str
+    webhook: Webhook
+
+
+@lru_cache
+def load_config_webhook(path_env: str = '.env') -> ConfigWebhook:
+    """Функция загрузки конфигурации способа получения обновлений
+
+    Аргументы:
+        path_env (str): путь к файлу .env. По умолчанию «.env»
+
+    Поднимает:
+        ValueError: неверный BOT_MODE, WEBHOOK_PATH, WEBHOOK_SECRET или WEBHOOK_PORT
+
+    Возврат:
+        ConfigWebhook: класс конфигурации способа получения обновлений.
+    """
+    env = read_env(path_env)
+    
+    BOT_MODE: str = env.str('BOT_MODE', 'polling')
+    if BOT_MODE not in ('polling', 'webhook'):
+        raise ValueError(f'BOT_MODE должен быть polling или webhook: {BOT_MODE}')
+    
+    # Пустой WEBHOOK_BASE_URL означает, что вебхук в Telegram не регистрируется (локальная проверка)
+    WEBHOOK_BASE_URL: str = env.str('WEBHOOK_BASE_URL', '').rstrip('/')
+    WEBHOOK_PATH: str = env.str('WEBHOOK_PATH', '/webhook')
+    if not WEBHOOK_PATH.startswith('/'):
+        raise ValueError(f'WEBHOOK_PATH должен начинаться с /: {WEBHOOK_PATH}')
+    
+    WEBHOOK_SECRET: str = env.str('WEBHOOK_SECRET', '')
+    if BOT_MODE == 'webhook' and not re.fullmatch(r'[A-Za-z0-9_-]{1,256}', WEBHOOK_SECRET):
+        raise ValueError('WEBHOOK_SECRET обязателен в режиме webhook: 1-256 символов A-Z, a-z, 0-9, _ и -')
+    
+    WEBHOOK_HOST: str = env.str('WEBHOOK_HOST', '0.0.0.0')
+    WEBHOOK_PORT: int = env.int('WEBHOOK_PORT', 8080)
+    if not 0 < WEBHOOK_PORT < 65536:
+        raise ValueError(f'Некорректный WEBHOOK_PORT: {WEBHOOK_PORT}')
+    
+    return ConfigWebhook(
+        mode=BOT_MODE,
+        webhook=Webhook(
+            base_url=WEBHOOK_BASE_URL,
+            path=WEBHOOK_PATH,
+            secret_token=WEBHOOK_SECRET,
+            host=WEBHOOK_HOST,
+            port=WEBHOOK_PORT
+        )
+    )
+
+
+@dataclass
+class Supervisor:
+    """Класс представления для многопроцессного режима"""
+    workers: int
+
+
+@dataclass
+class ConfigSupervisor:
+    """Класс конфигурации супервизора рабочих процессов"""
+    supervisor: Supervisor
+
+
+@lru_cache
+def load_config_supervisor(path_env: str = '.env') -> ConfigSupervisor:
+    """Функция загрузки конфигурации супервизора рабочих процессов
+
+    Аргументы:
+        path_env (str): путь к файлу .env. По умолчанию «.env»
+
+    Поднимает:
+        ValueError: неверный BOT_WORKERS
+
+    Возврат:
+        ConfigSupervisor: класс конфигурации супервизора.
+    """
+    env = read_env(path_env)
+    
+    # По умолчанию по одному рабочему процессу на ядро процессора
+    BOT_WORKERS: int = env.int('BOT_WORKERS', os.cpu_count() or 1)
+    if BOT_WORKERS < 1:
+        raise ValueError(f'BOT_WORKERS должен быть положительным: {BOT_WORKERS}')
+    
+    return ConfigSupervisor(
+        supervisor=Supervisor(
+            workers=BOT_WORKERS
+        )
+    )
+
+
+@dataclass
+class Metrics:
+    """Класс представления для HTTP-сервера метрик"""
+    host: str
+    port: int
+
+
+@dataclass
+class ConfigMetrics:
+    """Класс конфигурации HTTP-сервера метрик Prometheus"""
+    metrics: Metrics
+
+
+@lru_cache
+def load_config_metrics(path_env: str = '.env') -> ConfigMetrics:
+    """Функция загрузки конфигурации HTTP-сервера метрик
+
+    Аргументы:
+        path_env (str): путь к файлу .env. По умолчанию «.env»
+
+    Поднимает:
+        ValueError: неверный METRICS_PORT
+
+    Возврат:
+        ConfigMetrics: класс конфигурации сервера метрик.
+    """
+    env = read_env(path_env)
+    
+    # METRICS_PORT=0 отключает сервер метрик
+    METRICS_HOST: str = env.str('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT: int = env.int('METRICS_PORT', 0)
+    if not 0 <= METRICS_PORT < 65536:
+        raise ValueError(f'Некорректный METRICS_PORT: {METRICS_PORT}')
+    
+    return ConfigMetrics(
+        metrics=Metrics(
+            host=METRICS_HOST,
+            port=METRICS_PORT
+        )
+    )
+
+
+@dataclass
+class Refresher:
+    """Класс представления для фонового обновления сохраненных плейлистов"""
+    interval: float = 300.0
+    stale_after: float = 2700.0
+    batch_size: int = 10
+    # Доля суточной квоты YouTube API, которую может расходовать фоновое обновление; 0 — обновление отключено
+    quota_share: float = 0.2
+
+
+@dataclass
+class ConfigRefresher:
+    """Класс конфигурации фонового обновления плейлистов"""
+    refresher: Refresher
+
+
+@lru_cache
+def load_config_refresher(path_env: str = '.env') -> ConfigRefresher:
+    """Функция загрузки конфигурации фонового обновления плейлистов
+
+    Аргументы:
+        path_env (str): путь к файлу .env. По умолчанию «.env»
+
+    Поднимает:
+        ValueError: неверный REFRESH_INTERVAL, REFRESH_STALE_AFTER, REFRESH_BATCH_SIZE или REFRESH_QUOTA_SHARE
+
+    Возврат:
+        ConfigRefresher: класс конфигурации фонового обновления.
+    """
+    env = read_env(path_env)
+    
+    REFRESH_INTERVAL: float = env.float('REFRESH_INTERVAL', 300.0)
+    if REFRESH_INTERVAL <= 0:
+        raise ValueError(f'REFRESH_INTERVAL должен быть положительным числом: {REFRESH_INTERVAL}')
+    
+    # По умолчанию плейлист обновляется раньше, чем истечет PLAYLIST_CACHE_TTL (3600 с)
+    REFRESH_STALE_AFTER: float = env.float('REFRESH_STALE_AFTER', 2700.0)
+    if REFRESH_STALE_AFTER < 0:
+        raise ValueError(f'REFRESH_STALE_AFTER не может быть отрицательным: {REFRESH_STALE_AFTER}')
+    
+    REFRESH_BATCH_SIZE: int = env.int('REFRESH_BATCH_SIZE', 10)
+    if REFRESH_BATCH_SIZE < 1:
+        raise ValueError(f'REFRESH_BATCH_SIZE должен быть положительным числом: {REFRESH_BATCH_SIZE}')
+    
+    REFRESH_QUOTA_SHARE: float = env.float('REFRESH_QUOTA_SHARE', 0.2)
+    if not 0 <= REFRESH_QUOTA_SHARE <= 1:
+        raise ValueError(f'REFRESH_QUOTA_SHARE должен быть в диапазоне [0, 1]: {REFRESH_QUOTA_SHARE}')
+    
+    return ConfigRefresher(
+        refresher=Refresher(
+            interval=REFRESH_INTERVAL,
+            stale_after=REFRESH_STALE_AFTER,
+            batch_size=REFRESH_BATCH_SIZE,
+            quota_share=REFRESH_QUOTA_SHARE
+        )
+    )
+
+
+@dataclass
+class Throttling:
+    """Класс представления для ограничения нагрузки от пользователей"""
+    chat_queue_size: int = 3
+    user_rate: float = 10.0
+    user_burst: int = 5
+    max_jobs: int = 100
+
+
+@dataclass
+class ConfigThrottling:
+    """Класс конфигурации ограничения нагрузки"""
+    throttling: Throttling
+
+
+@lru_cache
+def load_config_throttling(path_env: str = '.env') -> ConfigThrottling:
+    """Функция загрузки конфигурации ограничения нагрузки
+
+    Аргументы:
+        path_env (str): путь к файлу .env. По умолчанию «.env»
+
+    Поднимает:
+        ValueError: неверный THROTTLE_CHAT_QUEUE, THROTTLE_USER_RATE, THROTTLE_USER_BURST или THROTTLE_MAX_JOBS
+
+    Возврат:
+        ConfigThrottling: класс конфигурации ограничения нагрузки.
+    """
+    env = read_env(path_env)
+    
+    # Сколько запросов одного чата может ждать и выполняться одновременно
+    THROTTLE_CHAT_QUEUE: int = env.int('THROTTLE_CHAT_QUEUE', 3)
+    # Запросов в минуту от одного пользователя и сколько из них можно отправить подряд
+    THROTTLE_USER_RATE: float = env.float('THROTTLE_USER_RATE', 10.0)
+    THROTTLE_USER_BURST: int = env.int('THROTTLE_USER_BURST', 5)
+    # Сколько запросов всех пользователей может ждать и выполняться одновременно
+    THROTTLE_MAX_JOBS: int = env.int('THROTTLE_MAX_JOBS', 100)
+    if THROTTLE_CHAT_QUEUE < 1 or THROTTLE_USER_RATE <= 0 or THROTTLE_USER_BURST < 1 or THROTTLE_MAX_JOBS < 1:
+        raise ValueError(
+            f'THROTTLE_CHAT_QUEUE, THROTTLE_USER_RATE, THROTTLE_USER_BURST и THROTTLE_MAX_JOBS должны быть положительными: '
+            f'{THROTTLE_CHAT_QUEUE}, {THROTTLE_USER_RATE}, {THROTTLE_USER_BURST}, {THROTTLE_MAX_JOBS}'
+        )
+    
+    return ConfigThrottling(
+        throttling=Throttling(
+            chat_queue_size=THROTTLE_CHAT_QUEUE,
+            user_rate=THROTTLE_USER_RATE,
+            user_burst=THROTTLE_USER_BURST,
+            max_jobs=THROTTLE_MAX_JOBS
+        )
+    )
+
+
+@lru_cache
+def read_env(path_env: str = '.env') -> Env:
+    """Проверяет и читает файл .env один раз за время работы процесса; повторные вызовы возвращают тот же Env"""
+    validate_env_file(path_env)
+    
+    env = Env()
+    env.read_env(path_env)
+    return env
 
 
 def validate_env_file(path_env: str) -> None:
@@ -176,4 +594,9 @@ def validate_env_file(path_env: str) -> None:
 
 
 config = load_config_telegram_bot()
-bot = Bot(config.telegram_bot.api_key_telegram_bot, parse_mode='HTML')
\ No newline at end of file
+bot = Bot(
+    config.telegram_bot.api_key_telegram_bot,
+    session=AiohttpSession(api=TelegramAPIServer.from_base(config.telegram_bot.api_base_url))
+    if config.telegram_bot.api_base_url else None,
+    parse_mode='HTML'
+)
\ No newline at end of file
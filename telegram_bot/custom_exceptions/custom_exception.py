@@ -17,4 +17,70 @@ class InvalidPlaylistIdFormatError(Exception):
             message = f'Неверный формат идентификатора плейлиста: {playlist_identifier}'
         else:
             message = 'Неверный формат идентификатора плейлиста'
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+
+class RequestCancelledError(Exception):
+    """
+    Исключение, возникающее при отмене вызова клиента YouTube API (таймаут или отмена задачи).
+
+    Attributes:
+        method (str): Необязательный параметр, содержащий метод API, запрос к которому был отменен.
+    """
+
+    def __init__(self, method: str | None = None) -> None:
+        """
+        Инициализирует объект RequestCancelledError.
+
+        Args:
+            method (str, optional): Метод API, запрос к которому был отменен. По умолчанию None.
+        """
+        if method is not None:
+            message = f'Запрос к YouTube API отменен: {method}'
+        else:
+            message = 'Запрос к YouTube API отменен'
+        super().__init__(message)
+
+
+class QuotaExceededError(Exception):
+    """
+    Исключение, возникающее, когда остатка суточной квоты YouTube API не хватает для запроса.
+
+    Attributes:
+        method (str): Необязательный параметр, содержащий метод API, для которого не хватило квоты.
+    """
+
+    def __init__(self, method: str | None = None) -> None:
+        """
+        Инициализирует объект QuotaExceededError.
+
+        Args:
+            method (str, optional): Метод API, для которого не хватило квоты. По умолчанию None.
+        """
+        if method is not None:
+            message = f'Недостаточно квоты YouTube API для запроса: {method}'
+        else:
+            message = 'Недостаточно квоты YouTube API'
+        super().__init__(message)
+
+
+class PlaylistNotFoundError(Exception):
+    """
+    Исключение, возникающее, когда YouTube API не вернул плейлист: он удален, приватный или не существует.
+
+    Attributes:
+        playlist_identifier (str): Необязательный параметр, содержащий идентификатор ненайденного плейлиста.
+    """
+
+    def __init__(self, playlist_identifier: str | None = None) -> None:
+        """
+        Инициализирует объект PlaylistNotFoundError.
+
+        Args:
+            playlist_identifier (str, optional): Идентификатор ненайденного плейлиста. По умолчанию None.
+        """
+        if playlist_identifier is not None:
+            message = f'Плейлист не найден: {playlist_identifier}'
+        else:
+            message = 'Плейлист не найден'
+        super().__init__(message)
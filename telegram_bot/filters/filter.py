@@ -1,17 +1,20 @@
 from aiogram.filters import BaseFilter
 from aiogram.types import Message
-from urllib.parse import urlparse, parse_qs
+from utils.playlist_identifier import extract_playlist_identifiers
 
 
 class PlaylistIdentifierFilter(BaseFilter):
     """
     Фильтр для проверки сообщений на наличие ссылок на плейлисты YouTube и извлечения идентификаторов плейлистов.
 
+    Найденные идентификаторы передаются обработчику в аргументе playlist_identifiers,
+    поэтому текст сообщения разбирается один раз.
+
     Attributes:
         message (Message): Объект сообщения для проверки.
     """
 
-    async def __call__(self, message: Message) -> bool:
+    async def __call__(self, message: Message) -> bool | dict[str, list[str]]:
         """
         Проверяет сообщение на наличие ссылок на плейлисты YouTube и извлекает идентификаторы плейлистов.
 
@@ -19,22 +22,10 @@ class PlaylistIdentifierFilter(BaseFilter):
             message (Message): Объект сообщения для проверки.
 
         Returns:
-            bool: True, если сообщение содержит ссылку на плейлист YouTube с правильным форматом идентификатора, в противном случае False.
+            bool | dict[str, list[str]]: {'playlist_identifiers': [...]}, если сообщение содержит хотя бы одну
+                ссылку на плейлист YouTube или идентификатор плейлиста, в противном случае False.
         """
-        parsed_url = urlparse(message.text)
-        query_params = parse_qs(parsed_url.query)
-
-        if 'list' in query_params:
-            playlist_identifier = query_params['list'][0]
-        else:
+        playlist_identifiers = extract_playlist_identifiers(message.text or '')
+        if not playlist_identifiers:
             return False
-
-        if playlist_identifier and all(
-            (
-                isinstance(playlist_identifier, str), 
-                playlist_identifier.startswith('PL'), 
-                len(playlist_identifier) == 34)
-        ):
-            return True
-
-        return False
\ No newline at end of file
+        return {'playlist_identifiers': playlist_identifiers}
@@ -1,19 +1,131 @@
-from aiogram import Router, html, F
-from aiogram.types import Message, BufferedInputFile
-from aiogram.filters import CommandStart
+import asyncio
+import os
+from dataclasses import replace
+from functools import cache
+from time import monotonic
+from aiogram import Dispatcher, Router, html, F
+from aiogram.types import Message, FSInputFile
+from aiogram.exceptions import TelegramAPIError
+from aiogram.filters import Command, CommandObject, CommandStart
 from filters.filter import PlaylistIdentifierFilter
-from service.youtubeapiclientv3 import YouTubeAPIClientV3
-from service.telegram_db_excel_service import send_excel_file
-from service.telegram_log_input import get_log_file_as_bytesio
+from custom_exceptions.custom_exception import PlaylistNotFoundError, QuotaExceededError
+from server.metrics import start_metrics_server
+from service.async_youtubeapiclientv3 import AsyncYouTubeAPIClientV3
+from service.playlist_refresher import PlaylistRefresher
+from service.youtubeapiclientv3 import PlaylistProgress, YouTubeAPIClientV3
+from service.telegram_log_input import export_log_files, parse_export_log_args
+from models.async_methods import AsyncDataBase
 from models.methods import DataBase
 from lexicon.lexicon import LEXICON_RU
-from config.config import bot
+from middlewares.metrics import MetricsMiddleware
+from middlewares.throttling import ThrottlingMiddleware
+from config.config import bot, load_config_metrics, load_config_refresher, load_config_throttling
 from utils.logger import logger
 
 
+# Максимальное количество плейлистов, обрабатываемых из одного сообщения
+MAX_PLAYLISTS_PER_MESSAGE = 20
+
+# Минимальный интервал между правками ответа в секундах: Telegram ограничивает частоту правок
+MESSAGE_EDIT_INTERVAL = 1.0
+
 handler_router = Router()  # Создание объекта Router для управления обработчиками сообщений
-service = YouTubeAPIClientV3()  # Создание объекта YouTubeAPIClientV3 для работы с API YouTube
-database = DataBase()  # Создание объекта базы данных для взаимодействия с данными
+handler_router.message.middleware(ThrottlingMiddleware(load_config_throttling().throttling))  # Ограничение дорогих запросов до их выполнения
+handler_router.message.middleware(MetricsMiddleware())  # Измерение времени работы и ошибок обработчиков сообщений
+
+
+# База данных и клиент YouTube API создаются не при импорте, а в on_startup в отдельном потоке: импорт остается быстрым,
+# а цикл событий не ждет их инициализации
+@cache
+def get_database() -> DataBase:
+    """Возвращает объект базы данных для взаимодействия с данными"""
+    return DataBase()
+
+
+@cache
+def get_async_database() -> AsyncDataBase:
+    """Возвращает асинхронный доступ к базе данных для обработчиков: SQLite не блокирует цикл событий"""
+    return AsyncDataBase(get_database())
+
+
+@cache
+def get_service() -> AsyncYouTubeAPIClientV3:
+    """Возвращает асинхронный клиент для работы с API YouTube без блокировки цикла событий"""
+    return AsyncYouTubeAPIClientV3(YouTubeAPIClientV3(database=get_database()))
+
+
+# Обработчик запуска бота
+@handler_router.startup()
+async def on_startup():
+    """
+    Создает базу данных и клиент YouTube API в отдельном потоке до получения первого обновления.
+
+    Создание читает документ обнаружения и расход квоты из SQLite и ждет готовности потока записи;
+    в цикле событий оно задержало бы все обновления, пришедшие одновременно с первым запросом.
+
+    Returns:
+        None
+    """
+    await asyncio.to_thread(get_async_database)
+    await asyncio.to_thread(get_service)
+
+
+# Обработчик завершения работы бота
+@handler_router.shutdown()
+async def on_shutdown():
+    """
+    Останавливает пул потоков клиента YouTube API и записывает отложенные изменения в базу данных.
+
+    Returns:
+        None
+    """
+    # Закрываются только созданные объекты: при ошибке запуска часть из них могла не создаться
+    if get_service.cache_info().currsize:
+        get_service().close()
+    if get_async_database.cache_info().currsize:
+        await get_async_database().close()
+    elif get_database.cache_info().currsize:
+        await asyncio.to_thread(get_database().close)
+
+
+def register_background_tasks(dp: Dispatcher, metrics_port_offset: int = 0, run_refresher: bool = True) -> None:
+    """
+    Подключает к запуску и остановке диспетчера сервер метрик и фоновое обновление плейлистов.
+
+    Используется и в однопроцессном режиме (bot.py), и в рабочих процессах супервизора.
+    Метрики хранятся в памяти процесса, поэтому каждый рабочий процесс отдает их на своем порту.
+
+    Args:
+        dp (Dispatcher): Диспетчер, с которым запускаются и останавливаются фоновые задачи.
+        metrics_port_offset (int): Смещение порта сервера метрик относительно METRICS_PORT.
+        run_refresher (bool): Запускать ли фоновое обновление плейлистов в этом процессе.
+
+    Returns:
+        None
+    """
+    config_metrics = load_config_metrics('.env').metrics
+    if config_metrics.port:
+        config_metrics = replace(config_metrics, port=config_metrics.port + metrics_port_offset)
+    metrics_runners = []
+
+    async def start_metrics() -> None:
+        runner = await start_metrics_server(config_metrics)
+        if runner is not None:
+            metrics_runners.append(runner)
+
+    async def stop_metrics() -> None:
+        for runner in metrics_runners:
+            await runner.cleanup()
+        metrics_runners.clear()
+
+    dp.startup.register(start_metrics)
+    dp.shutdown.register(stop_metrics)
+
+    if run_refresher:
+        # Обработчики shutdown диспетчера вызываются раньше, чем роутер закроет клиент YouTube API
+        refresher = PlaylistRefresher(get_service, get_async_database, load_config_refresher('.env').refresher)
+        dp.startup.register(refresher.start)
+        dp.shutdown.register(refresher.stop)
 
 
 # Обработчик команды /start
@@ -32,7 +144,7 @@ async def cmd_start(message: Message):
     await message.answer(
         text=LEXICON_RU['cmd_start'].format(message.from_user.username)  # Отправка ответного сообщения с приветствием
     )
-    logger.info(f'Вызов команды /start пользователем: {message.from_user.full_name} | {message.from_user.id}')  # Логирование вызова команды /start
+    logger.info('Вызов команды /start пользователем: %s | %s', message.from_user.full_name, message.from_user.id)  # Логирование вызова команды /start
 
 
 # Обработчик сообщений с командой /help
@@ -51,7 +163,7 @@ async def cmd_help(message: Message):
     await message.answer(
         text=LEXICON_RU['cmd_help']  # Отправка ответного сообщения с общей справочной информацией
     )
-    logger.info(f'Вызов команды /help пользователем: {message.from_user.full_name} | {message.from_user.id}')  # Логирование вызова команды /help
+    logger.info('Вызов команды /help пользователем: %s | %s', message.from_user.full_name, message.from_user.id)  # Логирование вызова команды /help
 
 
 # Обработчик сообщений с текстом /help_playlist
@@ -70,53 +182,237 @@ async def cmd_help_playlist(message: Message):
     await message.answer(
         text=LEXICON_RU['cmd_help_playlist']  # Отправка ответного сообщения с помощью по плейлистам
     )
-    logger.info(f'Вызов команды /help_playlist пользователем: {message.from_user.full_name} | {message.from_user.id}')  # Логирование вызова команды /help_playlist
+    logger.info('Вызов команды /help_playlist пользователем: %s | %s', message.from_user.full_name, message.from_user.id)  # Логирование вызова команды /help_playlist
 
 
 # Обработчик сообщений, прошедших фильтр PlaylistIdentifierFilter
 @handler_router.message(PlaylistIdentifierFilter())  
-async def cmd_playlist(message: Message):    
+async def cmd_playlist(message: Message, playlist_identifiers: list[str]):    
     """
     Обработчик команд, содержащих идентификаторы плейлистов YouTube.
 
     Args:
         message (Message): Объект сообщения с информацией о команде и содержимом.
+        playlist_identifiers (list[str]): Идентификаторы плейлистов, извлеченные фильтром PlaylistIdentifierFilter.
 
     Returns:
         None
     """
+    # Несколько ссылок в одном сообщении обрабатываются одновременно с общим ответом-таблицей
+    if len(playlist_identifiers) > 1:
+        await reply_playlists_summary(message, playlist_identifiers[:MAX_PLAYLISTS_PER_MESSAGE])
+        return
+    
+    # Метаданные отправляются сразу, затем тот же ответ дополняется ходом вычисления продолжительности
+    reply: Message | None = None
+    edited_at = monotonic()
     try:
-        playlist_info: dict = service.playlist.get_info(message.text)  # Получение информации о плейлисте
+        async for progress in get_service().stream_playlist_info(playlist_identifiers[0]):
+            playlist_info: dict = progress.playlist_info
+            if progress.done:
+                entities = message.entities or []  # Получение сущностей сообщения (если есть)
+                for item in entities:
+                    if item.type in playlist_info.keys():
+                        playlist_info[item.type] = item.extract_from(message.text)  # Извлечение информации из сущностей сообщения
+            text = format_playlist_info(playlist_info, progress)
+            if reply is None:
+                reply = await message.reply(text)  # Отправка информации о плейлисте пользователю
+                edited_at = monotonic()
+            elif progress.done or monotonic() - edited_at >= MESSAGE_EDIT_INTERVAL:
+                try:
+                    await reply.edit_text(text)
+                except TelegramAPIError as e:
+                    logger.warning('Не удалось обновить ответ о плейлисте: %s', e)
+                edited_at = monotonic()
+    except asyncio.TimeoutError:
+        logger.error('Превышено время ожидания ответа YouTube API для сообщения: %s', message.text)  # Логирование таймаута
+        await reply_playlist_error(message, reply, LEXICON_RU['playlist_timeout'])
+        return
+    except QuotaExceededError as e:
+        logger.error('Произошла ошибка: %s', e)  # Логирование исчерпания квоты
+        await reply_playlist_error(message, reply, LEXICON_RU['quota_exceeded'])
+        return
+    except PlaylistNotFoundError as e:
+        logger.warning('Произошла ошибка: %s', e)  # Логирование ненайденного плейлиста
+        await reply_playlist_error(message, reply, LEXICON_RU['playlist_not_found'])
+        return
+    except asyncio.CancelledError:
+        # Обработка отменена, например при остановке бота: ответ не должен навсегда остаться «вычисляется…»
+        logger.warning('Обработка плейлиста отменена для сообщения: %s', message.text)
+        await reply_playlist_error(message, reply, LEXICON_RU['playlist_error'])
+        raise
     except Exception as e:
-        logger.error(f'Произошла ошибка: {e}')  # Логирование ошибки
+        logger.error('Произошла ошибка: %s', e)  # Логирование ошибки
+        await reply_playlist_error(message, reply, LEXICON_RU['playlist_error'])
         return
     
+    logger.info('Данные о плейлисте: %s были успешно отправлены пользователю: %s | %s', playlist_info["id_playlist"], message.from_user.full_name, message.from_user.id)  # Логирование успешной отправки информации о плейлисте
+    await get_async_database().save_playlist_info(playlist_info)  # Сохранение информации о плейлисте в базе данных
+
+
+async def reply_playlist_error(message: Message, reply: Message | None, text: str) -> None:
+    """
+    Сообщает пользователю об ошибке получения плейлиста.
+
+    Если ответ с метаданными уже отправлен, в нем заменяется текст, чтобы он не остался
+    с продолжительностью «вычисляется…»; иначе отправляется новый ответ.
+
+    Args:
+        message (Message): Сообщение пользователя.
+        reply (Message | None): Уже отправленный ответ о плейлисте.
+        text (str): Текст ошибки.
+
+    Returns:
+        None
+    """
     try:
-        entities = message.entities or []  # Получение сущностей сообщения (если есть)
-        for item in entities:
-            if item.type in playlist_info.keys():
-                playlist_info[item.type] = item.extract_from(message.text)  # Извлечение информации из сущностей сообщения
-        # Отправка информации о плейлисте пользователю
-        await message.reply(
-            f'📹 Информация о плейлисте\n'
-            f'🔒 Тип ресурса: {html.quote(str(playlist_info["kind"]))}\n'
-            f'🔑 Механизм кеширования: {html.quote(str(playlist_info["etag"]))}\n'
-            f'🆔 Идентификатор: {html.quote(str(playlist_info["id_playlist"]))}\n'
-            f'🕒 Дата и время публикации: {html.quote(str(playlist_info["publishedAt"]))}\n'
-            f'👤 Идентификатор канала: {html.quote(str(playlist_info["channelId"]))}\n'
-            f'🎬 Название: {html.quote(str(playlist_info["title"]))}\n'
-            f'🖼️ URL Изображения: {html.quote(str(playlist_info["thumbnails_url"]))}\n'
-            f'📏 Ширина изображения: {html.quote(str(playlist_info["thumbnails_width"]))}\n'
-            f'📐 Высота изображения: {html.quote(str(playlist_info["thumbnails_height"]))}\n'
-            f'🔏 Статус конфиденциальности: {html.quote(str(playlist_info["privacyStatus"]))}\n'
-            f'👀 Количество видео: {html.quote(str(playlist_info["itemCount"]))}\n'
-            f'⏱️ Продолжительность плейлиста: {html.quote(str(playlist_info["duration"]))}\n'
+        if reply is None:
+            await message.reply(text)
+        else:
+            await reply.edit_text(text)
+    except TelegramAPIError as e:
+        logger.warning('Не удалось сообщить об ошибке получения плейлиста: %s', e)
+
+
+def format_playlist_info(playlist_info: dict, progress: PlaylistProgress) -> str:
+    """
+    Формирует ответ с информацией о плейлисте.
+
+    Пока продолжительность вычисляется, вместо нее выводится количество обработанных видео
+    и продолжительность на текущий момент.
+
+    Args:
+        playlist_info (dict): Данные плейлиста.
+        progress (PlaylistProgress): Ход получения данных плейлиста.
+
+    Returns:
+        str: Текст сообщения в разметке HTML.
+    """
+    if progress.done:
+        duration = html.quote(str(playlist_info["duration"]))
+    elif 'duration' not in playlist_info:
+        duration = '⏳ вычисляется…'
+    else:
+        duration = (
+            f'⏳ {html.quote(str(playlist_info["duration"]))} '
+            f'(обработано видео: {progress.videos_processed} из {html.quote(str(playlist_info["itemCount"]))})'
         )
-        logger.info(f'Данные о плейлисте: {str(playlist_info["id_playlist"])} были успешно отправлены пользователю: {message.from_user.full_name} | {message.from_user.id}')  # Логирование успешной отправки информации о плейлисте
-        database.save_playlist_info(playlist_info)  # Сохранение информации о плейлисте в базе данных
-    except Exception as e:
-        logger.error(f'Произошла ошибка: {e}')  # Логирование ошибки
+    return (
+        f'📹 Информация о плейлисте\n'
+        f'🔒 Тип ресурса: {html.quote(str(playlist_info["kind"]))}\n'
+        f'🔑 Механизм кеширования: {html.quote(str(playlist_info["etag"]))}\n'
+        f'🆔 Идентификатор: {html.quote(str(playlist_info["id_playlist"]))}\n'
+        f'🕒 Дата и время публикации: {html.quote(str(playlist_info["publishedAt"]))}\n'
+        f'👤 Идентификатор канала: {html.quote(str(playlist_info["channelId"]))}\n'
+        f'🎬 Название: {html.quote(str(playlist_info["title"]))}\n'
+        f'🖼️ URL Изображения: {html.quote(str(playlist_info["thumbnails_url"]))}\n'
+        f'📏 Ширина изображения: {html.quote(str(playlist_info["thumbnails_width"]))}\n'
+        f'📐 Высота изображения: {html.quote(str(playlist_info["thumbnails_height"]))}\n'
+        f'🔏 Статус конфиденциальности: {html.quote(str(playlist_info["privacyStatus"]))}\n'
+        f'👀 Количество видео: {html.quote(str(playlist_info["itemCount"]))}\n'
+        f'⏱️ Продолжительность плейлиста: {duration}\n'
+    )
+
+
+def duration_to_seconds(duration: str) -> int | None:
+    """Переводит продолжительность плейлиста "часы:минуты:секунды" в секунды; None, если данных нет"""
+    try:
+        hours, minutes, seconds = (int(part) for part in duration.split(':'))
+    except (AttributeError, ValueError):
+        return None
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def format_playlists_summary(playlist_identifiers: list[str], results: dict[str, dict | str]) -> str:
+    """
+    Формирует сводную таблицу по нескольким плейлистам с итогами.
+
+    Args:
+        playlist_identifiers (list[str]): Идентификаторы плейлистов в порядке сообщения.
+        results (dict[str, dict | str]): Полученные данные плейлистов или текст ошибки по идентификатору.
+
+    Returns:
+        str: Текст сообщения в разметке HTML.
+    """
+    rows = [f'{"№":>2} {"Видео":>6} {"Длительность":>12}  Название']
+    total_videos = total_seconds = missing = 0
+    for number, playlist_identifier in enumerate(playlist_identifiers, start=1):
+        result = results.get(playlist_identifier)
+        if result is None:
+            videos, duration, title = '…', '…', playlist_identifier
+        elif isinstance(result, str):
+            videos, duration, title = '—', '—', f'{result}: {playlist_identifier}'
+            missing += 1
+        else:
+            videos, duration, title = result['itemCount'], result['duration'], result['title']
+            seconds = duration_to_seconds(duration)
+            total_videos += videos if isinstance(videos, int) else 0
+            total_seconds += seconds or 0
+            missing += seconds is None
+        rows.append(f'{number:>2} {str(videos):>6} {str(duration):>12}  {str(title)[:40]}')
+
+    total_duration = f'{total_seconds // 3600}:{total_seconds % 3600 // 60}:{total_seconds % 60}'
+    return (
+        f'📊 Плейлисты: готово {len(results)} из {len(playlist_identifiers)}\n'
+        f'<pre>{html.quote(chr(10).join(rows))}</pre>\n'
+        f'👀 Всего видео: {total_videos}\n'
+        f'⏱️ Общая продолжительность: {total_duration}'
+        + (f'\n⚠️ Без данных о продолжительности: {missing}' if missing else '')
+    )
+
+
+async def reply_playlists_summary(message: Message, playlist_identifiers: list[str]) -> None:
+    """
+    Получает данные нескольких плейлистов одновременно и отвечает одной сводной таблицей.
+
+    Запросы выполняются с общим для всех пользователей ограничением YOUTUBE_MAX_CONCURRENCY.
+    Таблица дополняется по мере получения результатов, но не чаще MESSAGE_EDIT_INTERVAL.
+    Полученные данные сохраняются в базе данных одной транзакцией.
+
+    Args:
+        message (Message): Сообщение со ссылками на плейлисты.
+        playlist_identifiers (list[str]): Идентификаторы плейлистов.
+
+    Returns:
+        None
+    """
+    service = get_service()
+    results: dict[str, dict | str] = {}
+    summary = await message.reply(format_playlists_summary(playlist_identifiers, results))
+
+    async def fetch(playlist_identifier: str) -> tuple[str, dict | str]:
+        try:
+            return playlist_identifier, await service.get_playlist_info(playlist_identifier)
+        except asyncio.TimeoutError:
+            return playlist_identifier, 'превышено время ожидания'
+        except QuotaExceededError:
+            return playlist_identifier, 'исчерпан лимит запросов'
+        except PlaylistNotFoundError:
+            return playlist_identifier, 'не найден'
+        except Exception as e:
+            logger.error('Произошла ошибка при получении плейлиста %s: %s', playlist_identifier, e)
+            return playlist_identifier, 'ошибка'
+
+    edited_at = monotonic()
+    for next_result in asyncio.as_completed([fetch(playlist_identifier) for playlist_identifier in playlist_identifiers]):
+        playlist_identifier, result = await next_result
+        results[playlist_identifier] = result
+        if len(results) < len(playlist_identifiers) and monotonic() - edited_at >= MESSAGE_EDIT_INTERVAL:
+            try:
+                await summary.edit_text(format_playlists_summary(playlist_identifiers, results))
+            except TelegramAPIError as e:
+                logger.warning('Не удалось обновить сводную таблицу: %s', e)
+            edited_at = monotonic()
+
+    # Данные сохраняются до итоговой правки: ошибка Telegram не должна терять полученные плейлисты
+    await get_async_database().save_playlists_info([result for result in results.values() if isinstance(result, dict)])  # Сохранение всех плейлистов одной транзакцией
+
+    try:
+        await summary.edit_text(format_playlists_summary(playlist_identifiers, results))
+    except TelegramAPIError as e:
+        logger.warning('Не удалось обновить сводную таблицу: %s', e)
         return
+    logger.info('Сводка по %d плейлистам отправлена пользователю: %s | %s', len(playlist_identifiers), message.from_user.full_name, message.from_user.id)
 
 
 # Обработчик сообщений с текстом /help_export
@@ -135,7 +431,7 @@ async def cmd_help_export(message: Message):
     await message.answer(
         text=LEXICON_RU['cmd_help_export']  # Отправка ответного сообщения с помощью по экспорту данных
     )
-    logger.info(f'Вызов команды /help_export пользователем: {message.from_user.full_name} | {message.from_user.id}')  # Логирование вызова команды /help_export
+    logger.info('Вызов команды /help_export пользователем: %s | %s', message.from_user.full_name, message.from_user.id)  # Логирование вызова команды /help_export
     
 
 # Обработчик сообщений, содержащих команду /export
@@ -150,23 +446,43 @@ async def cmd_export(message: Message):
     Returns:
         None
     """
-    excel_file = send_excel_file()  # Генерация файла Excel с данными из базы данных
-    await bot.send_document(message.from_user.id, document=BufferedInputFile(excel_file.read(), 'db_data.xlsx'))  # Отправка файла пользователю
-    logger.info(f'Произведена выгрузка данных /export для польователя: {message.from_user.full_name} | {message.from_user.id}')  # Логирование события выгрузки данных
+    excel_path = await get_async_database().export_playlist_info()  # Генерация файла Excel в потоке чтения базы данных
+    try:
+        await bot.send_document(message.from_user.id, document=FSInputFile(excel_path, 'db_data.xlsx'))  # Отправка файла пользователю
+    finally:
+        await asyncio.to_thread(os.remove, excel_path)  # Удаление временного файла
+    logger.info('Произведена выгрузка данных /export для польователя: %s | %s', message.from_user.full_name, message.from_user.id)  # Логирование события выгрузки данных
 
 
-# Обработчик сообщений, содержащих команду /export_log
-@handler_router.message(F.text == '/export_log')   
-async def cmd_export(message: Message):
+# Обработчик сообщений, содержащих команду /export_log с необязательными фильтрами
+@handler_router.message(Command('export_log'))
+async def cmd_export_log(message: Message, command: CommandObject):
     """
-    Обработчик команды /export_дщп, который отправляет пользователю файл bot.log с данными о логах системы.
+    Обработчик команды /export_log, который отправляет пользователю сжатый журнал bot.log.
+
+    Поддерживает фильтры: /export_log [N] [since=ГГГГ-ММ-ДД[THH:MM]] [level=УРОВЕНЬ].
+    Если сжатый журнал больше ограничения Telegram, он отправляется несколькими документами.
 
     Args:
         message (Message): Объект сообщения с информацией о команде и отправителе.
+        command (CommandObject): Команда и ее аргументы.
 
     Returns:
         None
     """
-    log_file = get_log_file_as_bytesio()
-    await bot.send_document(message.from_user.id, document=BufferedInputFile(log_file.read(), 'bot.log'))  # Отправка файла пользователю
-    logger.info(f'Произведена выгрузка логов /export_log для польователя: {message.from_user.full_name} | {message.from_user.id}')  # Логирование события выгрузки данных
\ No newline at end of file
+    try:
+        options = parse_export_log_args(command.args)
+    except ValueError as e:
+        logger.warning('Неверные аргументы /export_log: %s', e)
+        await message.reply(LEXICON_RU['cmd_export_log_usage'])
+        return
+
+    log_paths = await export_log_files(**options)  # Выгрузка журнала вне цикла событий
+    try:
+        for number, log_path in enumerate(log_paths, start=1):
+            filename = 'bot.log.gz' if len(log_paths) == 1 else f'bot.part{number}.log.gz'
+            await bot.send_document(message.from_user.id, document=FSInputFile(log_path, filename))  # Отправка файла пользователю
+    finally:
+        for log_path in log_paths:
+            await asyncio.to_thread(os.remove, log_path)  # Удаление временных файлов
+    logger.info('Произведена выгрузка логов /export_log для польователя: %s | %s', message.from_user.full_name, message.from_user.id)  # Логирование события выгрузки данных
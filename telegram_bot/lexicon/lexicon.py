@@ -21,7 +21,7 @@ LEXICON_RU: dict = {
 /help_playlist: справка по данным о плейлисте,
 /help_export: описание работы с Excel,
 /export: вывод базы данных в Excel,
-/export_log: вывод логов
+/export_log: вывод логов, например /export_log 500 level=ERROR
 """,
     'cmd_help_playlist':
 """
@@ -29,14 +29,57 @@ LEXICON_RU: dict = {
 
 Для того чтобы получить данные о плейлисте, нужно просто указать URL плейлиста с YouTube:
 Пример: "https://www.youtube.com/playlist?list=PLQOaTSbfxUtCrKs0nicOg2npJQYSPGO9r" - без кавычек.
+Подойдут и ссылки youtu.be, m.youtube.com, music.youtube.com или просто идентификатор плейлиста.
+Можно отправить несколько ссылок одним сообщением — бот ответит сводной таблицей.
 
-Примечание: чем больше количество видео в плейлисте, тем дольше будет обрабатываться запрос. 
+Примечание: данные о плейлисте приходят сразу, а продолжительность дополняется по мере обработки видео — чем больше видео в плейлисте, тем дольше она вычисляется.
 Если плейлист имеет скрытые видео, то продолжительность вероятнее всего будет: "None".
 """,
     'cmd_help_export':
 """
 Чтобы получить подробную справку экспорта данных используйте команду /export. 
 Экспорт данных осуществляется в формате Excel и включает информацию о всех запрашиваемых плейлистах.
+""",
+    'playlist_timeout':
+"""
+⏳ Плейлист обрабатывается слишком долго, попробуйте повторить запрос позже.
+""",
+    'quota_exceeded':
+"""
+🚫 Суточный лимит запросов к YouTube исчерпан, попробуйте повторить запрос завтра.
+""",
+    'playlist_error':
+"""
+⚠️ Не удалось получить данные плейлиста, попробуйте повторить запрос позже.
+""",
+    'playlist_not_found':
+"""
+🔍 Плейлист не найден: он удален, скрыт или ссылка указана неверно.
+""",
+    'request_in_progress':
+"""
+⏳ Этот запрос уже обрабатывается, дождитесь ответа.
+""",
+    'chat_queue_full':
+"""
+⏳ У вас уже обрабатывается несколько запросов, отправьте новый после ответа на них.
+""",
+    'rate_limited':
+"""
+🐢 Слишком много запросов, повторите через {} с.
+""",
+    'overloaded':
+"""
+🚧 Бот сейчас перегружен, повторите запрос через несколько минут.
+""",
+    'cmd_export_log_usage':
+"""
+📄 Формат команды: /export_log [N] [since=ГГГГ-ММ-ДД[THH:MM]] [level=УРОВЕНЬ]
+
+N — последние N записей журнала,
+since — записи начиная с указанного времени,
+level — записи не ниже уровня: DEBUG, INFO, WARNING, ERROR, CRITICAL.
+Пример: /export_log 500 level=ERROR
 """
 }
 
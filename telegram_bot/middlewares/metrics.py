@@ -0,0 +1,35 @@
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from utils.metrics import Counter, Histogram
+
+
+HANDLER_LATENCY = Histogram('bot_handler_latency_seconds', 'Время работы обработчика обновления', ('handler',))
+HANDLER_ERRORS = Counter('bot_handler_errors_total', 'Количество исключений в обработчиках', ('handler',))
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware роутера: измеряет время работы каждого обработчика и считает исключения.
+
+    Регистрируется как внутренний (router.message.middleware), поэтому вызывается только для
+    обновлений, дошедших до обработчика, и знает его имя. Накладные расходы — два вызова
+    perf_counter и одно наблюдение гистограммы на обновление.
+    """
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get('handler')
+        name = handler_object.callback.__name__ if handler_object is not None else 'unknown'
+        started_at = perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.inc(name)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(perf_counter() - started_at, name)
@@ -0,0 +1,160 @@
+import asyncio
+from dataclasses import dataclass, field
+from math import ceil
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Iterable
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import Message, TelegramObject
+from config.config import Throttling
+from lexicon.lexicon import LEXICON_RU
+from utils.logger import logger
+from utils.metrics import Counter
+
+
+# Обработчики, запросы к которым ограничиваются: они обращаются к YouTube API или читают всю базу данных
+EXPENSIVE_HANDLERS = ('cmd_playlist', 'cmd_export', 'cmd_export_log')
+
+# Как часто удалять из памяти полностью восстановившиеся корзины пользователей
+BUCKETS_PRUNE_INTERVAL = 60.0
+
+REQUESTS_REJECTED = Counter('bot_requests_rejected_total', 'Количество отклоненных запросов', ('handler', 'reason'))
+
+
+@dataclass
+class ChatJobs:
+    """Запросы одного чата: ключи выполняющихся и ожидающих запросов и очередь на выполнение"""
+    keys: set[tuple] = field(default_factory=set)
+    jobs: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+@dataclass
+class TokenBucket:
+    """Корзина токенов пользователя; notified — пользователь уже получил ответ об ограничении"""
+    tokens: float
+    updated_at: float
+    notified: bool = False
+
+
+def job_keys(name: str, event: Message, data: Dict[str, Any]) -> set[tuple]:
+    """Ключи запроса для поиска повторов: по одному на плейлист или один на команду с аргументами"""
+    if 'playlist_identifiers' in data:
+        return {('playlist', playlist_identifier) for playlist_identifier in data['playlist_identifiers']}
+    return {(name, event.text)}
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware роутера: ограничивает дорогие запросы, чтобы всплеск запросов
+    одного пользователя не увеличивал задержку для остальных.
+
+    Для обработчиков из EXPENSIVE_HANDLERS:
+        - повтор запроса, который в этом чате еще выполняется (тот же плейлист или та же команда), отклоняется;
+        - запросы одного чата выполняются по очереди, в очереди не больше THROTTLE_CHAT_QUEUE запросов;
+        - число запросов пользователя ограничено корзиной токенов THROTTLE_USER_RATE в минуту
+          с запасом THROTTLE_USER_BURST;
+        - при THROTTLE_MAX_JOBS ожидающих и выполняющихся запросов всех пользователей новые отклоняются.
+
+    На отклоненный запрос бот вежливо отвечает; об ограничении частоты сообщается один раз,
+    пока у пользователя не появится новый токен. Остальные обработчики не ограничиваются.
+
+    Attributes:
+        config (Throttling): Параметры ограничения.
+        handlers (frozenset[str]): Имена ограничиваемых обработчиков.
+
+    """
+    def __init__(self, config: Throttling, handlers: Iterable[str] = EXPENSIVE_HANDLERS) -> None:
+        self.config = config
+        self.handlers = frozenset(handlers)
+        self.__chats: dict[int, ChatJobs] = {}
+        self.__buckets: dict[int, TokenBucket] = {}
+        self.__pruned_at = monotonic()
+        self.__jobs = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get('handler')
+        name = handler_object.callback.__name__ if handler_object is not None else 'unknown'
+        if name not in self.handlers or not isinstance(event, Message):
+            return await handler(event, data)
+
+        chat_id = event.chat.id
+        chat = self.__chats.get(chat_id) or ChatJobs()
+        keys = job_keys(name, event, data)
+
+        if chat.keys & keys:
+            return await self.__reject(event, name, 'duplicate', LEXICON_RU['request_in_progress'])
+        if chat.jobs >= self.config.chat_queue_size:
+            return await self.__reject(event, name, 'chat_queue', LEXICON_RU['chat_queue_full'])
+        if self.__jobs >= self.config.max_jobs:
+            return await self.__reject(event, name, 'overloaded', LEXICON_RU['overloaded'])
+        wait = self.__take_token(event.from_user.id if event.from_user else chat_id)
+        if wait is not None:
+            return await self.__reject(event, name, 'rate_limited', LEXICON_RU['rate_limited'].format(wait) if wait else None)
+
+        self.__chats[chat_id] = chat
+        chat.keys |= keys
+        chat.jobs += 1
+        self.__jobs += 1
+        try:
+            async with chat.lock:
+                return await handler(event, data)
+        finally:
+            chat.keys -= keys
+            chat.jobs -= 1
+            self.__jobs -= 1
+            if not chat.jobs:
+                del self.__chats[chat_id]
+
+    def __take_token(self, user_id: int) -> int | None:
+        """
+        Списывает токен пользователя.
+
+        Returns:
+            int | None: None, если токен списан; иначе через сколько секунд появится токен,
+                или 0, если пользователь уже получил ответ об ограничении.
+        """
+        now = monotonic()
+        self.__prune_buckets(now)
+        rate = self.config.user_rate / 60
+        bucket = self.__buckets.get(user_id)
+        if bucket is None:
+            bucket = self.__buckets[user_id] = TokenBucket(float(self.config.user_burst), now)
+
+        bucket.tokens = min(self.config.user_burst, bucket.tokens + (now - bucket.updated_at) * rate)
+        bucket.updated_at = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            bucket.notified = False
+            return None
+        if bucket.notified:
+            return 0
+        bucket.notified = True
+        return max(ceil((1 - bucket.tokens) / rate), 1)
+
+    def __prune_buckets(self, now: float) -> None:
+        """Удаляет корзины, которые успели полностью восстановиться: они не отличаются от новых"""
+        if now - self.__pruned_at < BUCKETS_PRUNE_INTERVAL:
+            return
+        self.__pruned_at = now
+        full_after = self.config.user_burst / (self.config.user_rate / 60)
+        for user_id in [user_id for user_id, bucket in self.__buckets.items() if now - bucket.updated_at >= full_after]:
+            del self.__buckets[user_id]
+
+    async def __reject(self, event: Message, name: str, reason: str, text: str | None) -> None:
+        REQUESTS_REJECTED.inc(name, reason)
+        logger.warning(
+            'Запрос %s пользователя %s отклонен: %s',
+            name, event.from_user.id if event.from_user else event.chat.id, reason
+        )
+        if text is None:
+            return
+        try:
+            await event.reply(text)
+        except TelegramAPIError as e:
+            logger.warning('Не удалось ответить на отклоненный запрос: %s', e)
@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable
+
+from config.config import load_config_database
+from models.methods import DataBase
+from service.telegram_db_excel_service import build_excel_file
+from utils.logger import logger
+
+
+class AsyncDataBase:
+    """
+    Асинхронный доступ к базе данных бота.
+
+    Ни один вызов SQLite не выполняется в цикле событий: запись ставится в очередь
+    потока записи DataBase, а чтение выполняется в отдельном пуле из DATABASE_READERS
+    потоков со своими соединениями. В режиме WAL чтение не ждет записи, поэтому долгая
+    выгрузка /export не задерживает ни запись, ни обработчики.
+
+    Attributes:
+        database (DataBase): Синхронный доступ к базе данных, общий с клиентом YouTube API.
+
+    Methods:
+        save_playlist_info(playlist_info: dict) -> None:
+            Ставит данные плейлиста в очередь на запись.
+        save_playlists_info(playlist_infos: Iterable[dict], refreshed: bool = False) -> None:
+            Ставит данные нескольких плейлистов в очередь на запись одной транзакцией.
+        mark_playlists_refreshed(id_playlists: Iterable[str]) -> None:
+            Ставит в очередь отметку о попытке обновления плейлистов.
+        get_playlist_info(id_playlist: str) -> tuple[dict, float] | None:
+            Возвращает сохраненные данные плейлиста и их возраст.
+        get_playlists_to_refresh(stale_after: float, limit: int, max_item_count: int | None = None) -> list[tuple[str, Any]]:
+            Возвращает устаревшие плейлисты для фонового обновления.
+        get_quota_usage(day: str) -> dict[str, int]:
+            Возвращает расход квоты YouTube API по методам за сутки.
+        export_playlist_info() -> str:
+            Выгружает таблицу playlist_info во временный файл Excel.
+        flush() -> None:
+            Дожидается записи изменений, поставленных в очередь до вызова.
+        close() -> None:
+            Останавливает пул чтения и закрывает базу данных.
+
+    """
+    def __init__(self, database: DataBase | None = None, readers: int | None = None) -> None:
+        """
+        Инициализация асинхронного доступа.
+
+        Args:
+            database: Синхронный доступ к базе данных. По умолчанию создается новый DataBase.
+            readers: Количество потоков чтения. По умолчанию DATABASE_READERS.
+
+        """
+        self.database = database or DataBase()
+        self.__readers = ThreadPoolExecutor(
+            max_workers=readers or load_config_database().database.readers,
+            thread_name_prefix='database-reader'
+        )
+
+    async def __read(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Выполняет функцию чтения в пуле потоков чтения"""
+        return await asyncio.get_running_loop().run_in_executor(self.__readers, func, *args)
+
+    async def save_playlist_info(self, playlist_info: Dict[str, Any]) -> None:
+        self.database.save_playlist_info(playlist_info)
+
+    async def save_playlists_info(self, playlist_infos: Iterable[Dict[str, Any]], refreshed: bool = False) -> None:
+        self.database.save_playlists_info(playlist_infos, refreshed)
+
+    async def mark_playlists_refreshed(self, id_playlists: Iterable[str]) -> None:
+        self.database.mark_playlists_refreshed(id_playlists)
+
+    async def get_playlist_info(self, id_playlist: str) -> tuple[Dict[str, Any], float] | None:
+        return await self.__read(self.database.get_playlist_info, id_playlist)
+
+    async def get_playlists_to_refresh(
+        self, stale_after: float, limit: int, max_item_count: int | None = None
+    ) -> list[tuple[str, Any]]:
+        return await self.__read(self.database.get_playlists_to_refresh, stale_after, limit, max_item_count)
+
+    async def get_quota_usage(self, day: str) -> Dict[str, int]:
+        return await self.__read(self.database.get_quota_usage, day)
+
+    async def export_playlist_info(self) -> str:
+        """
+        Выгружает таблицу playlist_info во временный файл Excel в пуле потоков чтения.
+
+        Returns:
+            str: Путь к временному файлу Excel, который удаляет вызывающий код.
+        """
+        return await self.__read(build_excel_file, self.database.path_database)
+
+    async def flush(self) -> None:
+        """Дожидается записи изменений, поставленных в очередь до вызова, не занимая потоков"""
+        loop = asyncio.get_running_loop()
+        flushed = loop.create_future()
+        self.database.notify_when_flushed(lambda: loop.call_soon_threadsafe(flushed.set_result, None))
+        await flushed
+
+    async def close(self) -> None:
+        """Дожидается завершения начатых чтений, записывает накопленные изменения и закрывает соединения"""
+        await asyncio.to_thread(self.__readers.shutdown)
+        await asyncio.to_thread(self.database.close)
+        logger.info('Асинхронный доступ к базе данных остановлен')
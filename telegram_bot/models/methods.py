@@ -1,43 +1,442 @@
+import atexit
 import sqlite3
+from datetime import datetime, timedelta, timezone
+from queue import Empty, Queue
+from threading import Event, Lock, Thread, local
+from time import monotonic
 from utils.logger import logger
+from utils.metrics import Counter, Histogram
 from config.config import load_config_database
-from typing import Dict, Any
-from utils.logger import logger
+from typing import Dict, Any, Callable, Iterable
+
+
+# Максимальное количество параметров в одном запросе IN (...), безопасное для любых сборок SQLite
+SQLITE_MAX_VARIABLES = 500
+
+# Настройки соединения: WAL позволяет читать во время записи, synchronous=NORMAL убирает fsync на каждую транзакцию
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -16000',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA busy_timeout = 5000',
+)
+
+# Настройки соединений чтения: запись через них запрещена, все изменения выполняет поток записи
+SQLITE_READ_PRAGMAS = (
+    'PRAGMA query_only = ON',
+    'PRAGMA cache_size = -16000',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA busy_timeout = 5000',
+)
+
+# Поля таблицы playlist_info и значения по умолчанию для отсутствующих данных
+PLAYLIST_INFO_FIELDS: Dict[str, Any] = {
+    'kind': '',
+    'etag': '',
+    'id_playlist': '',
+    'publishedAt': '',
+    'channelId': '',
+    'title': '',
+    'thumbnails_url': '',
+    'thumbnails_width': 0,
+    'thumbnails_height': 0,
+    'channelTitle': '',
+    'privacyStatus': '',
+    'itemCount': 0,
+    'duration': '',
+}
+
+# Продолжительность, которую не удалось вычислить (например, при нехватке квоты): такой ответ
+# не заменяет сохраненную продолжительность и не продлевает ее актуальность
+MISSING_DURATIONS = ('', 'Нет данных')
+
+# Поля, которые обновляются только вместе с вычисленной продолжительностью: иначе по совпавшему
+# etag прежняя продолжительность продлевалась бы для изменившегося плейлиста
+DURATION_BOUND_FIELDS = ('etag', 'duration')
+
+FLUSH_LATENCY = Histogram('database_flush_seconds', 'Время записи накопленных изменений одной транзакцией')
+ROWS_WRITTEN = Counter('database_rows_written_total', 'Количество записанных в базу данных строк')
+FLUSH_ERRORS = Counter('database_flush_errors_total', 'Количество изменений, отброшенных из-за ошибки записи в базу данных')
 
 
 class DataBase:
+    """
+    Доступ к базе данных SQLite бота.
+
+    Запись выполняется отложенно в отдельном потоке с собственным соединением: изменения
+    складываются в очередь, а поток раз в DATABASE_FLUSH_INTERVAL_MS миллисекунд записывает
+    накопленное одной транзакцией. Чтение выполняется через соединения вызывающих потоков
+    (по одному на поток), поэтому в режиме WAL чтение не ждет записи, а запись — чтения.
+    Создание объекта не обращается к диску: соединение и таблицы создает поток записи,
+    чтение дожидается их готовности. Если соединение открыть не удалось, поток записи
+    завершается, а изменения не ставятся в очередь и ожидание записи не блокируется.
+    Перед завершением работы вызывается close().
+    """
     def __init__(self) -> None:
         config = load_config_database()
-        self.__path_database = config.database.path_database
-        
+        self.path_database = config.database.path_database
+        self.__flush_interval = config.database.flush_interval_ms / 1000
+
+        self.__connection: sqlite3.Connection | None = None
+        self.__ready = Event()
+        self.__thread_local = local()
+        self.__read_connections: list[sqlite3.Connection] = []
+        self.__read_connections_lock = Lock()
+
+        self.__closed = False
+        # Ошибка открытия соединения потоком записи; после нее очередь записи не принимает изменения
+        self.__open_error: Exception | None = None
+        self.__queue_lock = Lock()
+        self.__write_queue: Queue[tuple[str, list[tuple]] | Callable[[], None] | None] = Queue()
+        self.__writer = Thread(target=self.__write_behind, name='database-writer', daemon=True)
+        self.__writer.start()
+        atexit.register(self.close)
+
+    def __open(self) -> None:
+        """Открывает соединение потока записи и создает таблицы"""
+        self.__connection = sqlite3.connect(self.path_database, check_same_thread=False)
+        for pragma in SQLITE_PRAGMAS:
+            self.__connection.execute(pragma)
+
         try:
             self.__create_table_playlist()
-            logger.info(f'Таблица плейлист успешно инициализирована')
+            logger.info('Таблица плейлист успешно инициализирована')
         except sqlite3.Error as e:
-            logger.error(f'Произошла ошибка при инициализации таблицы плейлист: {e}')
+            logger.error('Произошла ошибка при инициализации таблицы плейлист: %s', e)
 
+        try:
+            self.__create_table_videos()
+            logger.info('Таблица видео успешно инициализирована')
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при инициализации таблицы видео: %s', e)
 
-    def save_playlist_info(self, playlist_info: Dict[str, Any]) -> None:
         try:
-            with sqlite3.connect(self.__path_database) as connection:
+            self.__create_table_quota_usage()
+            logger.info('Таблица расхода квоты успешно инициализирована')
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при инициализации таблицы расхода квоты: %s', e)
+
+    def __read_connection(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего потока только для чтения, создавая его при первом обращении"""
+        connection = getattr(self.__thread_local, 'connection', None)
+        if connection is None:
+            self.__ready.wait()
+            connection = sqlite3.connect(self.path_database, check_same_thread=False)
+            for pragma in SQLITE_READ_PRAGMAS:
+                connection.execute(pragma)
+            with self.__read_connections_lock:
+                self.__read_connections.append(connection)
+            self.__thread_local.connection = connection
+        return connection
+
+    def save_playlist_info(self, playlist_info: Dict[str, Any], refreshed: bool = False) -> None:
+        """Ставит данные плейлиста в очередь на запись"""
+        self.save_playlists_info([playlist_info], refreshed)
+
+    def save_playlists_info(self, playlist_infos: Iterable[Dict[str, Any]], refreshed: bool = False) -> None:
+        """Ставит данные нескольких плейлистов в очередь на запись; они будут записаны одной транзакцией.
+
+        Ответ пользователю (refreshed=False) увеличивает счетчик запросов request_count, а данные,
+        только что полученные из YouTube API (refreshed=True), обновляют время актуальности updated_at.
+        Данные без вычисленной продолжительности (MISSING_DURATIONS) не заменяют сохраненные
+        продолжительность и etag и не обновляют updated_at.
+        """
+        request_count, updated_at = (0, datetime.now(timezone.utc).isoformat()) if refreshed else (1, None)
+        missing = f"excluded.duration IN ({', '.join(repr(duration) for duration in MISSING_DURATIONS)})"
+        assignments = [
+            f'{field} = CASE WHEN {missing} THEN {field} ELSE excluded.{field} END'
+            if field in DURATION_BOUND_FIELDS else f'{field} = excluded.{field}'
+            for field in PLAYLIST_INFO_FIELDS if field != 'id_playlist'
+        ]
+        self.__enqueue(
+            f"""
+            INSERT INTO playlist_info ({', '.join(PLAYLIST_INFO_FIELDS)}, request_count, updated_at)
+            VALUES ({', '.join('?' * (len(PLAYLIST_INFO_FIELDS) + 2))})
+            ON CONFLICT(id_playlist) DO UPDATE SET
+                {', '.join(assignments)},
+                request_count = request_count + excluded.request_count,
+                updated_at = CASE WHEN {missing} THEN updated_at ELSE COALESCE(excluded.updated_at, updated_at) END
+            """,
+            [
+                (
+                    *(playlist_info.get(field, default) for field, default in PLAYLIST_INFO_FIELDS.items()),
+                    request_count,
+                    updated_at
+                )
+                for playlist_info in playlist_infos
+            ]
+        )
+
+    def mark_playlists_refreshed(self, id_playlists: Iterable[str]) -> None:
+        """Ставит в очередь отметку о попытке обновления: плейлист не будет выбран для обновления до устаревания"""
+        updated_at = datetime.now(timezone.utc).isoformat()
+        self.__enqueue(
+            'UPDATE playlist_info SET updated_at = ? WHERE id_playlist = ?',
+            [(updated_at, id_playlist) for id_playlist in id_playlists]
+        )
+
+    def get_playlist_info(self, id_playlist: str) -> tuple[Dict[str, Any], float] | None:
+        """Возвращает сохраненные данные плейлиста и их возраст в секундах.
+
+        Возвращается None, если плейлист не сохранен или время его получения из YouTube API неизвестно.
+        """
+        try:
+            with self.__read_connection() as connection:
+                row = connection.execute(
+                    f'SELECT {", ".join(PLAYLIST_INFO_FIELDS)}, updated_at FROM playlist_info WHERE id_playlist = ?',
+                    (id_playlist,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при чтении плейлиста: %s', e)
+            return None
+
+        if row is None or row[-1] is None:
+            return None
+        age = (datetime.now(timezone.utc) - datetime.fromisoformat(row[-1])).total_seconds()
+        return dict(zip(PLAYLIST_INFO_FIELDS, row[:-1])), age
+
+    def get_playlists_to_refresh(
+        self, stale_after: float, limit: int, max_item_count: int | None = None
+    ) -> list[tuple[str, Any]]:
+        """Возвращает идентификаторы и количество видео плейлистов, устаревших более stale_after секунд назад.
+
+        Первыми идут плейлисты с наибольшим произведением количества запросов на возраст данных:
+        часто запрашиваемые и давно не обновлявшиеся. Плейлисты, в которых больше max_item_count
+        видео, не выбираются, чтобы не занимать порцию плейлистами, на обновление которых не хватит квоты.
+        """
+        updated_before = (datetime.now(timezone.utc) - timedelta(seconds=stale_after)).isoformat()
+        try:
+            with self.__read_connection() as connection:
+                cursor = connection.execute(
+                    """
+                    SELECT id_playlist, itemCount FROM playlist_info
+                    WHERE (updated_at IS NULL OR updated_at < ?)
+                        AND (? IS NULL OR typeof(itemCount) != 'integer' OR itemCount <= ?)
+                    ORDER BY (request_count + 1) * (julianday('now') - julianday(COALESCE(updated_at, '1970-01-01'))) DESC
+                    LIMIT ?
+                    """,
+                    (updated_before, max_item_count, max_item_count, limit)
+                )
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при выборе плейлистов для обновления: %s', e)
+            return []
+
+    def get_video_durations(self, video_ids: Iterable[str], max_age: float) -> Dict[str, float | None]:
+        """Возвращает сохраненную продолжительность видео, полученную не раньше max_age секунд назад.
+
+        Недоступные (удаленные или приватные) видео сохраняются с продолжительностью None,
+        чтобы не запрашивать их повторно до истечения срока.
+        """
+        video_ids = list(video_ids)
+        fetched_after = (datetime.now(timezone.utc) - timedelta(seconds=max_age)).isoformat()
+        durations: Dict[str, float | None] = {}
+
+        try:
+            with self.__read_connection() as connection:
                 cursor = connection.cursor()
-                cursor.execute('SELECT * FROM playlist_info WHERE id_playlist = ?', (playlist_info['id_playlist'],))
-                existing_data = cursor.fetchone()
-                
-                if existing_data:
-                    self.__update_table_playlist(cursor, playlist_info, existing_data)
-                else:
-                    self.__insert_table_playlist(cursor, playlist_info)
-                    
+                for start in range(0, len(video_ids), SQLITE_MAX_VARIABLES):
+                    chunk = video_ids[start:start + SQLITE_MAX_VARIABLES]
+                    placeholders = ', '.join('?' * len(chunk))
+                    cursor.execute(
+                        f'SELECT id_video, duration_seconds FROM videos '
+                        f'WHERE fetched_at >= ? AND id_video IN ({placeholders})',
+                        (fetched_after, *chunk)
+                    )
+                    durations.update(cursor.fetchall())
         except sqlite3.Error as e:
-            logger.error(f'Произошла ошибка при сохранении данных плейлиста: {e}')
-    
+            logger.error('Произошла ошибка при чтении продолжительности видео: %s', e)
+
+        return durations
+
+    def save_video_durations(self, durations: Dict[str, float | None]) -> None:
+        """Ставит в очередь на запись продолжительность видео в секундах вместе со временем получения"""
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        self.__enqueue(
+            """
+            INSERT INTO videos (id_video, duration_seconds, fetched_at) VALUES (?, ?, ?)
+            ON CONFLICT(id_video) DO UPDATE SET
+                duration_seconds = excluded.duration_seconds,
+                fetched_at = excluded.fetched_at
+            """,
+            [(video_id, duration, fetched_at) for video_id, duration in durations.items()]
+        )
+
+    def get_quota_usage(self, day: str) -> Dict[str, int]:
+        """Возвращает израсходованные единицы квоты YouTube API по методам за сутки"""
+        try:
+            with self.__read_connection() as connection:
+                cursor = connection.execute('SELECT method, units FROM quota_usage WHERE day = ?', (day,))
+                return dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при чтении расхода квоты: %s', e)
+            return {}
+
+    def get_quota_usage_by_priority(self, day: str) -> Dict[str, int]:
+        """Возвращает израсходованные единицы квоты YouTube API по приоритетам запросов за сутки"""
+        try:
+            with self.__read_connection() as connection:
+                cursor = connection.execute('SELECT priority, units FROM quota_usage_priority WHERE day = ?', (day,))
+                return dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при чтении расхода квоты по приоритетам: %s', e)
+            return {}
+
+    def add_quota_usage(self, day: str, method: str, units: int, priority: str = 'interactive') -> None:
+        """Ставит в очередь добавление израсходованных единиц квоты YouTube API к счетчикам метода и приоритета за сутки"""
+        self.__enqueue(
+            """
+            INSERT INTO quota_usage (day, method, units) VALUES (?, ?, ?)
+            ON CONFLICT(day, method) DO UPDATE SET units = units + excluded.units
+            """,
+            [(day, method, units)]
+        )
+        self.__enqueue(
+            """
+            INSERT INTO quota_usage_priority (day, priority, units) VALUES (?, ?, ?)
+            ON CONFLICT(day, priority) DO UPDATE SET units = units + excluded.units
+            """,
+            [(day, priority, units)]
+        )
+
+    def flush(self) -> None:
+        """Дожидается записи всех изменений, поставленных в очередь до вызова"""
+        flushed = Event()
+        self.notify_when_flushed(flushed.set)
+        flushed.wait()
+
+    def notify_when_flushed(self, callback: Callable[[], None]) -> None:
+        """Вызывает callback в потоке записи после записи всех изменений, поставленных в очередь до вызова"""
+        with self.__queue_lock:
+            if not self.__closed and self.__open_error is None:
+                self.__write_queue.put(callback)
+                return
+        callback()
+
+    def close(self) -> None:
+        """Записывает накопленные изменения, останавливает фоновый поток и закрывает соединения"""
+        if self.__closed:
+            return
+        self.flush()
+        with self.__queue_lock:
+            self.__closed = True
+            self.__write_queue.put(None)
+        self.__writer.join()
+        with self.__read_connections_lock:
+            for connection in self.__read_connections:
+                connection.close()
+            self.__read_connections.clear()
+        if self.__connection is not None:
+            self.__connection.close()
+        atexit.unregister(self.close)
+        logger.info('Соединение с базой данных закрыто')
+
+    def __enqueue(self, query: str, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        with self.__queue_lock:
+            if not self.__closed and self.__open_error is None:
+                self.__write_queue.put((query, rows))
+                return
+        if self.__open_error is not None:
+            logger.error('Запись в базу данных пропущена: не удалось открыть базу данных: %s', self.__open_error)
+        else:
+            logger.error('Запись в закрытую базу данных пропущена')
+
+    def __write_behind(self) -> None:
+        """Фоновый поток записи: собирает изменения за интервал и записывает их одной транзакцией"""
+        try:
+            self.__open()
+        except Exception as e:
+            logger.exception('Не удалось открыть базу данных %s: %s', self.path_database, e)
+            self.__abandon_queue(e)
+            return
+        finally:
+            self.__ready.set()
+
+        while True:
+            item = self.__write_queue.get()
+            batch: list[tuple[str, list[tuple]]] = []
+            waiters: list[Callable[[], None]] = []
+            stop = False
+            deadline = monotonic() + self.__flush_interval
+
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if callable(item):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                try:
+                    item = self.__write_queue.get(timeout=max(deadline - monotonic(), 0))
+                except Empty:
+                    break
+
+            if batch:
+                self.__write_batch(batch)
+            for waiter in waiters:
+                waiter()
+            if stop:
+                return
+
+    def __abandon_queue(self, error: Exception) -> None:
+        """Закрывает очередь записи после ошибки открытия: изменения отбрасываются, ожидающие освобождаются"""
+        with self.__queue_lock:
+            self.__open_error = error
+        dropped = 0
+        while True:
+            try:
+                item = self.__write_queue.get_nowait()
+            except Empty:
+                break
+            if callable(item):
+                item()
+            elif item is not None:
+                dropped += 1
+        if dropped:
+            FLUSH_ERRORS.inc(amount=dropped)
+            logger.error('Отброшено изменений, не записанных в базу данных: %d', dropped)
+
+    def __write_batch(self, batch: list[tuple[str, list[tuple]]]) -> None:
+        started_at = monotonic()
+        try:
+            with self.__connection:
+                for query, rows in batch:
+                    self.__connection.executemany(query, rows)
+        except sqlite3.Error as e:
+            # Транзакция откатилась целиком: изменения повторяются по одному, чтобы ошибка одного
+            # не отбрасывала остальные изменения порции
+            logger.warning('Ошибка при записи порции изменений, изменения записываются по одному: %s', e)
+            for query, rows in batch:
+                self.__write_statement(query, rows)
+        else:
+            ROWS_WRITTEN.inc(amount=sum(len(rows) for _, rows in batch))
+        elapsed = monotonic() - started_at
+        FLUSH_LATENCY.observe(elapsed)
+        logger.debug('Записано изменений в базу данных: %d за %.3f с', len(batch), elapsed)
+
+    def __write_statement(self, query: str, rows: list[tuple]) -> None:
+        """Записывает одно изменение отдельной транзакцией; при ошибке изменение отбрасывается"""
+        try:
+            with self.__connection:
+                self.__connection.executemany(query, rows)
+            ROWS_WRITTEN.inc(amount=len(rows))
+        except sqlite3.Error as e:
+            FLUSH_ERRORS.inc()
+            logger.error(
+                'Произошла ошибка при записи в базу данных, отброшено строк: %d, запрос: %s, ошибка: %s',
+                len(rows), ' '.join(query.split())[:200], e
+            )
+
     def __create_table_playlist(self) -> None:
         try:
-            with sqlite3.connect(self.__path_database) as connection:
+            with self.__connection as connection:
                 cursor = connection.cursor()
                 cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS playlist_info ( 
+                    CREATE TABLE IF NOT EXISTS playlist_info (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         kind TEXT,
                         etag TEXT,
@@ -51,65 +450,57 @@ class DataBase:
                         channelTitle TEXT,
                         privacyStatus TEXT,
                         itemCount INTEGER,
-                        duration TEXT
+                        duration TEXT,
+                        request_count INTEGER NOT NULL DEFAULT 0,
+                        updated_at TEXT
                     )
                 """)
+                # Таблицы, созданные прежними версиями бота, дополняются новыми столбцами
+                columns = {row[1] for row in cursor.execute('PRAGMA table_info(playlist_info)')}
+                if 'request_count' not in columns:
+                    cursor.execute('ALTER TABLE playlist_info ADD COLUMN request_count INTEGER NOT NULL DEFAULT 0')
+                if 'updated_at' not in columns:
+                    cursor.execute('ALTER TABLE playlist_info ADD COLUMN updated_at TEXT')
         except sqlite3.Error as e:
-            logger.error(f'Произошла ошибка при создании таблицы плейлиста: {e}')
-        
-    def __update_table_playlist(self, cursor: sqlite3.Cursor, playlist_info: Dict[str, Any], existing_data: tuple) -> None:
-        update_query = """
-        UPDATE playlist_info SET
-            kind = ?,
-            etag = ?,
-            publishedAt = ?,
-            channelId = ?,
-            title = ?,
-            thumbnails_url = ?,
-            thumbnails_width = ?,
-            thumbnails_height = ?,
-            channelTitle = ?,
-            privacyStatus = ?,
-            itemCount = ?,
-            duration = ?
-        WHERE id_playlist = ?
-        """
-        cursor.execute(update_query, (
-            playlist_info.get('kind', ''),
-            playlist_info.get('etag', ''),
-            playlist_info.get('publishedAt', ''),
-            playlist_info.get('channelId', ''),
-            playlist_info.get('title', ''),
-            playlist_info.get('thumbnails_url', ''),
-            playlist_info.get('thumbnails_width', 0),
-            playlist_info.get('thumbnails_height', 0),
-            playlist_info.get('channelTitle', ''),
-            playlist_info.get('privacyStatus', ''),
-            playlist_info.get('itemCount', 0),
-            playlist_info.get('duration', ''),
-            playlist_info['id_playlist']
-        ))
-            
-    def __insert_table_playlist(self, cursor: sqlite3.Cursor, playlist_info: Dict[str, Any]) -> None:
-        insert_query = """
-        INSERT INTO playlist_info (
-            kind, etag, id_playlist, publishedAt, channelId, title,
-            thumbnails_url, thumbnails_width, thumbnails_height, channelTitle,
-            privacyStatus, itemCount, duration
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        cursor.execute(insert_query, (
-            playlist_info.get('kind', ''),
-            playlist_info.get('etag', ''),
-            playlist_info.get('id_playlist', ''),
-            playlist_info.get('publishedAt', ''),
-            playlist_info.get('channelId', ''),
-            playlist_info.get('title', ''),
-            playlist_info.get('thumbnails_url', ''),
-            playlist_info.get('thumbnails_width', 0),
-            playlist_info.get('thumbnails_height', 0),
-            playlist_info.get('channelTitle', ''),
-            playlist_info.get('privacyStatus', ''),
-            playlist_info.get('itemCount', 0),
-            playlist_info.get('duration', '')
-        ))
\ No newline at end of file
+            logger.error('Произошла ошибка при создании таблицы плейлиста: %s', e)
+
+    def __create_table_videos(self) -> None:
+        try:
+            with self.__connection as connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS videos (
+                        id_video TEXT PRIMARY KEY,
+                        duration_seconds REAL,
+                        fetched_at TEXT NOT NULL
+                    )
+                """)
+                # Состав плейлистов не используется: неизменный плейлист определяется по etag
+                cursor.execute('DROP TABLE IF EXISTS playlist_videos')
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при создании таблицы видео: %s', e)
+
+    def __create_table_quota_usage(self) -> None:
+        try:
+            with self.__connection as connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS quota_usage (
+                        day TEXT NOT NULL,
+                        method TEXT NOT NULL,
+                        units INTEGER NOT NULL,
+                        PRIMARY KEY (day, method)
+                    )
+                """)
+                # Расход по приоритетам нужен фоновому обновлению, чтобы его доля квоты
+                # не начиналась заново после перезапуска бота
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS quota_usage_priority (
+                        day TEXT NOT NULL,
+                        priority TEXT NOT NULL,
+                        units INTEGER NOT NULL,
+                        PRIMARY KEY (day, priority)
+                    )
+                """)
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при создании таблицы расхода квоты: %s', e)
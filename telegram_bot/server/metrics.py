@@ -0,0 +1,43 @@
+from aiohttp import web
+from config.config import Metrics
+from server.webhook import health
+from utils.logger import logger
+from utils.metrics import render_metrics
+
+
+async def metrics(request: web.Request) -> web.Response:
+    """
+    Отдает метрики процесса в текстовом формате Prometheus.
+
+    Args:
+        request (web.Request): Входящий HTTP-запрос.
+
+    Returns:
+        web.Response: Текст метрик.
+    """
+    return web.Response(text=render_metrics(), content_type='text/plain', charset='utf-8')
+
+
+async def start_metrics_server(config: Metrics) -> web.AppRunner | None:
+    """
+    Запускает HTTP-сервер с маршрутами /metrics и /health.
+
+    Args:
+        config (Metrics): Конфигурация сервера метрик.
+
+    Returns:
+        web.AppRunner | None: Запущенный сервер, который останавливает вызывающий код,
+            или None, если METRICS_PORT не задан.
+    """
+    if not config.port:
+        return None
+
+    app = web.Application()
+    app.router.add_get('/metrics', metrics)
+    app.router.add_get('/health', health)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=config.host, port=config.port).start()
+    logger.info('Сервер метрик запущен на %s:%d', config.host, config.port)
+    return runner
@@ -0,0 +1,137 @@
+import asyncio
+import hmac
+from typing import Callable
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from config.config import Webhook
+from utils.logger import logger
+
+
+async def health(request: web.Request) -> web.Response:
+    """
+    Проверка работоспособности для балансировщика нагрузки.
+
+    Args:
+        request (web.Request): Входящий HTTP-запрос.
+
+    Returns:
+        web.Response: JSON {"status": "ok"}.
+    """
+    return web.json_response({'status': 'ok'})
+
+
+def build_webhook_app(dp: Dispatcher, bot: Bot, config: Webhook) -> web.Application:
+    """
+    Создает aiohttp-приложение, принимающее обновления Telegram через вебхук.
+
+    Запросы без правильного заголовка X-Telegram-Bot-Api-Secret-Token отклоняются.
+    Обновления обрабатываются в фоновых задачах, поэтому Telegram сразу получает ответ 200.
+
+    Args:
+        dp (Dispatcher): Диспетчер с подключенными роутерами.
+        bot (Bot): Объект бота.
+        config (Webhook): Конфигурация вебхука.
+
+    Returns:
+        web.Application: Приложение с маршрутами вебхука и /health.
+    """
+    app = web.Application()
+    app.router.add_get('/health', health)
+
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=config.secret_token
+    ).register(app, path=config.path)
+
+    # События startup/shutdown диспетчера и роутеров привязываются к жизненному циклу приложения
+    setup_application(app, dp, bot=bot)
+
+    async def register_webhook(bot: Bot) -> None:
+        if not config.base_url:
+            logger.warning('WEBHOOK_BASE_URL не задан, вебхук в Telegram не регистрируется')
+            return
+        await bot.set_webhook(
+            url=f'{config.base_url}{config.path}',
+            secret_token=config.secret_token,
+            drop_pending_updates=False
+        )
+        logger.info('Вебхук зарегистрирован: %s%s', config.base_url, config.path)
+
+    dp.startup.register(register_webhook)
+    return app
+
+
+def build_forwarding_app(bot: Bot, config: Webhook, forward: Callable[[dict], None]) -> web.Application:
+    """
+    Создает aiohttp-приложение вебхука, которое не обрабатывает обновления, а передает их дальше.
+
+    Используется супервизором: обновление в виде словаря Bot API отдается в forward, который
+    направляет его рабочему процессу.
+
+    Args:
+        bot (Bot): Объект бота для регистрации вебхука.
+        config (Webhook): Конфигурация вебхука.
+        forward (Callable[[dict], None]): Получатель обновлений.
+
+    Returns:
+        web.Application: Приложение с маршрутами вебхука и /health.
+    """
+    app = web.Application()
+    app.router.add_get('/health', health)
+
+    async def receive_update(request: web.Request) -> web.Response:
+        secret_token = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+        if not hmac.compare_digest(secret_token, config.secret_token):
+            return web.Response(status=401, text='Unauthorized')
+        forward(await request.json())
+        return web.json_response({})
+
+    app.router.add_post(config.path, receive_update)
+
+    async def register_webhook(app: web.Application) -> None:
+        if not config.base_url:
+            logger.warning('WEBHOOK_BASE_URL не задан, вебхук в Telegram не регистрируется')
+            return
+        await bot.set_webhook(url=f'{config.base_url}{config.path}', secret_token=config.secret_token)
+        logger.info('Вебхук зарегистрирован: %s%s', config.base_url, config.path)
+
+    app.on_startup.append(register_webhook)
+    return app
+
+
+async def serve(app: web.Application, config: Webhook) -> None:
+    """
+    Запускает HTTP-сервер приложения и работает до отмены.
+
+    Args:
+        app (web.Application): Приложение.
+        config (Webhook): Конфигурация вебхука с адресом и портом.
+
+    Returns:
+        None
+    """
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host=config.host, port=config.port).start()
+        logger.info('Сервер вебхука запущен на %s:%d', config.host, config.port)
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, config: Webhook) -> None:
+    """
+    Запускает HTTP-сервер вебхука и работает до отмены.
+
+    Args:
+        dp (Dispatcher): Диспетчер с подключенными роутерами.
+        bot (Bot): Объект бота.
+        config (Webhook): Конфигурация вебхука.
+
+    Returns:
+        None
+    """
+    await serve(build_webhook_app(dp, bot, config), config)
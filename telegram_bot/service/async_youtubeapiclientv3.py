@@ -0,0 +1,207 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from threading import Event
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from config.config import load_config_service_youtube
+from service.single_flight import SingleFlight
+from service.youtube_quota import Priority, request_priority
+from service.youtubeapiclientv3 import PlaylistProgress, YouTubeAPIClientV3, cancel_event
+from utils.logger import logger
+
+
+class AsyncYouTubeAPIClientV3:
+    """
+    Асинхронный фасад над YouTubeAPIClientV3.
+
+    Синхронные вызовы клиента выполняются в ограниченном пуле потоков, поэтому длительный
+    обход большого плейлиста не блокирует цикл событий aiogram. Одновременные запросы
+    одного и того же плейлиста объединяются в один обход, если у них совпадают признак refresh
+    и приоритет: иначе интерактивный запрос унаследовал бы приоритет фонового обновления,
+    а обновление получило бы сохраненные данные вместо свежих.
+
+    Attributes:
+        client (YouTubeAPIClientV3): Синхронный клиент YouTube API.
+        single_flight (SingleFlight): Реестр выполняющихся запросов плейлистов.
+
+    Methods:
+        get_playlist_info(playlist_identifier: str, refresh: bool = False) -> dict:
+            Асинхронно получает информацию о плейлисте.
+        stream_playlist_info(playlist_identifier: str, refresh: bool = False) -> AsyncIterator[PlaylistProgress]:
+            Асинхронно получает информацию о плейлисте по частям.
+        close() -> None:
+            Останавливает пул потоков, отменяет ожидающие вызовы и закрывает соединения клиента.
+
+    Raises:
+        asyncio.TimeoutError: Если вызов не уложился в YOUTUBE_REQUEST_TIMEOUT.
+        RequestCancelledError: Если вызов был отменен до выполнения очередного запроса к API.
+
+    """
+    def __init__(
+        self,
+        client: YouTubeAPIClientV3 | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None
+    ) -> None:
+        """
+        Инициализация асинхронного клиента.
+
+        Args:
+            client: Синхронный клиент. По умолчанию создается новый YouTubeAPIClientV3.
+            max_concurrency: Максимальное число одновременных вызовов. По умолчанию YOUTUBE_MAX_CONCURRENCY.
+            timeout: Таймаут одного вызова в секундах. По умолчанию YOUTUBE_REQUEST_TIMEOUT.
+
+        """
+        config = load_config_service_youtube()
+        self.client = client or YouTubeAPIClientV3()
+        self.__max_concurrency = max_concurrency or config.service_youtube.max_concurrency
+        self.__timeout = timeout or config.service_youtube.request_timeout
+
+        self.single_flight = SingleFlight()
+        self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.__max_concurrency,
+            thread_name_prefix='youtube-api'
+        )
+
+        logger.info(
+            'Сервис AsyncYouTubeAPIClientV3 был успешно инициализирован: потоков %d, таймаут %.1f с',
+            self.__max_concurrency, self.__timeout
+        )
+
+    async def get_playlist_info(self, playlist_identifier: str, refresh: bool = False) -> dict:
+        """
+        Асинхронно получает информацию о плейлисте из YouTube API.
+
+        Args:
+            playlist_identifier: Идентификатор плейлиста (URL или ID).
+            refresh: Запросить данные из YouTube API, даже если сохраненные данные свежие.
+
+        Returns:
+            dict: Словарь с данными о плейлисте.
+
+        Raises:
+            InvalidPlaylistIdFormatError: Если идентификатор плейлиста неверного формата.
+
+        """
+        playlist_identifier = self.client.playlist.extract_identifier(playlist_identifier)
+        playlist_info = await self.single_flight.do(
+            self.__flight_key(playlist_identifier, refresh),
+            lambda: self.__run(self.client.playlist.get_info, playlist_identifier, refresh)
+        )
+        # Результат общий для всех ожидающих, поэтому каждый получает свою копию
+        return dict(playlist_info)
+
+    async def stream_playlist_info(self, playlist_identifier: str, refresh: bool = False) -> AsyncIterator[PlaylistProgress]:
+        """
+        Асинхронно получает информацию о плейлисте по частям: метаданные сразу после запроса
+        playlists.list, затем ход вычисления продолжительности после каждой страницы видео.
+
+        Одновременные запросы одного плейлиста объединяются так же, как в get_playlist_info:
+        присоединившийся вызов получает только итоговый результат.
+
+        Args:
+            playlist_identifier: Идентификатор плейлиста (URL или ID).
+            refresh: Запросить данные из YouTube API, даже если сохраненные данные свежие.
+
+        Yields:
+            PlaylistProgress: Промежуточные результаты и итоговый с done=True.
+
+        Raises:
+            InvalidPlaylistIdFormatError: Если идентификатор плейлиста неверного формата.
+
+        """
+        playlist_identifier = self.client.playlist.extract_identifier(playlist_identifier)
+        progress_queue: asyncio.Queue[PlaylistProgress | None] = asyncio.Queue()
+
+        async def walk() -> dict:
+            async for progress in self.__iterate(self.client.playlist.iter_info(playlist_identifier, refresh)):
+                progress_queue.put_nowait(progress)
+            return progress.playlist_info
+
+        result = asyncio.ensure_future(self.single_flight.do(self.__flight_key(playlist_identifier, refresh), walk))
+        # Признак завершения общего вызова: его результат нужен, если обход выполнял другой вызов
+        result.add_done_callback(lambda _: progress_queue.put_nowait(None))
+        try:
+            while (progress := await progress_queue.get()) is not None:
+                yield progress
+                if progress.done:
+                    return
+            yield PlaylistProgress(dict(await result), done=True)
+        finally:
+            if not result.done():
+                result.cancel()
+
+    @staticmethod
+    def __flight_key(playlist_identifier: str, refresh: bool) -> tuple[str, bool, Priority]:
+        """Ключ объединения запросов: общий обход выполняется с приоритетом первого вызова"""
+        return playlist_identifier, refresh, request_priority.get()
+
+    async def __iterate(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        """
+        Получает элементы синхронного итератора клиента в пуле потоков с ограничением параллелизма.
+
+        Таймаут YOUTUBE_REQUEST_TIMEOUT действует на весь обход; при таймауте или отмене
+        выставляется событие отмены, и поток прекращает работу перед следующим запросом к YouTube API.
+
+        Args:
+            iterator: Синхронный итератор клиента.
+
+        Yields:
+            Any: Элементы итератора.
+
+        """
+        async with self.__semaphore:
+            event = Event()
+            context = copy_context()
+            context.run(cancel_event.set, event)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.__timeout
+            try:
+                while True:
+                    future = loop.run_in_executor(self.__executor, context.run, next, iterator, None)
+                    item = await asyncio.wait_for(future, deadline - loop.time())
+                    if item is None:
+                        return
+                    yield item
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                event.set()
+                raise
+
+    async def __run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Выполняет синхронную функцию клиента в пуле потоков с ограничением параллелизма и таймаутом.
+
+        При таймауте или отмене корутины выставляется событие отмены, и поток прекращает
+        работу перед следующим запросом к YouTube API.
+
+        Args:
+            func: Синхронная функция клиента.
+            *args: Аргументы функции.
+
+        Returns:
+            Any: Результат функции.
+
+        """
+        async with self.__semaphore:
+            event = Event()
+            context = copy_context()
+            context.run(cancel_event.set, event)
+
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.__executor, context.run, func, *args)
+            try:
+                return await asyncio.wait_for(future, self.__timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                event.set()
+                raise
+
+    def close(self) -> None:
+        """
+        Останавливает пул потоков, отменяет вызовы, которые еще не начали выполняться,
+        и закрывает HTTP-соединения и кеш ответов клиента.
+        """
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from utils.metrics import Counter, Gauge
+
+
+CACHE_LOOKUPS = Counter('playlist_cache_lookups_total', 'Обращения к кешу данных плейлистов', ('result',))
+CACHE_REVALIDATIONS = Counter('playlist_cache_revalidations_total', 'Просроченные записи кеша плейлистов, продленные по etag')
+CACHE_EVICTIONS = Counter('playlist_cache_evictions_total', 'Записи, вытесненные из кеша плейлистов')
+CACHE_SIZE = Gauge('playlist_cache_size', 'Количество плейлистов в кеше')
+
+
+@dataclass
+class CacheEntry:
+    """Запись кеша: вычисленные данные плейлиста и время их сохранения"""
+    playlist_info: dict
+    stored_at: float
+
+
+class PlaylistCache:
+    """
+    Ограниченный по размеру LRU-кеш вычисленных данных плейлистов с временем жизни записей.
+
+    Просроченная запись не удаляется сразу: она возвращается вызывающему коду для
+    дешевой проверки по etag, и при совпадении etag продлевается через revalidate().
+    Кеш потокобезопасен, так как клиент YouTube API работает в пуле потоков.
+    Счетчики обращений, перепроверок и вытеснений выдаются также в /metrics.
+
+    Attributes:
+        max_size (int): Максимальное количество плейлистов в кеше.
+        ttl (float): Время жизни записи в секундах.
+
+    Methods:
+        get(playlist_identifier: str) -> tuple[CacheEntry | None, bool]:
+            Возвращает запись и признак ее свежести.
+        put(playlist_identifier: str, playlist_info: dict, age: float = 0.0) -> None:
+            Сохраняет данные плейлиста, вытесняя самые давно использованные записи.
+        revalidate(playlist_identifier: str, playlist_info: dict) -> dict:
+            Продлевает просроченную запись с неизменившимся etag.
+
+    """
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.__entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, playlist_identifier: str) -> tuple[CacheEntry | None, bool]:
+        """
+        Ищет данные плейлиста в кеше.
+
+        Args:
+            playlist_identifier: Идентификатор плейлиста.
+
+        Returns:
+            tuple[CacheEntry | None, bool]: Запись (или None) и признак того, что ее время жизни не истекло.
+                Свежая запись считается попаданием, отсутствующая или просроченная — промахом.
+
+        """
+        with self.__lock:
+            entry = self.__entries.get(playlist_identifier)
+            if entry is None:
+                CACHE_LOOKUPS.inc('miss')
+                return None, False
+
+            self.__entries.move_to_end(playlist_identifier)
+            if monotonic() - entry.stored_at < self.ttl:
+                CACHE_LOOKUPS.inc('hit')
+                return CacheEntry(dict(entry.playlist_info), entry.stored_at), True
+
+            CACHE_LOOKUPS.inc('expired')
+            return CacheEntry(dict(entry.playlist_info), entry.stored_at), False
+
+    def put(self, playlist_identifier: str, playlist_info: dict, age: float = 0.0) -> None:
+        """
+        Сохраняет данные плейлиста в кеш.
+
+        Args:
+            playlist_identifier: Идентификатор плейлиста.
+            playlist_info: Вычисленные данные плейлиста.
+            age: Возраст данных в секундах, например для данных, прочитанных из базы данных.
+
+        """
+        with self.__lock:
+            self.__entries[playlist_identifier] = CacheEntry(dict(playlist_info), monotonic() - age)
+            self.__entries.move_to_end(playlist_identifier)
+
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                CACHE_EVICTIONS.inc()
+            CACHE_SIZE.set(len(self.__entries))
+
+    def revalidate(self, playlist_identifier: str, playlist_info: dict) -> dict:
+        """
+        Продлевает время жизни записи, etag которой не изменился.
+
+        Args:
+            playlist_identifier: Идентификатор плейлиста.
+            playlist_info: Свежие метаданные плейлиста вместе с сохраненной продолжительностью.
+
+        Returns:
+            dict: Копия сохраненных данных плейлиста.
+
+        """
+        self.put(playlist_identifier, playlist_info)
+        CACHE_REVALIDATIONS.inc()
+        return dict(playlist_info)
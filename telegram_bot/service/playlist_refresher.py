@@ -0,0 +1,159 @@
+import asyncio
+from typing import Callable
+
+from config.config import Refresher
+from custom_exceptions.custom_exception import QuotaExceededError
+from models.async_methods import AsyncDataBase
+from service.async_youtubeapiclientv3 import AsyncYouTubeAPIClientV3
+from service.youtube_quota import (
+    QUOTA_COSTS, Priority, estimate_duration_cost, max_affordable_item_count, request_priority
+)
+from utils.logger import logger
+from utils.metrics import Counter
+
+
+PLAYLISTS_REFRESHED = Counter(
+    'playlist_refresh_total',
+    'Количество фоновых обновлений сохраненных плейлистов',
+    ('status',)
+)
+
+
+class PlaylistRefresher:
+    """
+    Фоновое обновление сохраненных плейлистов в пределах доли квоты YouTube API.
+
+    Раз в REFRESH_INTERVAL секунд из базы данных выбираются плейлисты, устаревшие более
+    REFRESH_STALE_AFTER секунд: первыми часто запрашиваемые и давно не обновлявшиеся.
+    Они по одному запрашиваются с приоритетом Priority.BACKGROUND, поэтому уступают
+    интерактивным запросам и не расходуют резерв квоты. За квотные сутки обновление
+    расходует не больше REFRESH_QUOTA_SHARE суточной квоты.
+
+    Attributes:
+        config (Refresher): Параметры фонового обновления.
+
+    Methods:
+        start() -> None:
+            Запускает фоновую задачу обновления.
+        stop() -> None:
+            Останавливает фоновую задачу.
+        refresh_batch() -> int:
+            Обновляет одну порцию устаревших плейлистов.
+        budget_left() -> int:
+            Возвращает остаток квоты фонового обновления на текущие сутки.
+
+    """
+    def __init__(
+        self,
+        service_factory: Callable[[], AsyncYouTubeAPIClientV3],
+        database_factory: Callable[[], AsyncDataBase],
+        config: Refresher
+    ) -> None:
+        """
+        Инициализация фонового обновления.
+
+        Args:
+            service_factory: Функция, возвращающая клиент YouTube API. Вызывается при первом обновлении,
+                чтобы запуск бота не ждал создания клиента.
+            database_factory: Функция, возвращающая асинхронный доступ к базе данных.
+            config: Параметры фонового обновления.
+
+        """
+        self.config = config
+        self.__service_factory = service_factory
+        self.__database_factory = database_factory
+        self.__task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if not self.config.quota_share:
+            logger.info('Фоновое обновление плейлистов отключено: REFRESH_QUOTA_SHARE=0')
+            return
+        self.__task = asyncio.create_task(self.__run(), name='playlist-refresher')
+        logger.info(
+            'Фоновое обновление плейлистов запущено: каждые %.0f с, доля квоты %.0f%%',
+            self.config.interval, self.config.quota_share * 100
+        )
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    async def __run(self) -> None:
+        # Задача выполняется в своем контексте, поэтому приоритет действует только на ее запросы
+        request_priority.set(Priority.BACKGROUND)
+        while True:
+            await asyncio.sleep(self.config.interval)
+            try:
+                await self.refresh_batch()
+            except Exception as e:
+                logger.error('Произошла ошибка при фоновом обновлении плейлистов: %s', e)
+
+    def budget_left(self) -> int:
+        """
+        Возвращает остаток квоты фонового обновления на текущие квотные сутки.
+
+        Returns:
+            int: Количество единиц квоты, которые еще может израсходовать фоновое обновление.
+        """
+        quota = self.__service_factory().client.quota
+        # Расход по приоритетам хранится в базе данных, поэтому перезапуск не возвращает израсходованную долю
+        return int(quota.ledger.daily_limit * self.config.quota_share) - quota.spent(Priority.BACKGROUND)
+
+    def __can_afford(self, service: AsyncYouTubeAPIClientV3, cost: int) -> bool:
+        """Проверяет, укладывается ли обновление стоимостью cost в остаток квоты обновления и суточной квоты"""
+        return cost <= self.budget_left() and service.client.quota.can_afford(cost)
+
+    async def refresh_batch(self) -> int:
+        """
+        Обновляет одну порцию устаревших плейлистов.
+
+        Плейлисты, обход которых не укладывается в остаток квоты фонового обновления, не выбираются:
+        иначе они оставались бы первыми в очереди и вытесняли более дешевые. Плейлист, который
+        не удалось обновить, откладывается до следующего устаревания.
+
+        Returns:
+            int: Количество обновленных плейлистов.
+        """
+        service = self.__service_factory()
+        database = self.__database_factory()
+        # Остаток квоты может перечитать расход из SQLite, поэтому проверяется вне цикла событий
+        budget = await asyncio.to_thread(self.budget_left)
+        if budget < QUOTA_COSTS['playlists.list'] + estimate_duration_cost(0):
+            logger.debug('Квота фонового обновления плейлистов на сегодня израсходована')
+            return 0
+
+        candidates = await database.get_playlists_to_refresh(
+            self.config.stale_after, self.config.batch_size, max_affordable_item_count(budget)
+        )
+        refreshed = 0
+        for id_playlist, item_count in candidates:
+            cost = QUOTA_COSTS['playlists.list'] + estimate_duration_cost(item_count)
+            if not await asyncio.to_thread(self.__can_afford, service, cost):
+                PLAYLISTS_REFRESHED.inc('skipped')
+                continue
+            try:
+                await service.get_playlist_info(id_playlist, refresh=True)
+            except QuotaExceededError as e:
+                PLAYLISTS_REFRESHED.inc('skipped')
+                logger.warning('Фоновое обновление плейлистов остановлено: %s', e)
+                break
+            except Exception as e:
+                PLAYLISTS_REFRESHED.inc('error')
+                logger.warning('Не удалось обновить плейлист %s: %s', id_playlist, e)
+                await database.mark_playlists_refreshed([id_playlist])
+                continue
+            PLAYLISTS_REFRESHED.inc('ok')
+            refreshed += 1
+
+        if candidates:
+            logger.info(
+                'Фоновое обновление: обновлено плейлистов %d из %d, остаток квоты обновления %d',
+                refreshed, len(candidates), await asyncio.to_thread(self.budget_left)
+            )
+        return refreshed
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from utils.metrics import Counter
+
+
+SINGLE_FLIGHT_CALLS = Counter(
+    'single_flight_calls_total',
+    'Вызовы с объединением одинаковых запросов: executed — новое выполнение, coalesced — присоединение к выполняющемуся',
+    ('result',)
+)
+
+
+class SingleFlight:
+    """
+    Реестр выполняющихся запросов: одновременные вызовы с одинаковым ключом ожидают
+    одно общее выполнение и получают один и тот же результат или одно и то же исключение.
+
+    Общее выполнение отменяется, только когда отменены все его ожидающие.
+    Количество новых и объединенных вызовов выдается в /metrics.
+
+    Methods:
+        do(key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+            Выполняет func или присоединяется к уже выполняющемуся вызову с тем же ключом.
+
+    """
+    def __init__(self) -> None:
+        self.__in_flight: dict[Hashable, asyncio.Task] = {}
+        self.__waiters: dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет func или присоединяется к уже выполняющемуся вызову с тем же ключом.
+
+        Args:
+            key: Ключ запроса, например идентификатор плейлиста с параметрами запроса.
+            func: Функция, создающая корутину запроса.
+
+        Returns:
+            Any: Результат общего выполнения.
+
+        """
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.__in_flight[key] = task
+            self.__waiters[key] = 0
+            task.add_done_callback(lambda done: self.__forget(key, done))
+            SINGLE_FLIGHT_CALLS.inc('executed')
+        else:
+            SINGLE_FLIGHT_CALLS.inc('coalesced')
+
+        self.__waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self.__waiters[key] == 1:
+                task.cancel()
+            raise
+        finally:
+            if self.__in_flight.get(key) is task:
+                self.__waiters[key] -= 1
+
+    def __forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Удаляет завершенный вызов из реестра"""
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+            del self.__waiters[key]
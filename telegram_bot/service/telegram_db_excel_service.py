@@ -1,50 +1,55 @@
 import sqlite3
-import io
-from openpyxl import Workbook
+import tempfile
+from config.config import load_config_database
 
-def send_excel_file() -> io.BytesIO:
+
+# Количество строк, читаемых из базы данных за один раз
+EXPORT_CHUNK_SIZE = 5000
+
+
+def build_excel_file(path_database: str | None = None, chunk_size: int = EXPORT_CHUNK_SIZE) -> str:
     """
-    Создает файл Excel, содержащий данные из базы данных SQLite.
-    
+    Создает файл Excel с данными таблицы playlist_info.
+
+    Строки читаются из базы данных порциями по chunk_size и сразу записываются в книгу
+    в потоковом режиме openpyxl, поэтому ни таблица, ни книга целиком в памяти не хранятся.
+    Результат сохраняется во временный файл, который удаляет вызывающий код.
+
+    Args:
+        path_database (str, optional): Путь к базе данных. По умолчанию PATH_DATABASE из .env.
+        chunk_size (int): Количество строк, читаемых за один раз.
+
     Returns:
-        io.BytesIO: Байтовый поток с данными файла Excel.
+        str: Путь к временному файлу Excel.
     """
-    # Создаем байтовый поток для хранения данных Excel
-    excel_buffer = io.BytesIO()
+    # openpyxl импортируется при первой выгрузке, а не при запуске бота
+    from openpyxl import Workbook
 
-    # Подключаемся к базе данных SQLite
-    conn = sqlite3.connect('db.sqlite3')
-    cursor = conn.cursor()
+    path_database = path_database or load_config_database().database.path_database
 
-    try:
-        # Создаем новый файл Excel
-        workbook = Workbook()
+    # Создаем книгу в потоковом режиме: строки можно только добавлять, зато память не растет
+    workbook = Workbook(write_only=True)
+    playlist_info_sheet = workbook.create_sheet(title="Playlist Info")
 
-        # Получаем данные из таблицы playlist_info
-        cursor.execute("SELECT * FROM playlist_info")
-        data_playlist_info = cursor.fetchall()
+    # Подключаемся к базе данных SQLite только для чтения, чтобы не мешать записи бота
+    conn = sqlite3.connect(f'file:{path_database}?mode=ro', uri=True)
 
-        # Создаем лист для данных из таблицы playlist_info
-        playlist_info_sheet = workbook.create_sheet(title="Playlist Info")
+    try:
+        cursor = conn.execute("SELECT * FROM playlist_info")
 
         # Записываем заголовки столбцов для таблицы playlist_info
-        headers_playlist_info = [description[0] for description in cursor.description]
-        for col, header in enumerate(headers_playlist_info, start=1):
-            playlist_info_sheet.cell(row=1, column=col, value=header)
-
-        # Записываем данные в лист для таблицы playlist_info
-        for row, row_data in enumerate(data_playlist_info, start=2):
-            for col, value in enumerate(row_data, start=1):
-                playlist_info_sheet.cell(row=row, column=col, value=value)
+        playlist_info_sheet.append([description[0] for description in cursor.description])
 
-        # Удаляем дефолтный лист, если нужно
-        workbook.remove(workbook["Sheet"])
-
-        # Сохраняем файл Excel в байтовый поток
-        workbook.save(excel_buffer)
-        excel_buffer.seek(0)
+        # Записываем данные порциями
+        while rows := cursor.fetchmany(chunk_size):
+            for row_data in rows:
+                playlist_info_sheet.append(row_data)
     finally:
         # Закрываем соединение с базой данных
         conn.close()
 
-    return excel_buffer
\ No newline at end of file
+    # Сохраняем файл Excel во временный файл на диске
+    with tempfile.NamedTemporaryFile(prefix='db_data_', suffix='.xlsx', delete=False) as excel_file:
+        workbook.save(excel_file)
+
+    return excel_file.name
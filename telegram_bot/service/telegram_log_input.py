@@ -1,25 +1,248 @@
-import io
+import asyncio
+import gzip
+import logging
+import os
+import re
+import shutil
+import tempfile
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from typing import BinaryIO, Iterable, Iterator
+from config.config import load_config_logger
 
 
-def get_log_file_as_bytesio() -> io.BytesIO:
+# Размер блока при чтении журнала с конца
+READ_BLOCK_SIZE = 64 * 1024
+
+# Максимальный размер одного отправляемого документа: ограничение Bot API 50 МБ с запасом
+MAX_DOCUMENT_SIZE = 45 * 1024 * 1024
+
+# Размер распакованного архивного сегмента журнала, до которого он хранится в памяти, а не на диске
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# Начало записи журнала: "filename.py:42 #INFO     [2024-01-01 12:00:00,000] - ..."
+# Строки, не подходящие под шаблон, — продолжение предыдущей записи (например, traceback)
+RECORD_HEADER = re.compile(rb'^\S+:\d+ #(?P<level>[A-Z]+)\s*\[(?P<asctime>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
+
+
+def parse_export_log_args(args: str | None) -> dict:
+    """
+    Разбирает аргументы команды /export_log.
+
+    Поддерживаются: число N — последние N записей, since=ГГГГ-ММ-ДД[THH:MM[:SS]] — записи
+    начиная с момента времени, level=УРОВЕНЬ — записи не ниже уровня (INFO, WARNING, ERROR...).
+
+    Args:
+        args (str | None): Текст после команды.
+
+    Raises:
+        ValueError: неизвестный или неверный аргумент.
+
+    Returns:
+        dict: Аргументы для export_log_file: tail, since, level.
+    """
+    options = {'tail': None, 'since': None, 'level': None}
+    for token in (args or '').split():
+        key, _, value = token.partition('=')
+        if token.isdigit() and int(token) > 0:
+            options['tail'] = int(token)
+        elif key == 'since' and value:
+            options['since'] = datetime.fromisoformat(value)
+        elif key == 'level' and isinstance(logging.getLevelName(value.upper()), int):
+            options['level'] = logging.getLevelName(value.upper())
+        else:
+            raise ValueError(f'Неизвестный аргумент /export_log: {token}')
+    return options
+
+
+def iter_lines_reversed(log_file: BinaryIO, block_size: int = READ_BLOCK_SIZE) -> Iterator[tuple[int, bytes]]:
+    """
+    Читает файл с конца блоками и возвращает строки в обратном порядке вместе со смещением их начала.
+
+    Args:
+        log_file (BinaryIO): Файл, открытый в бинарном режиме.
+        block_size (int): Размер читаемого блока.
+
+    Returns:
+        Iterator[tuple[int, bytes]]: Смещение начала строки и строка без перевода строки.
+    """
+    position = log_file.seek(0, os.SEEK_END)
+    remainder = b''
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        log_file.seek(position)
+        block = log_file.read(read_size) + remainder
+        lines = block.split(b'\n')
+        remainder = lines.pop(0)
+        offset = position + len(remainder) + 1
+        line_offsets = []
+        for line in lines:
+            line_offsets.append((offset, line))
+            offset += len(line) + 1
+        yield from reversed(line_offsets)
+    yield 0, remainder
+
+
+def rotated_log_paths(path_log: str) -> list[str]:
+    """
+    Возвращает сжатые архивные сегменты журнала от новых к старым.
+
+    Сегменты создает ротация журнала (utils/logger.py): bot.log.1.gz при ротации по размеру
+    или bot.log.2024-01-01.gz при ротации по времени. Порядок определяется временем изменения
+    файла, то есть временем ротации, поэтому он одинаков для обоих способов именования.
+
+    Args:
+        path_log (str): Путь к текущему файлу журнала.
+
+    Returns:
+        list[str]: Пути к архивным сегментам.
+    """
+    directory, name = os.path.split(os.path.abspath(path_log))
+    paths = [
+        os.path.join(directory, filename) for filename in os.listdir(directory)
+        if filename.startswith(f'{name}.') and filename.endswith('.gz')
+    ]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+@contextmanager
+def open_segment(path: str, compressed: bool) -> Iterator[BinaryIO]:
+    """Открывает сегмент журнала для чтения с конца; архивный сегмент распаковывается во временный файл"""
+    if not compressed:
+        with open(path, 'rb') as log_file:
+            yield log_file
+        return
+    with gzip.open(path, 'rb') as archive, tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as log_file:
+        shutil.copyfileobj(archive, log_file)
+        yield log_file
+
+
+def find_start_offset(
+    log_file: BinaryIO, tail: int | None, since: datetime | None, level: int | None
+) -> tuple[int, int, bool]:
+    """
+    Находит смещение первой нужной записи, читая сегмент журнала с конца.
+
+    Чтение прекращается, как только найдено tail записей подходящего уровня или встречена
+    запись старше since, поэтому время работы зависит от объема результата, а не от размера файла.
+
+    Returns:
+        tuple[int, int, bool]: Смещение, с которого нужно читать сегмент вперед, количество найденных
+            записей и признак того, что записи более старых сегментов не нужны.
+    """
+    if tail is None and since is None:
+        return 0, 0, True
+
+    since_key = since.strftime('%Y-%m-%d %H:%M:%S').encode() if since else None
+    start_offset = log_file.seek(0, os.SEEK_END)
+    found = 0
+    for offset, line in iter_lines_reversed(log_file):
+        header = RECORD_HEADER.match(line)
+        if header is None:
+            continue
+        if since_key is not None and header['asctime'] < since_key:
+            return start_offset, found, True
+        start_offset = offset
+        if level is None or logging.getLevelName(header['level'].decode()) >= level:
+            found += 1
+            if tail is not None and found >= tail:
+                return start_offset, found, True
+    # Начало сегмента может продолжать запись предыдущего сегмента, поэтому сегмент нужен целиком
+    return 0, found, False
+
+
+def iter_records(lines: Iterable[bytes], level: int | None) -> Iterator[bytes]:
+    """Возвращает записи журнала не ниже level вместе со строками продолжения"""
+    include = True
+    for line in lines:
+        header = RECORD_HEADER.match(line)
+        if header is not None:
+            include = level is None or logging.getLevelName(header['level'].decode()) >= level
+        if include:
+            yield line
+
+
+def export_log_file(
+    path_log: str | None = None,
+    tail: int | None = None,
+    since: datetime | None = None,
+    level: int | None = None,
+    max_document_size: int = MAX_DOCUMENT_SIZE
+) -> list[str]:
+    """
+    Выгружает журнал в сжатые gzip временные файлы.
+
+    Без tail и since выгружается весь текущий файл журнала. С ними записи ищутся также в архивных
+    сегментах ротации (bot.log.N.gz), от новых к старым, пока не найдено tail записей или не
+    встречена запись старше since. Если сжатый результат превышает max_document_size,
+    он делится на несколько самостоятельных gzip-файлов по границам записей.
+
+    Args:
+        path_log (str, optional): Путь к журналу. По умолчанию PATH_LOG из .env.
+        tail (int, optional): Количество последних записей.
+        since (datetime, optional): Момент времени, начиная с которого нужны записи.
+        level (int, optional): Минимальный уровень записей.
+        max_document_size (int): Максимальный размер одного файла в байтах.
+
+    Returns:
+        list[str]: Пути к временным файлам; удаляет их вызывающий код.
+    """
+    path_log = path_log or load_config_logger().logger.path_log
+    parts: list[str] = []
+
+    def open_part() -> tuple[BinaryIO, gzip.GzipFile]:
+        raw_file = tempfile.NamedTemporaryFile(prefix='bot_log_', suffix='.log.gz', delete=False)
+        parts.append(raw_file.name)
+        return raw_file, gzip.GzipFile(filename='bot.log', mode='wb', fileobj=raw_file)
+
+    with ExitStack() as stack:
+        # Сегменты от новых к старым вместе со смещением первой нужной записи
+        selected: list[tuple[BinaryIO, int]] = []
+        remaining = tail
+        segments = [(path_log, False)] + [(path, True) for path in rotated_log_paths(path_log)]
+        for path, compressed in segments:
+            try:
+                log_file = stack.enter_context(open_segment(path, compressed))
+            except FileNotFoundError:
+                # Архивный сегмент удален ротацией во время выгрузки
+                continue
+            offset, found, complete = find_start_offset(log_file, remaining, since, level)
+            selected.append((log_file, offset))
+            if complete:
+                break
+            if remaining is not None:
+                remaining -= found
+
+        def iter_lines() -> Iterator[bytes]:
+            for segment_file, segment_offset in reversed(selected):
+                segment_file.seek(segment_offset)
+                yield from segment_file
+
+        raw_file, gzip_file = open_part()
+        try:
+            for record_line in iter_records(iter_lines(), level):
+                # Размер сжатых данных растет скачками при сбросе буфера компрессора, отсюда запас в ограничении
+                if raw_file.tell() >= max_document_size and RECORD_HEADER.match(record_line):
+                    gzip_file.close()
+                    raw_file.close()
+                    raw_file, gzip_file = open_part()
+                gzip_file.write(record_line)
+        finally:
+            gzip_file.close()
+            raw_file.close()
+
+    return parts
+
+
+async def export_log_files(**options) -> list[str]:
     """
-    Читает содержимое файла bot.log и возвращает его в виде байтового потока.
+    Выгружает журнал в отдельном потоке, не блокируя цикл событий.
+
+    Args:
+        **options: Аргументы export_log_file.
 
     Returns:
-        io.BytesIO: Байтовый поток с содержимым файла bot.log.
-    """
-    # Создаем байтовый поток для хранения данных из файла bot.log
-    log_buffer = io.BytesIO()
-
-    try:
-        # Читаем содержимое файла bot.log
-        with open('bot.log', 'rb') as log_file:
-            log_buffer.write(log_file.read())
-        
-        # Перемещаем указатель в начало буфера
-        log_buffer.seek(0)
-    except Exception as e:
-        # Если возникает ошибка, выводим ее
-        print(f"An error occurred while reading log file: {e}")
-
-    return log_buffer
+        list[str]: Пути к временным сжатым файлам журнала.
+    """
+    return await asyncio.to_thread(export_log_file, **options)
@@ -0,0 +1,123 @@
+import random
+import socket
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from threading import Lock
+from typing import Iterator
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from utils.logger import logger
+
+
+# Статусы ответов, после которых запрос повторяется с экспоненциальной задержкой
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Ошибки соединения, после которых соединение закрывается, а запрос повторяется
+TRANSPORT_ERRORS = (socket.timeout, ConnectionError, httplib2.HttpLib2Error)
+
+# Верхняя граница задержки между повторами в секундах
+MAX_BACKOFF = 32.0
+
+
+def is_retryable(error: Exception) -> bool:
+    """Проверяет, что запрос, завершившийся ошибкой, стоит повторить"""
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRY_STATUSES
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+def retry_delay(error: Exception, attempt: int, backoff: float) -> float:
+    """
+    Задержка перед повтором: Retry-After из ответа или экспоненциальная задержка со случайным разбросом.
+
+    Args:
+        error: Ошибка последней попытки.
+        attempt: Номер повтора, начиная с 0.
+        backoff: Базовая задержка в секундах.
+
+    Returns:
+        float: Задержка в секундах, не больше MAX_BACKOFF.
+    """
+    if isinstance(error, HttpError):
+        retry_after = error.resp.get('retry-after', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF)
+    # Полный случайный разброс, чтобы потоки, получившие ошибку одновременно, не повторяли запросы хором
+    return random.uniform(0, min(backoff * 2 ** attempt, MAX_BACKOFF))
+
+
+class HttpPool:
+    """
+    Пул HTTP-соединений httplib2 с keep-alive для параллельных запросов к YouTube API.
+
+    Объект httplib2.Http не потокобезопасен, поэтому каждый запрос берет из пула свой объект
+    и возвращает его после ответа; открытые соединения переиспользуются следующими запросами.
+    Первым выдается последний возвращенный объект, чтобы работали самые «теплые» соединения.
+    Объекты создаются по требованию, их не больше size; при нехватке запрос ждет освобождения.
+
+    Attributes:
+        size (int): Максимальное число объектов Http.
+        timeout (float): Таймаут сокета в секундах.
+
+    Methods:
+        connection() -> Iterator[httplib2.Http]:
+            Контекстный менеджер: выдает объект Http и возвращает его в пул.
+        close() -> None:
+            Закрывает соединения свободных объектов; занятые закрываются при возврате.
+
+    """
+    def __init__(self, size: int, timeout: float) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.__lock = Lock()
+        self.__closed = False
+        self.__pool: LifoQueue[httplib2.Http | None] = LifoQueue(maxsize=size)
+        for _ in range(size):
+            self.__pool.put(None)
+
+    def __build(self) -> httplib2.Http:
+        http = httplib2.Http(timeout=self.timeout)
+        # Как в googleapiclient.http.build_http: 308 означает возобновляемую загрузку, а не перенаправление
+        http.redirect_codes = http.redirect_codes - {308}
+        return http
+
+    @contextmanager
+    def connection(self) -> Iterator[httplib2.Http]:
+        http = self.__pool.get() or self.__build()
+        try:
+            yield http
+        except TRANSPORT_ERRORS:
+            # Соединение могло остаться в неопределенном состоянии: следующий запрос откроет новое
+            self.__close_connections(http)
+            raise
+        finally:
+            with self.__lock:
+                if self.__closed:
+                    self.__close_connections(http)
+            self.__pool.put(http)
+
+    @staticmethod
+    def __close_connections(http: httplib2.Http) -> None:
+        for connection in list(http.connections.values()):
+            try:
+                connection.close()
+            except OSError:
+                pass
+        http.connections.clear()
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__closed = True
+        idle = []
+        while True:
+            try:
+                idle.append(self.__pool.get_nowait())
+            except Empty:
+                break
+        for http in idle:
+            if http is not None:
+                self.__close_connections(http)
+            self.__pool.put(http)
+        logger.info('HTTP-соединения с YouTube API закрыты')
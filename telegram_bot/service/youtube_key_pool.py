@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic, time
+
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+
+from custom_exceptions.custom_exception import QuotaExceededError
+from service.youtube_quota import error_reasons, seconds_until_quota_reset
+from utils.logger import logger
+from utils.metrics import Counter, Gauge
+
+
+# Причины ошибок, после которых ключ бесполезен до сброса суточной квоты
+KEY_EXHAUSTED_REASONS = {'quotaExceeded', 'dailyLimitExceeded', 'keyInvalid', 'keyExpired', 'accessNotConfigured', 'ipRefererBlocked'}
+
+# Причины ошибок, после которых ключ временно снимается с ротации
+KEY_RATE_LIMITED_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+# Время в секундах, на которое ключ снимается с ротации после ограничения скорости
+RATE_LIMIT_BENCH_SECONDS = 60.0
+
+KEY_CALLS = Counter('youtube_api_key_calls_total', 'Запросы к YouTube API по ключам', ('key',))
+KEY_ERRORS = Counter('youtube_api_key_errors_total', 'Ошибки, после которых ключ снят с ротации', ('key', 'reason'))
+KEY_BENCHED_UNTIL = Gauge(
+    'youtube_api_key_benched_until_seconds',
+    'Время Unix, до которого ключ снят с ротации; 0 — ключ не снимался',
+    ('key',)
+)
+
+
+@dataclass
+class ApiKeyState:
+    """Ключ YouTube API, построенный для него ресурс и статистика использования"""
+    key: str
+    resource: Resource
+    calls: int = 0
+    benched_until: float = 0.0
+
+    @property
+    def masked_key(self) -> str:
+        """Ключ, безопасный для логов и статистики"""
+        return f'{self.key[:6]}…{self.key[-4:]}'
+
+
+class YouTubeKeyPool:
+    """
+    Пул ключей YouTube API с ротацией по наименее использованному ключу.
+
+    Ключ, получивший ответ quotaExceeded или ошибку доступа, снимается с ротации до сброса
+    суточной квоты, а ключ, упершийся в ограничение скорости, — на RATE_LIMIT_BENCH_SECONDS.
+    Запросы, ошибки и время снятия с ротации каждого ключа выдаются в /metrics с маскированным ключом.
+
+    Attributes:
+        keys (list[ApiKeyState]): Состояние всех ключей пула.
+
+    Methods:
+        acquire() -> ApiKeyState:
+            Выбирает наименее использованный доступный ключ.
+        report_error(state: ApiKeyState, error: HttpError) -> bool:
+            Учитывает ошибку ключа и возвращает True, если запрос стоит повторить с другим ключом.
+        all_benched() -> bool:
+            Проверяет, что доступных ключей не осталось.
+
+    Raises:
+        QuotaExceededError: Если все ключи сняты с ротации.
+
+    """
+    def __init__(self, keys: list[ApiKeyState]) -> None:
+        self.keys = keys
+        self.__lock = Lock()
+        for state in keys:
+            KEY_BENCHED_UNTIL.set(0, state.masked_key)
+
+    def acquire(self) -> ApiKeyState:
+        with self.__lock:
+            now = monotonic()
+            available = [state for state in self.keys if state.benched_until <= now]
+            if not available:
+                raise QuotaExceededError()
+
+            state = min(available, key=lambda candidate: candidate.calls)
+            state.calls += 1
+        KEY_CALLS.inc(state.masked_key)
+        return state
+
+    def report_error(self, state: ApiKeyState, error: HttpError) -> bool:
+        reasons = error_reasons(error)
+        if reasons & KEY_EXHAUSTED_REASONS:
+            bench_seconds = seconds_until_quota_reset()
+        elif reasons & KEY_RATE_LIMITED_REASONS:
+            bench_seconds = RATE_LIMIT_BENCH_SECONDS
+        else:
+            return False
+
+        with self.__lock:
+            state.benched_until = monotonic() + bench_seconds
+        KEY_ERRORS.inc(state.masked_key, 'exhausted' if reasons & KEY_EXHAUSTED_REASONS else 'rate_limited')
+        KEY_BENCHED_UNTIL.set(time() + bench_seconds, state.masked_key)
+        logger.warning(
+            'Ключ YouTube API %s снят с ротации на %.0f с: %s',
+            state.masked_key, bench_seconds, ', '.join(sorted(reasons))
+        )
+        return not self.all_benched()
+
+    def all_benched(self) -> bool:
+        with self.__lock:
+            now = monotonic()
+            return all(state.benched_until > now for state in self.keys)
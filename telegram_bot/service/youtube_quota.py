@@ -0,0 +1,270 @@
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+from math import ceil
+from threading import Condition, Lock
+from time import monotonic
+from typing import Protocol
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from googleapiclient.errors import HttpError
+
+from custom_exceptions.custom_exception import QuotaExceededError
+from utils.logger import logger
+from utils.metrics import Counter, Gauge
+
+
+# Стоимость методов YouTube Data API v3 в единицах квоты
+QUOTA_COSTS: dict[str, int] = {
+    'playlists.list': 1,
+    'playlistItems.list': 1,
+    'videos.list': 1,
+}
+
+# Суточная квота YouTube Data API сбрасывается в полночь по тихоокеанскому времени
+try:
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except ZoneInfoNotFoundError:
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+# Как часто перечитывать расход из хранилища: его пополняют и другие рабочие процессы бота
+QUOTA_SYNC_INTERVAL = 5.0
+
+QUOTA_REMAINING = Gauge('youtube_quota_remaining', 'Остаток суточной квоты YouTube API в единицах')
+QUOTA_USED = Gauge('youtube_quota_used', 'Расход квоты YouTube API за текущие квотные сутки по методам', ('method',))
+QUOTA_SPENT = Counter('youtube_quota_spent_total', 'Единицы квоты, израсходованные процессом', ('priority',))
+
+
+class Priority(IntEnum):
+    """Приоритет запросов к YouTube API: меньшее значение обслуживается раньше"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Приоритет текущего вызова клиента; фоновые задачи выставляют Priority.BACKGROUND
+request_priority: ContextVar[Priority] = ContextVar('request_priority', default=Priority.INTERACTIVE)
+
+
+def quota_day(now: datetime | None = None) -> str:
+    """Возвращает текущие квотные сутки YouTube API в формате YYYY-MM-DD"""
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(QUOTA_TIMEZONE).date().isoformat()
+
+
+def seconds_until_quota_reset(now: datetime | None = None) -> float:
+    """Возвращает количество секунд до ближайшего сброса суточной квоты"""
+    now = (now or datetime.now(timezone.utc)).astimezone(QUOTA_TIMEZONE)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=QUOTA_TIMEZONE)
+    return (midnight - now).total_seconds()
+
+
+def estimate_duration_cost(item_count: int | str) -> int:
+    """Оценивает стоимость обхода плейлиста: страницы playlistItems.list и пакеты videos.list по 50 видео"""
+    pages = ceil(item_count / 50) if isinstance(item_count, int) and item_count > 0 else 1
+    return pages * (QUOTA_COSTS['playlistItems.list'] + QUOTA_COSTS['videos.list'])
+
+
+def max_affordable_item_count(units: int) -> int:
+    """Возвращает наибольшее количество видео плейлиста, запрос которого укладывается в units единиц квоты"""
+    pages = (units - QUOTA_COSTS['playlists.list']) // (QUOTA_COSTS['playlistItems.list'] + QUOTA_COSTS['videos.list'])
+    return max(pages, 0) * 50
+
+
+def error_reasons(error: HttpError) -> set[str]:
+    """Возвращает причины ошибки YouTube API из поля error.errors[].reason"""
+    details = error.error_details if isinstance(error.error_details, list) else []
+    return {detail['reason'] for detail in details if isinstance(detail, dict) and 'reason' in detail}
+
+
+def is_quota_exceeded_error(error: HttpError) -> bool:
+    """Проверяет, что ошибка YouTube API вызвана исчерпанием квоты"""
+    return error.resp.status == 403 and bool(error_reasons(error) & {'quotaExceeded', 'dailyLimitExceeded'})
+
+
+class QuotaStore(Protocol):
+    """Хранилище израсходованной квоты, переживающее перезапуск бота"""
+    def get_quota_usage(self, day: str) -> dict[str, int]: ...
+    def get_quota_usage_by_priority(self, day: str) -> dict[str, int]: ...
+    def add_quota_usage(self, day: str, method: str, units: int, priority: str) -> None: ...
+
+
+class QuotaLedger:
+    """
+    Учет израсходованных единиц квоты по методам и приоритетам запросов за текущие квотные сутки.
+
+    Attributes:
+        daily_limit (int): Суточная квота проекта в единицах.
+        store (QuotaStore | None): Хранилище для сохранения расхода между перезапусками.
+
+    Methods:
+        charge(method: str, units: int, priority: Priority = Priority.INTERACTIVE) -> None:
+            Учитывает расход квоты.
+        exhaust() -> None:
+            Помечает квоту текущих суток как исчерпанную.
+        remaining() -> int:
+            Возвращает остаток квоты на текущие сутки.
+        usage() -> dict[str, int]:
+            Возвращает расход по методам за текущие сутки.
+        spent(priority: Priority) -> int:
+            Возвращает расход запросов с данным приоритетом за текущие сутки.
+
+    """
+    def __init__(self, daily_limit: int, store: QuotaStore | None = None) -> None:
+        self.daily_limit = daily_limit
+        self.store = store
+        self.__lock = Lock()
+        self.__day = quota_day()
+        self.__usage: dict[str, int] = store.get_quota_usage(self.__day) if store is not None else {}
+        self.__spent: dict[str, int] = store.get_quota_usage_by_priority(self.__day) if store is not None else {}
+        self.__synced_at = monotonic()
+        self.__exhausted = False
+        self.__publish(set())
+
+    def __remaining(self) -> int:
+        if self.__exhausted:
+            return 0
+        return max(self.daily_limit - sum(self.__usage.values()), 0)
+
+    def __publish(self, previous_methods: set[str]) -> None:
+        """Обновляет метрики расхода и остатка квоты; методы прошлых суток обнуляются"""
+        for method in previous_methods | self.__usage.keys():
+            QUOTA_USED.set(self.__usage.get(method, 0), method)
+        QUOTA_REMAINING.set(self.__remaining())
+
+    def __roll_day(self) -> None:
+        """Начинает новые квотные сутки после сброса квоты и периодически сверяет расход с хранилищем"""
+        day = quota_day()
+        if day != self.__day:
+            previous_methods = set(self.__usage)
+            self.__day = day
+            self.__usage = self.store.get_quota_usage(day) if self.store is not None else {}
+            self.__spent = self.store.get_quota_usage_by_priority(day) if self.store is not None else {}
+            self.__synced_at = monotonic()
+            self.__exhausted = False
+            self.__publish(previous_methods)
+        elif self.store is not None and monotonic() - self.__synced_at >= QUOTA_SYNC_INTERVAL:
+            # Собственный расход мог еще не дойти до хранилища, поэтому берется большее из значений
+            for counters, stored in (
+                (self.__usage, self.store.get_quota_usage(day)),
+                (self.__spent, self.store.get_quota_usage_by_priority(day))
+            ):
+                for key in stored.keys() | counters.keys():
+                    counters[key] = max(stored.get(key, 0), counters.get(key, 0))
+            self.__synced_at = monotonic()
+            self.__publish(set())
+
+    def charge(self, method: str, units: int, priority: Priority = Priority.INTERACTIVE) -> None:
+        with self.__lock:
+            self.__roll_day()
+            self.__usage[method] = self.__usage.get(method, 0) + units
+            self.__spent[priority.name.lower()] = self.__spent.get(priority.name.lower(), 0) + units
+            day = self.__day
+            self.__publish(set())
+        if self.store is not None:
+            self.store.add_quota_usage(day, method, units, priority.name.lower())
+
+    def exhaust(self) -> None:
+        with self.__lock:
+            self.__roll_day()
+            if not self.__exhausted:
+                logger.error('Суточная квота YouTube API исчерпана, сброс через %.0f с', seconds_until_quota_reset())
+            self.__exhausted = True
+            self.__publish(set())
+
+    def remaining(self) -> int:
+        with self.__lock:
+            self.__roll_day()
+            return self.__remaining()
+
+    def usage(self) -> dict[str, int]:
+        with self.__lock:
+            self.__roll_day()
+            return dict(self.__usage)
+
+    def spent(self, priority: Priority) -> int:
+        with self.__lock:
+            self.__roll_day()
+            return self.__spent.get(priority.name.lower(), 0)
+
+
+class QuotaScheduler:
+    """
+    Планировщик запросов к YouTube API с учетом квоты.
+
+    Скорость запросов ограничивается корзиной токенов (единиц квоты в секунду), при этом
+    ожидающие интерактивные запросы обслуживаются раньше фоновых, а фоновым запросам
+    не разрешается расходовать резерв суточной квоты.
+
+    Attributes:
+        ledger (QuotaLedger): Учет израсходованной квоты.
+        rate (float): Пополнение корзины в единицах квоты в секунду.
+        burst (int): Емкость корзины.
+        reserve (int): Резерв суточной квоты, доступный только интерактивным запросам.
+
+    Methods:
+        acquire(method: str) -> None:
+            Ожидает возможности выполнить запрос и списывает его стоимость.
+        can_afford(units: int) -> bool:
+            Проверяет, хватит ли остатка квоты на units единиц с учетом приоритета.
+        exhaust() -> None:
+            Помечает квоту как исчерпанную после ответа quotaExceeded.
+        spent(priority: Priority) -> int:
+            Возвращает единицы квоты, израсходованные запросами с данным приоритетом за текущие сутки.
+
+    Raises:
+        QuotaExceededError: Если остатка квоты не хватает для запроса.
+
+    """
+    def __init__(self, ledger: QuotaLedger, rate: float, burst: int, reserve: int) -> None:
+        self.ledger = ledger
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.__tokens = float(burst)
+        self.__updated_at = monotonic()
+        self.__waiting: dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.__condition = Condition()
+
+    def __available(self, priority: Priority) -> int:
+        """Остаток суточной квоты, доступный запросам с данным приоритетом"""
+        remaining = self.ledger.remaining()
+        if priority == Priority.BACKGROUND:
+            return remaining - self.reserve
+        return remaining
+
+    def can_afford(self, units: int) -> bool:
+        return self.__available(request_priority.get()) >= units
+
+    def acquire(self, method: str) -> None:
+        cost = QUOTA_COSTS.get(method, 1)
+        priority = request_priority.get()
+        if self.__available(priority) < cost:
+            raise QuotaExceededError(method)
+
+        with self.__condition:
+            self.__waiting[priority] += 1
+            try:
+                while True:
+                    now = monotonic()
+                    self.__tokens = min(self.burst, self.__tokens + (now - self.__updated_at) * self.rate)
+                    self.__updated_at = now
+
+                    has_priority = all(
+                        not self.__waiting[other] for other in Priority if other < priority
+                    )
+                    if has_priority and self.__tokens >= cost:
+                        self.__tokens -= cost
+                        break
+                    self.__condition.wait(max((cost - self.__tokens) / self.rate, 0.01))
+            finally:
+                self.__waiting[priority] -= 1
+                self.__condition.notify_all()
+
+        QUOTA_SPENT.inc(priority.name.lower(), amount=cost)
+        self.ledger.charge(method, cost, priority)
+
+    def exhaust(self) -> None:
+        self.ledger.exhaust()
+
+    def spent(self, priority: Priority) -> int:
+        return self.ledger.spent(priority)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import sqlite3
+import zlib
+from threading import Lock
+from time import time
+from urllib.parse import parse_qsl, urlsplit
+
+from utils.logger import logger
+from utils.metrics import Counter, Gauge
+
+
+# Параметры запроса, не влияющие на ответ: ключ разработчика у каждого ключа из пула свой
+IGNORED_PARAMETERS = frozenset({'key'})
+
+# Доля max_bytes, до которой сокращается кеш при вытеснении: вытеснение выполняется пачками, а не на каждую запись
+EVICTION_TARGET = 0.9
+
+CACHE_REQUESTS = Counter(
+    'youtube_response_cache_requests_total',
+    'Обращения к дисковому кешу ответов YouTube API',
+    ('method', 'result')
+)
+CACHE_EVICTIONS = Counter('youtube_response_cache_evictions_total', 'Количество вытесненных из кеша ответов')
+CACHE_SIZE = Gauge('youtube_response_cache_size_bytes', 'Суммарный размер сжатых ответов в кеше')
+
+
+def cache_key(method: str, uri: str, version: str | None = None) -> str:
+    """
+    Ключ ответа: метод, параметры запроса без ключа разработчика и версия данных.
+
+    Args:
+        method: Имя метода API, например 'playlistItems.list'.
+        uri: Адрес запроса с параметрами.
+        version: Версия данных, от которой зависит ответ, например etag плейлиста.
+
+    Returns:
+        str: Хеш SHA-256 в шестнадцатеричном виде.
+    """
+    parameters = sorted(
+        (name, value) for name, value in parse_qsl(urlsplit(uri).query, keep_blank_values=True)
+        if name not in IGNORED_PARAMETERS
+    )
+    return hashlib.sha256(json.dumps([method, parameters, version]).encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Дисковый кеш ответов YouTube API с временем жизни по методам и вытеснением давно не использованных.
+
+    Ответы хранятся сжатыми в отдельном файле SQLite и переживают перезапуск бота; файл могут
+    использовать одновременно несколько рабочих процессов. Метод без времени жизни (или с нулевым)
+    не кешируется. Объем кеша ограничен max_bytes: при превышении удаляются записи с самым
+    давним обращением.
+
+    Attributes:
+        path (str): Путь к файлу кеша.
+        max_bytes (int): Максимальный суммарный размер сжатых ответов.
+        ttls (dict[str, float]): Время жизни ответов по методам в секундах.
+
+    Methods:
+        get(method: str, key: str) -> dict | None:
+            Возвращает сохраненный ответ или None.
+        put(method: str, key: str, response: dict) -> None:
+            Сохраняет ответ.
+        is_cached(method: str) -> bool:
+            Проверяет, кешируются ли ответы метода.
+        close() -> None:
+            Закрывает файл кеша.
+
+    """
+    def __init__(self, path: str, max_bytes: int, ttls: dict[str, float]) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.__lock = Lock()
+
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute('PRAGMA journal_mode = WAL')
+        self.__connection.execute('PRAGMA synchronous = NORMAL')
+        self.__connection.execute('PRAGMA busy_timeout = 5000')
+        with self.__connection:
+            self.__connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    method TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.__connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self.__size = self.__connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        CACHE_SIZE.set(self.__size)
+        logger.info('Кеш ответов YouTube API %s: %.1f МБ', path, self.__size / 1024 / 1024)
+
+    def is_cached(self, method: str) -> bool:
+        return self.ttls.get(method, 0) > 0
+
+    def get(self, method: str, key: str) -> dict | None:
+        ttl = self.ttls.get(method, 0)
+        now = time()
+        try:
+            with self.__lock:
+                row = self.__connection.execute('SELECT body, stored_at FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is not None and now - row[1] < ttl:
+                    with self.__connection:
+                        self.__connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при чтении кеша ответов YouTube API: %s', e)
+            row = None
+
+        if row is None:
+            result = 'miss'
+        elif now - row[1] >= ttl:
+            result = 'expired'
+        else:
+            result = 'hit'
+        CACHE_REQUESTS.inc(method, result)
+        return json.loads(zlib.decompress(row[0])) if result == 'hit' else None
+
+    def put(self, method: str, key: str, response: dict) -> None:
+        body = zlib.compress(json.dumps(response, separators=(',', ':')).encode())
+        now = time()
+        try:
+            with self.__lock, self.__connection:
+                previous = self.__connection.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+                self.__connection.execute(
+                    'INSERT OR REPLACE INTO responses (key, method, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, method, body, len(body), now, now)
+                )
+                self.__size += len(body) - (previous[0] if previous else 0)
+                if self.__size > self.max_bytes:
+                    self.__evict()
+                CACHE_SIZE.set(self.__size)
+        except sqlite3.Error as e:
+            logger.error('Произошла ошибка при записи в кеш ответов YouTube API: %s', e)
+
+    def __evict(self) -> None:
+        """Удаляет давно не использованные ответы, пока размер кеша не станет меньше EVICTION_TARGET * max_bytes"""
+        # Кеш пополняют и другие рабочие процессы, поэтому размер перечитывается из файла
+        self.__size = self.__connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        excess = self.__size - int(self.max_bytes * EVICTION_TARGET)
+        if excess <= 0:
+            return
+        freed = evicted = 0
+        keys = []
+        for key, size in self.__connection.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            if freed >= excess:
+                break
+            keys.append((key,))
+            freed += size
+            evicted += 1
+        self.__connection.executemany('DELETE FROM responses WHERE key = ?', keys)
+        self.__size -= freed
+        CACHE_EVICTIONS.inc(amount=evicted)
+        logger.debug('Из кеша ответов YouTube API вытеснено %d записей, %d байт', evicted, freed)
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__connection.close()
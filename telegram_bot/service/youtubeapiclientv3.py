@@ -1,196 +1,717 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
 from datetime import timedelta
-from urllib.parse import urlparse, parse_qs
+from functools import lru_cache
+from threading import Event
+from time import monotonic, perf_counter, sleep
+from typing import Callable, Generator, Iterator
 
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document, Resource
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
 from isodate import parse_duration
 
 from config.config import load_config_service_youtube
+from models.methods import DataBase
+from service.playlist_cache import CacheEntry, PlaylistCache
+from service.youtube_http_pool import HttpPool, is_retryable, retry_delay
+from service.youtube_key_pool import ApiKeyState, YouTubeKeyPool
+from service.youtube_quota import QuotaLedger, QuotaScheduler, estimate_duration_cost, is_quota_exceeded_error
+from service.youtube_response_cache import ResponseCache, cache_key
 from utils.logger import logger
+from utils.metrics import Counter, Histogram
+from utils.playlist_identifier import extract_playlist_identifiers, is_playlist_identifier
 
-from custom_exceptions.custom_exception import InvalidPlaylistIdFormatError
+from custom_exceptions.custom_exception import (
+    InvalidPlaylistIdFormatError, PlaylistNotFoundError, QuotaExceededError, RequestCancelledError
+)
+
+
+# Максимальное количество идентификаторов в одном запросе videos.list
+VIDEOS_BATCH_SIZE = 50
+
+API_CALLS = Counter('youtube_api_calls_total', 'Количество запросов к YouTube API', ('method', 'status'))
+API_RETRIES = Counter('youtube_api_retries_total', 'Количество повторов запросов к YouTube API после ошибок', ('method',))
+API_LATENCY = Histogram('youtube_api_latency_seconds', 'Время запроса к YouTube API', ('method',))
+PLAYLIST_PAGES = Histogram(
+    'youtube_playlist_pages',
+    'Количество страниц playlistItems.list при обходе плейлиста',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+
+# Событие отмены текущего вызова клиента, проверяется перед каждым запросом к YouTube API
+cancel_event: ContextVar[Event | None] = ContextVar('cancel_event', default=None)
+
+
+@dataclass
+class PlaylistProgress:
+    """Промежуточный или итоговый результат получения плейлиста"""
+    playlist_info: dict
+    videos_processed: int = 0
+    done: bool = False
+
+
+def format_duration(seconds: float) -> str:
+    """Переводит продолжительность в секундах в формат часы:минуты:секунды"""
+    return f'{int(seconds // 3600)}:{int(seconds % 3600 // 60)}:{int(seconds % 60)}'
+
+
+@lru_cache
+def load_discovery_document(service_name: str = 'youtube', version: str = 'v3') -> str:
+    """
+    Возвращает описание API из документов, поставляемых вместе с googleapiclient.
+
+    Документ читается с диска один раз на процесс, поэтому создание клиента не обращается к сети.
+    Возвращается строка JSON: build_from_document дополняет разобранный документ, и у каждого
+    ресурса должна быть своя копия.
+
+    Raises:
+        ValueError: документ для сервиса и версии не найден.
+    """
+    document = get_static_doc(service_name, version)
+    if document is None:
+        raise ValueError(f'Не найден встроенный документ обнаружения {service_name} {version}')
+    return document
 
 
 class YouTubeAPIClientV3:
-    def __init__(self) -> None:
+    def __init__(self, database: DataBase | None = None) -> None:
+        """
+        Инициализация клиента YouTube API.
+
+        Args:
+            database: База данных для хранения продолжительности видео и расхода квоты между запросами.
+                Если не указана, продолжительность всех видео каждый раз запрашивается из API,
+                а расход квоты учитывается только в памяти.
+
+        """
         try:
             config = load_config_service_youtube()  # Загрузка конфигурации для сервиса YouTube
-            # Инициализация ресурса YouTube API с использованием ключа разработчика из конфигурации
-            self.__api_resource = build(
-                serviceName='youtube',
-                version='v3',
-                developerKey=config.service_youtube.api_key_service_youtube_v3
-            )
+            # Инициализация ресурсов YouTube API для каждого ключа разработчика из конфигурации
+            self.key_pool = YouTubeKeyPool([
+                ApiKeyState(
+                    key=api_key,
+                    resource=build_from_document(
+                        load_discovery_document(),
+                        developerKey=api_key,
+                        client_options={'api_endpoint': config.service_youtube.api_endpoint}
+                        if config.service_youtube.api_endpoint else None
+                    )
+                )
+                for api_key in config.service_youtube.api_keys_service_youtube_v3
+            ])
         except Exception as e:
             # Регистрация ошибки, если инициализация не удалась, и вызов исключения ValueError
             error_message = f'Произошла ошибка при создании ресурса YouTube API. Проверьте API_KEY_SERVICE_YOUTUBE: {e}'
             logger.error(error_message)
             raise ValueError(error_message)
 
+        # Ответы YouTube API сохраняются на диске и переживают перезапуск бота
+        self.response_cache = ResponseCache(
+            path=config.service_youtube.response_cache_path,
+            max_bytes=config.service_youtube.response_cache_max_bytes,
+            ttls=config.service_youtube.response_cache_ttls
+        ) if config.service_youtube.response_cache_path else None
+        
+        # HTTP-соединения httplib2 не потокобезопасны, поэтому каждый запрос берет из пула свое соединение
+        self.http_pool = HttpPool(
+            size=config.service_youtube.http_pool_size,
+            timeout=config.service_youtube.http_timeout
+        )
+        self.__retries = config.service_youtube.http_retries
+        self.__backoff = config.service_youtube.http_backoff
+
+        # Учет квоты и планирование запросов с приоритетом интерактивных вызовов; квота каждого ключа своя
+        self.quota = QuotaScheduler(
+            ledger=QuotaLedger(config.service_youtube.daily_quota * len(self.key_pool.keys), database),
+            rate=config.service_youtube.quota_rate,
+            burst=config.service_youtube.quota_burst,
+            reserve=config.service_youtube.quota_reserve
+        )
+
         # Инициализация внутренних классов для взаимодействия с различными ресурсами
-        self.playlist = YouTubeAPIClientV3.__Playlist(self.__api_resource)
+        self.playlist_cache = PlaylistCache(
+            max_size=config.service_youtube.playlist_cache_size,
+            ttl=config.service_youtube.playlist_cache_ttl
+        )
+        self.playlist = YouTubeAPIClientV3.__Playlist(
+            self.__execute,
+            self.playlist_cache,
+            self.quota,
+            database,
+            config.service_youtube.video_duration_ttl,
+            config.service_youtube.pipeline_depth,
+            config.service_youtube.max_concurrency
+        )
         
         logger.info('Сервис YouTubeAPIClientV3 был успешно инициализирован')
     
+    def __execute(
+        self,
+        method: str,
+        request_factory: Callable[[Resource], HttpRequest],
+        cache_version: str | None = None
+    ) -> dict:
+        """
+        Выполняет запрос к YouTube API в текущем потоке.
+
+        Ответы кешируемых методов берутся из дискового кеша без расхода квоты. Ключ выбирается
+        из пула; если ключ снят с ротации из-за квоты или ограничения скорости, запрос
+        повторяется с другим доступным ключом. Ответы 5xx и 429 и сбои соединения повторяются
+        с экспоненциальной задержкой; каждая попытка расходует квоту.
+
+        Args:
+            method: Имя метода API, например 'videos.list'.
+            request_factory: Функция, строящая запрос из ресурса YouTube API.
+            cache_version: Версия данных, от которой зависит ответ (например, etag плейлиста);
+                входит в ключ кеша, поэтому ответ устаревает вместе с ней.
+
+        Returns:
+            dict: Ответ YouTube API.
+
+        Raises:
+            RequestCancelledError: Если вызов был отменен до выполнения запроса.
+            QuotaExceededError: Если остатка квоты не хватает для запроса.
+            HttpError: Если происходит HTTP-ошибка при запросе к YouTube API.
+
+        """
+        event = cancel_event.get()
+        if event is not None and event.is_set():
+            raise RequestCancelledError(method)
+        
+        key = None
+        if self.response_cache is not None and self.response_cache.is_cached(method):
+            # Ключ кеша не зависит от ключа разработчика, поэтому запрос строится из любого ресурса пула
+            key = cache_key(method, request_factory(self.key_pool.keys[0].resource).uri, cache_version)
+            response = self.response_cache.get(method, key)
+            if response is not None:
+                return response
+        
+        attempt = 0
+        while True:
+            key_state = self.key_pool.acquire()
+            self.quota.acquire(method)
+            started_at = perf_counter()
+            try:
+                with self.http_pool.connection() as http:
+                    response = request_factory(key_state.resource).execute(http=http)
+            except HttpError as e:
+                API_CALLS.inc(method, str(e.resp.status))
+                if self.key_pool.report_error(key_state, e):
+                    continue
+                if is_quota_exceeded_error(e) and self.key_pool.all_benched():
+                    self.quota.exhaust()
+                if not self.__should_retry(method, e, attempt, event):
+                    raise
+                attempt += 1
+                continue
+            except Exception as e:
+                API_CALLS.inc(method, 'error')
+                if not self.__should_retry(method, e, attempt, event):
+                    raise
+                attempt += 1
+                continue
+            finally:
+                API_LATENCY.observe(perf_counter() - started_at, method)
+            API_CALLS.inc(method, 'ok')
+            if key is not None:
+                self.response_cache.put(method, key, response)
+            return response
+    
+    def __should_retry(self, method: str, error: Exception, attempt: int, event: Event | None) -> bool:
+        """
+        Решает, повторять ли запрос после ошибки, и выжидает экспоненциальную задержку перед повтором.
+
+        Повторяются ответы 5xx и 429 и сбои соединения, если не исчерпаны YOUTUBE_HTTP_RETRIES повторов
+        и остались доступные ключи. Ожидание прерывается отменой вызова.
+
+        Args:
+            method: Имя метода API.
+            error: Ошибка последней попытки.
+            attempt: Сколько повторов уже выполнено.
+            event: Событие отмены вызова.
+
+        Returns:
+            bool: True, если запрос нужно повторить.
+
+        Raises:
+            RequestCancelledError: Если вызов был отменен во время ожидания.
+
+        """
+        if attempt >= self.__retries or not is_retryable(error) or self.key_pool.all_benched():
+            return False
+        delay = retry_delay(error, attempt, self.__backoff)
+        API_RETRIES.inc(method)
+        logger.warning(
+            'Запрос %s к YouTube API будет повторен через %.2f с (повтор %d из %d): %s',
+            method, delay, attempt + 1, self.__retries, error
+        )
+        if event is not None:
+            if event.wait(delay):
+                raise RequestCancelledError(method)
+        else:
+            sleep(delay)
+        return True
+    
+    def close(self) -> None:
+        """Останавливает потоки запросов продолжительности видео, закрывает HTTP-соединения и файл кеша ответов"""
+        self.playlist.close()
+        self.http_pool.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+    
     class __Playlist():
         """
         Класс для получения информации о плейлисте из YouTube API.
 
         Attributes:
-            _access__api_resource: Ресурс доступа к YouTube API.
+            _execute: Функция выполнения запросов к YouTube API.
+            _cache: Кеш вычисленных данных плейлистов.
+            _quota: Планировщик запросов с учетом квоты.
+            _video_store: База данных с продолжительностью видео.
+            _pipeline_depth: Сколько страниц плейлиста ждут продолжительности видео, пока запрашивается следующая.
 
         Methods:
-            get_info(playlist_identifier: str) -> dict:
+            get_info(playlist_identifier: str, refresh: bool = False) -> dict:
                 Получает информацию о плейлисте по его идентификатору.
-            __get_info_playlists_duration(playlist_identifier) -> str:
-                Получает общую продолжительность видео в плейлисте.
+            iter_info(playlist_identifier: str, refresh: bool = False) -> Iterator[PlaylistProgress]:
+                Получает информацию о плейлисте по частям: метаданные, затем ход вычисления продолжительности.
+            __get_stored_playlist(playlist_identifier: str) -> CacheEntry | None:
+                Читает сохраненные данные плейлиста из базы данных.
+            __store_playlist(playlist_data: dict) -> None:
+                Сохраняет полученные из YouTube API данные плейлиста.
+            __get_playlist_metadata(playlist_identifier: str) -> dict:
+                Получает метаданные плейлиста без продолжительности.
+            __iter_playlist_duration(playlist_identifier: str, playlist_data: dict) -> Generator[PlaylistProgress, None, float | None]:
+                Обходит страницы плейлиста и вычисляет общую продолжительность видео.
+            __get_videos_duration(video_ids: list[str]) -> dict[str, float | None]:
+                Получает продолжительность видео из базы данных и недостающие пакетами по 50 идентификаторов.
+            extract_identifier(playlist_identifier: str) -> str:
+                Извлекает идентификатор плейлиста из переданной строки.
+            close() -> None:
+                Останавливает потоки запросов продолжительности видео.
             __extract_playlist_identifier(playlist_identifier: str) -> str:
                 Извлекает идентификатор плейлиста из переданной строки.
 
         Raises:
             HttpError: Если происходит HTTP-ошибка при запросе к YouTube API.
-            ValueError: Если идентификатор плейлиста неверного формата или нет информации о плейлисте.
+            ValueError: Если идентификатор плейлиста неверного формата.
+            PlaylistNotFoundError: Если плейлист удален, приватный или не существует.
 
         """
-        def __init__(self, access) -> None:
+        def __init__(
+            self,
+            execute: Callable[..., dict],
+            cache: PlaylistCache,
+            quota: QuotaScheduler,
+            video_store: DataBase | None,
+            video_duration_ttl: float,
+            pipeline_depth: int = 0,
+            max_concurrency: int = 1
+        ) -> None:
             """
             Инициализация объекта класса.
 
             Args:
-                access: Ресурс доступа к YouTube API.
+                execute: Функция выполнения запросов к YouTube API.
+                cache: Кеш вычисленных данных плейлистов.
+                quota: Планировщик запросов с учетом квоты.
+                video_store: База данных с продолжительностью видео и составом плейлистов.
+                video_duration_ttl: Время в секундах, в течение которого сохраненная продолжительность видео актуальна.
+                pipeline_depth: Сколько страниц плейлиста ждут продолжительности видео, пока запрашивается
+                    следующая страница; 0 — страницы обрабатываются по очереди.
+                max_concurrency: Число одновременных обходов плейлистов; вместе с pipeline_depth
+                    определяет число потоков запросов продолжительности видео.
 
             """
-            self._access__api_resource = access
+            self._execute = execute
+            self._cache = cache
+            self._quota = quota
+            self._video_store = video_store
+            self._video_duration_ttl = video_duration_ttl
+            self._pipeline_depth = pipeline_depth
+            # Общие для всех обходов потоки videos.list: у каждого обхода не больше pipeline_depth страниц в работе
+            self.__video_workers = ThreadPoolExecutor(
+                max_workers=max(max_concurrency * pipeline_depth, 1),
+                thread_name_prefix='youtube-videos'
+            ) if pipeline_depth else None
         
         
-        def get_info(self, playlist_identifier: str) -> dict:
+        def get_info(self, playlist_identifier: str, refresh: bool = False) -> dict:
             """
             Получает информацию о плейлисте из YouTube API по его идентификатору.
 
+            Свежие данные берутся из кеша или из базы данных, которую пополняют фоновое обновление
+            и другие рабочие процессы бота. Сохраненные данные с прежним etag продлеваются без обхода видео.
+
             Args:
                 playlist_identifier: Идентификатор плейлиста (URL или ID).
+                refresh: Запросить данные из YouTube API, даже если сохраненные данные свежие.
 
             Returns:
                 dict: Словарь с данными о плейлисте.
 
             Raises:
                 HttpError: Если происходит HTTP-ошибка при запросе к YouTube API.
-                ValueError: Если идентификатор плейлиста неверного формата или нет информации о плейлисте.
+                ValueError: Если идентификатор плейлиста неверного формата.
+                PlaylistNotFoundError: Если плейлист удален, приватный или не существует.
+                RequestCancelledError: Если вызов был отменен.
+                QuotaExceededError: Если квоты не хватает даже на получение метаданных.
+
+            """
+            for progress in self.iter_info(playlist_identifier, refresh):
+                pass
+            return progress.playlist_info
+        
+        
+        def iter_info(self, playlist_identifier: str, refresh: bool = False) -> Iterator[PlaylistProgress]:
+            """
+            Получает информацию о плейлисте по частям.
+
+            Если требуется обход видео, сначала возвращаются метаданные плейлиста без продолжительности,
+            затем после каждой страницы playlistItems.list — количество обработанных видео и
+            продолжительность на текущий момент. Последний результат отмечен done=True.
+
+            Args:
+                playlist_identifier: Идентификатор плейлиста (URL или ID).
+                refresh: Запросить данные из YouTube API, даже если сохраненные данные свежие.
+
+            Yields:
+                PlaylistProgress: Промежуточные и итоговый результаты.
+
+            Raises:
+                HttpError: Если происходит HTTP-ошибка при запросе к YouTube API.
+                ValueError: Если идентификатор плейлиста неверного формата.
+                PlaylistNotFoundError: Если плейлист удален, приватный или не существует.
+                RequestCancelledError: Если вызов был отменен.
+                QuotaExceededError: Если квоты не хватает даже на получение метаданных.
 
             """
             try:
                 playlist_identifier: str = self.__extract_playlist_identifier(playlist_identifier)
-                playlist_info_response: dict = self._access__api_resource.playlists().list(
-                    part=['snippet', 'status', 'contentDetails'],
-                    id=playlist_identifier
-                ).execute()
                 
-                item: dict = playlist_info_response.get('items', [])[0]
+                cached, fresh = self._cache.get(playlist_identifier)
+                if fresh and not refresh:
+                    logger.info('Данные плейлиста %s получены из кеша', playlist_identifier)
+                    yield PlaylistProgress(cached.playlist_info, done=True)
+                    return
+                
+                if cached is None:
+                    cached = self.__get_stored_playlist(playlist_identifier)
+                    if cached is not None and not refresh and monotonic() - cached.stored_at < self._cache.ttl:
+                        logger.info('Данные плейлиста %s получены из базы данных', playlist_identifier)
+                        self._cache.put(playlist_identifier, cached.playlist_info, monotonic() - cached.stored_at)
+                        yield PlaylistProgress(cached.playlist_info, done=True)
+                        return
+                
+                playlist_data: dict = self.__get_playlist_metadata(playlist_identifier)
+                
+                # Просроченная запись с тем же etag: плейлист не менялся, обход видео не нужен
+                if cached is not None and cached.playlist_info['etag'] == playlist_data['etag']:
+                    logger.info('Данные плейлиста %s перепроверены по etag', playlist_identifier)
+                    playlist_data['duration'] = cached.playlist_info['duration']
+                    self.__store_playlist(playlist_data)
+                    yield PlaylistProgress(self._cache.revalidate(playlist_identifier, playlist_data), done=True)
+                    return
                 
-                if not item:
-                    raise ValueError('No video information found')
+                # При нехватке квоты отвечаем метаданными без продолжительности
+                if not self._quota.can_afford(estimate_duration_cost(playlist_data['itemCount'])):
+                    logger.warning('Недостаточно квоты для обхода плейлиста %s, продолжительность не вычисляется', playlist_identifier)
+                    playlist_data['duration'] = 'Нет данных'
+                    yield PlaylistProgress(playlist_data, done=True)
+                    return
                 
-                snippet: dict = item.get('snippet', {})
-                content_details: dict = item.get('contentDetails', {})
-                status: dict = item.get('status', {})
+                yield PlaylistProgress(dict(playlist_data))
                 
-                playlist_data: dict = {
-                    'kind': item.get('kind', 'Нет данных'),
-                    'etag': item.get('etag', 'Нет данных'),
-                    'id_playlist': item.get('id', 'Нет данных'),
-                    'publishedAt': snippet.get('publishedAt', 'Нет данных'),
-                    'channelId': snippet.get('channelId', 'Нет данных'),
-                    'title': snippet.get('title', 'Нет данных'),
-                    'thumbnails_url': snippet['thumbnails'].get('standard', {}).get('url', 'Нет данных'),
-                    'thumbnails_width': snippet['thumbnails'].get('standard', {}).get('width', 'Нет данных'),
-                    'thumbnails_height': snippet['thumbnails'].get('standard', {}).get('height', 'Нет данных'),
-                    'channelTitle': snippet.get('channelTitle', 'Нет данных'),
-                    'privacyStatus': status.get('privacyStatus', 'Нет данных'),
-                    'itemCount': content_details.get('itemCount', 'Нет данных'),
-                    'duration': self.__get_info_playlists_duration(playlist_identifier)
-                }
+                seconds = yield from self.__iter_playlist_duration(playlist_identifier, playlist_data)
+                playlist_data['duration'] = format_duration(seconds) if seconds is not None else 'Нет данных'
+                if seconds is not None:
+                    self._cache.put(playlist_identifier, playlist_data)
+                    self.__store_playlist(playlist_data)
                 
-                return playlist_data
+                yield PlaylistProgress(playlist_data, done=True)
             
             
+            except RequestCancelledError as rc:
+                logger.warning('Request cancelled: %s', rc)
+                raise
+            except PlaylistNotFoundError as nf:
+                logger.warning('%s', nf)
+                raise
             except HttpError as e:
-                logger.error(f'HTTP Error occurred: {e}')
+                logger.error('HTTP Error occurred: %s', e)
                 raise
             except ValueError as ve:
-                logger.error(f'ValueError occurred: {ve}')
+                logger.error('ValueError occurred: %s', ve)
                 raise
             except Exception as ex:
-                logger.error(f'An unexpected error occurred: {ex}')
+                logger.error('An unexpected error occurred: %s', ex)
                 raise
         
         
-        def __get_info_playlists_duration(self, playlist_identifier) -> str:
+        def __get_stored_playlist(self, playlist_identifier: str) -> CacheEntry | None:
+            """
+            Читает сохраненные данные плейлиста из базы данных.
+
+            Args:
+                playlist_identifier: Идентификатор плейлиста.
+
+            Returns:
+                CacheEntry | None: Данные плейлиста со временем получения или None, если данных
+                    нет или продолжительность плейлиста не была вычислена.
+
+            """
+            if self._video_store is None:
+                return None
+            stored = self._video_store.get_playlist_info(playlist_identifier)
+            if stored is None or stored[0]['duration'] in (None, '', 'Нет данных'):
+                return None
+            playlist_info, age = stored
+            return CacheEntry(playlist_info, monotonic() - age)
+        
+        
+        def __store_playlist(self, playlist_data: dict) -> None:
+            """Сохраняет полученные из YouTube API данные плейлиста вместе со временем их получения"""
+            if self._video_store is not None:
+                self._video_store.save_playlist_info(playlist_data, refreshed=True)
+        
+        
+        def __get_playlist_metadata(self, playlist_identifier: str) -> dict:
             """
-            Получает общую продолжительность видео в плейлисте.
+            Получает метаданные плейлиста одним запросом playlists.list.
 
             Args:
                 playlist_identifier: Идентификатор плейлиста.
 
             Returns:
-                str: Общая продолжительность видео в плейлисте в формате "часы:минуты:секунды".
+                dict: Словарь с данными о плейлисте без продолжительности.
 
             Raises:
-                Exception: Если происходит ошибка при получении данных о видео.
+                PlaylistNotFoundError: Если плейлист удален, приватный или не существует.
+
+            """
+            playlist_info_response: dict = self._execute('playlists.list', lambda api: api.playlists().list(
+                part=['snippet', 'status', 'contentDetails'],
+                id=playlist_identifier
+            ))
+            
+            items: list[dict] = playlist_info_response.get('items', [])
+            if not items:
+                raise PlaylistNotFoundError(playlist_identifier)
+            item: dict = items[0]
+            
+            snippet: dict = item.get('snippet', {})
+            content_details: dict = item.get('contentDetails', {})
+            status: dict = item.get('status', {})
+            
+            return {
+                'kind': item.get('kind', 'Нет данных'),
+                'etag': item.get('etag', 'Нет данных'),
+                'id_playlist': item.get('id', 'Нет данных'),
+                'publishedAt': snippet.get('publishedAt', 'Нет данных'),
+                'channelId': snippet.get('channelId', 'Нет данных'),
+                'title': snippet.get('title', 'Нет данных'),
+                'thumbnails_url': snippet['thumbnails'].get('standard', {}).get('url', 'Нет данных'),
+                'thumbnails_width': snippet['thumbnails'].get('standard', {}).get('width', 'Нет данных'),
+                'thumbnails_height': snippet['thumbnails'].get('standard', {}).get('height', 'Нет данных'),
+                'channelTitle': snippet.get('channelTitle', 'Нет данных'),
+                'privacyStatus': status.get('privacyStatus', 'Нет данных'),
+                'itemCount': content_details.get('itemCount', 'Нет данных')
+            }
+        
+        
+        def __iter_playlist_duration(
+            self,
+            playlist_identifier: str,
+            playlist_data: dict
+        ) -> Generator[PlaylistProgress, None, float | None]:
+            """
+            Обходит страницы плейлиста и вычисляет общую продолжительность видео.
+
+            Страницы обрабатываются конвейером: идентификаторы видео страницы сразу передаются
+            в потоки videos.list, а текущий поток тем временем запрашивает следующую страницу.
+            В работе не больше pipeline_depth страниц, поэтому время обхода приближается
+            к длине цепочки playlistItems.list. Страницы учитываются по порядку, и после
+            каждой известен промежуточный итог.
+
+            Args:
+                playlist_identifier: Идентификатор плейлиста.
+                playlist_data: Метаданные плейлиста, дополняемые промежуточной продолжительностью.
+
+            Yields:
+                PlaylistProgress: Результат после каждой страницы.
+
+            Returns:
+                float | None: Общая продолжительность в секундах или None, если обход не удался.
 
             """
+            next_page_token = None
+            videos_processed = 0
+            requested: set[str] = set()
+            durations: dict[str, float | None] = {}
+            total_seconds = 0.0
+            pages = 0
+            # Страницы, ожидающие продолжительности видео, в порядке плейлиста
+            pending: deque[tuple[list[str], Future]] = deque()
+            # Потоки videos.list наследуют событие отмены и приоритет квоты вызова
+            context = copy_context()
+            
+            def collect() -> PlaylistProgress:
+                nonlocal total_seconds, videos_processed
+                page_video_ids, future = pending.popleft()
+                durations.update(future.result())
+                # Видео может встречаться в плейлисте несколько раз, поэтому суммируем по позициям
+                total_seconds += sum(durations.get(video_id) or 0 for video_id in page_video_ids)
+                videos_processed += len(page_video_ids)
+                playlist_data['duration'] = format_duration(total_seconds)
+                return PlaylistProgress(dict(playlist_data), videos_processed=videos_processed)
+            
             try:
-                next_page_token = None
-                video_ids = []
-                
                 while True:
-                    playlist_info_for_duration = self._access__api_resource.playlistItems().list(
+                    playlist_info_for_duration = self._execute('playlistItems.list', lambda api: api.playlistItems().list(
                         part='contentDetails',
                         playlistId=playlist_identifier,
                         maxResults=50,
                         pageToken=next_page_token
-                    ).execute()
+                    ), playlist_data['etag'])
+                    pages += 1
                     
-                    items = playlist_info_for_duration.get('items', [])
-                    for item in items:
+                    page_video_ids = []
+                    for item in playlist_info_for_duration.get('items', []):
                         content_details = item.get('contentDetails', {})
                         video_id = content_details.get('videoId', '')
                         if video_id:
-                            video_ids.append(video_id)
-
+                            page_video_ids.append(video_id)
+                    
+                    new_video_ids = [video_id for video_id in dict.fromkeys(page_video_ids) if video_id not in requested]
+                    requested.update(new_video_ids)
+                    if self.__video_workers is None:
+                        future = Future()
+                        future.set_result(self.__get_videos_duration(new_video_ids))
+                    else:
+                        future = self.__video_workers.submit(context.copy().run, self.__get_videos_duration, new_video_ids)
+                    pending.append((page_video_ids, future))
+                    
+                    # Готовые страницы учитываются сразу, а при заполненном конвейере — с ожиданием
+                    while pending and (pending[0][1].done() or len(pending) > self._pipeline_depth):
+                        yield collect()
+                    
                     next_page_token = playlist_info_for_duration.get('nextPageToken')
-
                     if not next_page_token:
                         break
-                    
+                
+                while pending:
+                    yield collect()
+            
+            except RequestCancelledError:
+                raise
+            except QuotaExceededError as e:
+                logger.warning('Обход плейлиста прерван: %s', e)
+                return None
             except Exception as e:
-                print(f'Произошла ошибка при получении данных о странице плейлиста: {e}')
-                return 'Нет данных'
+                logger.error('Произошла ошибка при обходе плейлиста %s: %s', playlist_identifier, e)
+                return None
+            finally:
+                # Обход прерван: еще не начатые запросы продолжительности не нужны
+                for _, future in pending:
+                    future.cancel()
             
-            try:
-                duration_formatted = 0
+            PLAYLIST_PAGES.observe(pages)
+            
+            missing = sum(1 for duration in durations.values() if duration is None)
+            if missing:
+                logger.warning('Недоступно видео (удалены или приватные): %d', missing)
+            logger.info(
+                'Получена продолжительность %d видео плейлиста %s: страниц %d',
+                len(durations), playlist_identifier, pages
+            )
+            
+            return total_seconds
+        
+        
+        def __get_videos_duration(self, video_ids: list[str]) -> dict[str, float | None]:
+            """
+            Получает продолжительность видео: актуальные значения берутся из базы данных,
+            остальные запрашиваются пакетами по VIDEOS_BATCH_SIZE идентификаторов за запрос.
+
+            Args:
+                video_ids: Список идентификаторов видео.
+
+            Returns:
+                dict[str, float | None]: Продолжительность в секундах для каждого видео.
+                    Удаленные и приватные видео API не возвращает, для них значение None.
+
+            Raises:
+                HttpError: Если происходит HTTP-ошибка при запросе к YouTube API.
+
+            """
+            unique_video_ids = list(dict.fromkeys(video_ids))
+            durations: dict[str, float | None] = {}
+            if self._video_store is not None and unique_video_ids:
+                durations = self._video_store.get_video_durations(unique_video_ids, self._video_duration_ttl)
+            
+            video_ids_to_fetch = [video_id for video_id in unique_video_ids if video_id not in durations]
+            fetched: dict[str, float | None] = {}
+            batch_timings: list[float] = []
+            
+            for start in range(0, len(video_ids_to_fetch), VIDEOS_BATCH_SIZE):
+                batch = video_ids_to_fetch[start:start + VIDEOS_BATCH_SIZE]
+                started_at = perf_counter()
                 
-                for video in video_ids:
-                    video_info = self._access__api_resource.videos().list(
-                        part='contentDetails',
-                        id=video
-                    ).execute()
-                    
-                    content_details = video_info.get('items', [{}])[0].get('contentDetails', {})
-                    duration_str = content_details.get('duration', 'PT0S')
-                    duration_seconds = parse_duration(duration_str).total_seconds()
-                    duration_formatted += duration_seconds
+                videos_info = self._execute('videos.list', lambda api: api.videos().list(
+                    part='contentDetails',
+                    id=','.join(batch)
+                ))
                 
-                hours = int(duration_formatted // 3600)
-                minutes = int((duration_formatted % 3600) // 60)
-                seconds = int(duration_formatted % 60)
-                duration_formatted = f'{hours:}:{minutes:}:{seconds:}'
+                fetched.update(dict.fromkeys(batch))
+                for item in videos_info.get('items', []):
+                    duration_str = item.get('contentDetails', {}).get('duration', 'PT0S')
+                    fetched[item['id']] = parse_duration(duration_str).total_seconds()
                 
-                return duration_formatted
+                batch_timings.append(perf_counter() - started_at)
+                logger.debug(
+                    'Пакет videos.list №%d: %d видео за %.3f с',
+                    len(batch_timings), len(batch), batch_timings[-1]
+                )
             
-            except Exception as e:
-                print(f'Произошла ошибка при получении данных о видео!: {e}')
+            if self._video_store is not None and fetched:
+                self._video_store.save_video_durations(fetched)
+            
+            durations.update(fetched)
+            if batch_timings:
+                logger.debug(
+                    'Получена продолжительность %d видео (из базы данных %d): пакетов %d, всего %.3f с',
+                    len(durations), len(durations) - len(fetched), len(batch_timings), sum(batch_timings)
+                )
             
+            return durations
+            
+
+        def close(self) -> None:
+            if self.__video_workers is not None:
+                self.__video_workers.shutdown(wait=False, cancel_futures=True)
+        
+        
+        def extract_identifier(self, playlist_identifier: str) -> str:
+            """
+            Извлекает идентификатор плейлиста из URL или возвращает переданный идентификатор.
+
+            Args:
+                playlist_identifier: Строка с URL или ID плейлиста.
+
+            Returns:
+                str: Идентификатор плейлиста.
+
+            Raises:
+                InvalidPlaylistIdFormatError: Если идентификатор плейлиста неверного формата.
 
+            """
+            return self.__extract_playlist_identifier(playlist_identifier)
+        
+        
         def __extract_playlist_identifier(self, playlist_identifier: str) -> str:  
             """
             Извлекает идентификатор плейлиста из переданной строки.
@@ -205,18 +726,12 @@ class YouTubeAPIClientV3:
                 InvalidPlaylistIdFormatError: Если идентификатор плейлиста неверного формата.
 
             """          
-            parsed_url = urlparse(playlist_identifier)
-            query_params = parse_qs(parsed_url.query)
-
-            if 'list' in query_params:
-                playlist_identifier = query_params['list'][0]
-
-            if playlist_identifier and all(
-                (
-                    isinstance(playlist_identifier, str), 
-                    playlist_identifier.startswith('PL'), 
-                    len(playlist_identifier) == 34)
-            ):
+            # Идентификатор, уже извлеченный фильтром, повторно не разбирается
+            if is_playlist_identifier(playlist_identifier):
                 return playlist_identifier
 
+            playlist_identifiers = extract_playlist_identifiers(playlist_identifier)
+            if playlist_identifiers:
+                return playlist_identifiers[0]
+
             raise InvalidPlaylistIdFormatError(playlist_identifier)
\ No newline at end of file
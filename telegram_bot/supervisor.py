@@ -0,0 +1,258 @@
+# Многопроцессный режим: супервизор получает обновления и распределяет их по рабочим процессам
+import asyncio
+import multiprocessing
+import signal
+from functools import partial
+from queue import Empty
+from typing import Callable
+from aiogram import Dispatcher
+from aiogram.types import Update
+from config.config import bot, load_config_supervisor, load_config_webhook
+from keyboards.set_menu import set_main_menu
+from server.webhook import build_forwarding_app, serve
+from utils.logger import forward_logs_to, listen_worker_logs, logger
+
+
+# Таймаут длинного опроса getUpdates в секундах
+POLLING_TIMEOUT = 30
+
+# Пауза перед повтором getUpdates после ошибки сети или Telegram
+POLLING_RETRY_DELAY = 5
+
+# Сколько ждать готовности рабочих процессов при запуске
+WORKER_START_TIMEOUT = 120
+
+
+def update_chat_id(update: dict) -> int:
+    """
+    Возвращает идентификатор чата обновления, по которому выбирается рабочий процесс.
+
+    Для обновлений без чата (например, inline-запросов) используется идентификатор пользователя,
+    а если нет и его — идентификатор обновления.
+
+    Args:
+        update (dict): Обновление в формате Bot API.
+
+    Returns:
+        int: Ключ маршрутизации.
+    """
+    for event in update.values():
+        if not isinstance(event, dict):
+            continue
+        chat = event.get('chat') or (event.get('message') or {}).get('chat')
+        if chat:
+            return chat['id']
+        user = event.get('from') or event.get('user')
+        if user:
+            return user['id']
+    return update.get('update_id', 0)
+
+
+def build_dispatcher(index: int = 0) -> Dispatcher:
+    """
+    Создает диспетчер рабочего процесса с обработчиками бота.
+
+    Обработчики импортируются здесь, а не в начале модуля, чтобы супервизор не загружал их
+    зависимости; база данных и клиент YouTube API создаются в обработчике startup диспетчера.
+    Каждый рабочий процесс отдает свои метрики на порту METRICS_PORT + index, потому что
+    счетчики хранятся в памяти процесса. Фоновое обновление плейлистов запускается только
+    в рабочем процессе 0, чтобы процессы не обновляли одни и те же плейлисты.
+
+    Args:
+        index (int): Номер рабочего процесса.
+
+    Returns:
+        Dispatcher: Диспетчер с подключенными роутерами.
+    """
+    from handlers.handler import handler_router, register_background_tasks
+
+    dp = Dispatcher()
+    dp.include_router(handler_router)
+    register_background_tasks(dp, metrics_port_offset=index, run_refresher=index == 0)
+    return dp
+
+
+async def process_update(dp: Dispatcher, update: dict, previous: asyncio.Task | None) -> None:
+    """Обрабатывает обновление после завершения предыдущего обновления того же чата"""
+    if previous is not None:
+        await asyncio.wait([previous])
+    try:
+        await dp.feed_update(bot, Update.model_validate(update, context={'bot': bot}))
+    except Exception:
+        logger.exception('Ошибка при обработке обновления %s', update.get('update_id'))
+
+
+async def serve_updates(index: int, updates, ready, dispatcher_factory: Callable[[int], Dispatcher]) -> None:
+    """
+    Цикл рабочего процесса: читает обновления из очереди до получения None.
+
+    Обновления разных чатов обрабатываются конкурентно, обновления одного чата — строго по очереди.
+    """
+    dp = dispatcher_factory(index)
+    await dp.emit_startup(bot=bot, dispatcher=dp)
+    ready.put(index)
+
+    loop = asyncio.get_running_loop()
+    chat_tails: dict[int, asyncio.Task] = {}
+
+    def forget(chat_id: int, task: asyncio.Task) -> None:
+        if chat_tails.get(chat_id) is task:
+            del chat_tails[chat_id]
+
+    while (update := await loop.run_in_executor(None, updates.get)) is not None:
+        chat_id = update_chat_id(update)
+        task = asyncio.create_task(process_update(dp, update, chat_tails.get(chat_id)))
+        chat_tails[chat_id] = task
+        task.add_done_callback(partial(forget, chat_id))
+
+    if chat_tails:
+        await asyncio.wait(list(chat_tails.values()))
+    await dp.emit_shutdown(bot=bot, dispatcher=dp)
+    await bot.session.close()
+
+
+def run_worker(index: int, updates, logs, ready, dispatcher_factory: Callable[[int], Dispatcher]) -> None:
+    """
+    Точка входа рабочего процесса.
+
+    Args:
+        index (int): Номер рабочего процесса.
+        updates (multiprocessing.Queue): Очередь обновлений этого процесса.
+        logs (multiprocessing.Queue): Очередь записей журнала супервизора.
+        ready (multiprocessing.Queue): Очередь, в которую процесс сообщает о готовности.
+        dispatcher_factory (Callable[[int], Dispatcher]): Функция создания диспетчера по номеру процесса.
+
+    Returns:
+        None
+    """
+    # Остановкой рабочих процессов управляет супервизор, Ctrl+C обрабатывает только он
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    forward_logs_to(logs)
+    asyncio.run(serve_updates(index, updates, ready, dispatcher_factory))
+
+
+class Supervisor:
+    """
+    Пул рабочих процессов бота.
+
+    Каждый рабочий процесс держит свой диспетчер, клиент YouTube API и соединение с базой
+    данных SQLite (режим WAL допускает несколько процессов). Обновление направляется в процесс
+    по хэшу идентификатора чата, поэтому обновления одного чата обрабатываются по порядку.
+    Метрики рабочего процесса index доступны на порту METRICS_PORT + index.
+
+    Attributes:
+        workers (int): Количество рабочих процессов.
+
+    Methods:
+        start() -> None:
+            Запускает рабочие процессы и дожидается их готовности.
+        dispatch(update: dict) -> None:
+            Передает обновление рабочему процессу.
+        stop() -> None:
+            Дожидается обработки переданных обновлений и останавливает рабочие процессы.
+
+    """
+    def __init__(self, workers: int, dispatcher_factory: Callable[[int], Dispatcher] = build_dispatcher) -> None:
+        self.workers = workers
+        # spawn: рабочий процесс не наследует потоки супервизора (журнал, пул потоков)
+        context = multiprocessing.get_context('spawn')
+        self.__logs = context.Queue()
+        self.__ready = context.Queue()
+        self.__queues = [context.Queue() for _ in range(workers)]
+        self.__processes = [
+            context.Process(
+                target=run_worker,
+                args=(index, queue, self.__logs, self.__ready, dispatcher_factory),
+                name=f'bot-worker-{index}'
+            )
+            for index, queue in enumerate(self.__queues)
+        ]
+        self.__log_listener = None
+
+    def start(self) -> None:
+        self.__log_listener = listen_worker_logs(self.__logs)
+        for process in self.__processes:
+            process.start()
+
+        pending = self.workers
+        while pending:
+            try:
+                index = self.__ready.get(timeout=WORKER_START_TIMEOUT)
+            except Empty:
+                self.stop()
+                raise RuntimeError('Рабочие процессы не запустились за отведенное время')
+            logger.info('Рабочий процесс %d готов', index)
+            pending -= 1
+
+    def dispatch(self, update: dict) -> None:
+        self.__queues[hash(update_chat_id(update)) % self.workers].put(update)
+
+    def stop(self) -> None:
+        for queue in self.__queues:
+            queue.put(None)
+        for process in self.__processes:
+            if process.is_alive():
+                process.join()
+        if self.__log_listener is not None:
+            self.__log_listener.stop()
+            self.__log_listener = None
+        logger.info('Рабочие процессы остановлены')
+
+
+async def poll_updates(supervisor: Supervisor) -> None:
+    """
+    Получает обновления длинным опросом и передает их рабочим процессам.
+
+    Args:
+        supervisor (Supervisor): Пул рабочих процессов.
+
+    Returns:
+        None
+    """
+    await bot.delete_webhook(drop_pending_updates=True)
+    offset = None
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=POLLING_TIMEOUT)
+        except Exception as e:
+            logger.error('Ошибка при получении обновлений: %s', e)
+            await asyncio.sleep(POLLING_RETRY_DELAY)
+            continue
+        for update in updates:
+            supervisor.dispatch(update.model_dump(mode='json', by_alias=True, exclude_none=True))
+            offset = update.update_id + 1
+
+
+async def receive_updates(supervisor: Supervisor) -> None:
+    """Получает обновления через вебхук или длинный опрос в зависимости от BOT_MODE"""
+    config_webhook = load_config_webhook('.env')
+    await set_main_menu(bot)
+    try:
+        if config_webhook.mode == 'webhook':
+            app = build_forwarding_app(bot, config_webhook.webhook, supervisor.dispatch)
+            await serve(app, config_webhook.webhook)
+        else:
+            await poll_updates(supervisor)
+    finally:
+        await bot.session.close()
+
+
+def main() -> None:
+    """
+    Запускает супервизор с BOT_WORKERS рабочими процессами.
+    """
+    config = load_config_supervisor('.env')
+    logger.info('Starting bot supervisor with %d workers', config.supervisor.workers)
+
+    supervisor = Supervisor(config.supervisor.workers)
+    supervisor.start()
+    try:
+        asyncio.run(receive_updates(supervisor))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+
+
+if __name__ == '__main__':
+    main()
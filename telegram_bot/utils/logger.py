@@ -1,25 +1,95 @@
+import atexit
+import gzip
 import logging
+import os
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from queue import SimpleQueue
 from config.config import load_config_logger
 
 
+LOG_FORMAT = "%(filename)s:%(lineno)d #%(levelname)-8s [%(asctime)s] - %(name)s - %(message)s"
+
+
+def gzip_namer(name: str) -> str:
+    """Имя архивного сегмента журнала: bot.log.1 -> bot.log.1.gz"""
+    return f'{name}.gz'
+
+
+def gzip_rotator(source: str, dest: str) -> None:
+    """Сжимает закрытый сегмент журнала и удаляет несжатый файл"""
+    with open(source, 'rb') as source_file, gzip.open(dest, 'wb') as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
 
 config = load_config_logger()
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(filename)s:%(lineno)d #%(levelname)-8s "
-    "[%(asctime)s] - %(name)s - %(message)s",
-)
+# Файловый обработчик с ротацией по времени (LOG_ROTATE_WHEN) или по размеру (LOG_MAX_BYTES)
+if config.logger.rotate_when:
+    file_handler = TimedRotatingFileHandler(
+        filename=config.logger.path_log,
+        when=config.logger.rotate_when,
+        backupCount=config.logger.backup_count,
+        encoding='utf-8')
+else:
+    file_handler = RotatingFileHandler(
+        filename=config.logger.path_log,
+        maxBytes=config.logger.max_bytes,
+        backupCount=config.logger.backup_count,
+        encoding='utf-8')
+
+file_handler.namer = gzip_namer
+file_handler.rotator = gzip_rotator
+file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+# Обработчики выполняются в фоновом потоке QueueListener: запись в файл, ротация и сжатие
+# не задерживают обработку обновлений, корневой логгер только кладет записи в очередь
+log_queue: SimpleQueue = SimpleQueue()
+listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(QueueHandler(log_queue))
+
+listener.start()
+atexit.register(listener.stop)
+
+
+def listen_worker_logs(queue) -> QueueListener:
+    """
+    Запускает прием записей журнала из рабочих процессов в файловый и консольный обработчики этого процесса.
+
+    Args:
+        queue (multiprocessing.Queue): Очередь, в которую рабочие процессы передают записи.
+
+    Returns:
+        QueueListener: Запущенный слушатель; останавливается вызывающим кодом.
+    """
+    worker_listener = QueueListener(queue, console_handler, file_handler, respect_handler_level=True)
+    worker_listener.start()
+    return worker_listener
+
 
+def forward_logs_to(queue) -> None:
+    """
+    Перенаправляет журнал рабочего процесса в очередь процесса-супервизора.
 
-# config.logger.path_log
-file_handler = logging.FileHandler(
-    filename=config.logger.path_log, 
-    encoding='utf-8')
+    Файл журнала пишет и ротирует только супервизор, поэтому процессы не мешают друг другу.
 
-file_handler.setFormatter(
-    logging.Formatter("%(filename)s:%(lineno)d #%(levelname)-8s [%(asctime)s] - %(name)s - %(message)s")
-)
+    Args:
+        queue (multiprocessing.Queue): Очередь, которую слушает listen_worker_logs в супервизоре.
 
-logging.getLogger().addHandler(file_handler)
\ No newline at end of file
+    Returns:
+        None
+    """
+    listener.stop()
+    atexit.unregister(listener.stop)
+    file_handler.close()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(QueueHandler(queue))
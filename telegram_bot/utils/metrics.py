@@ -0,0 +1,178 @@
+from bisect import bisect_left
+from threading import Lock
+
+
+# Границы корзин гистограмм задержки в секундах: от быстрых ответов до долгого обхода плейлиста
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Зарегистрированные метрики в порядке создания
+_registry: list['Counter | Gauge | Histogram'] = []
+
+
+def _escape(value: str) -> str:
+    """Экранирует значение метки: обратная косая черта, кавычка и перевод строки"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    """Форматирует значение без округления: формат :g теряет разряды уже у чисел больше миллиона"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...], extra: str = '') -> str:
+    """Формирует набор меток в формате Prometheus: {name="value",...}"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """
+    Счетчик, который только увеличивается.
+
+    Attributes:
+        name (str): Имя метрики.
+        documentation (str): Описание метрики для строки HELP.
+        label_names (tuple[str, ...]): Имена меток.
+
+    Methods:
+        inc(*label_values: str, amount: float = 1) -> None:
+            Увеличивает значение счетчика для набора меток.
+        render() -> list[str]:
+            Возвращает строки метрики в текстовом формате Prometheus.
+
+    """
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.__lock = Lock()
+        self.__values: dict[tuple[str, ...], float] = {}
+        _registry.append(self)
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self.__lock:
+            self.__values[label_values] = self.__values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        with self.__lock:
+            values = list(self.__values.items())
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for label_values, value in values:
+            lines.append(f'{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}')
+        return lines
+
+
+class Gauge:
+    """
+    Показатель, значение которого задается целиком: остаток, размер, число занятых ресурсов.
+
+    Значение устанавливает код, владеющий состоянием, в момент его изменения, поэтому выдача
+    метрик не обращается к базе данных и не берет чужих блокировок.
+
+    Attributes:
+        name (str): Имя метрики.
+        documentation (str): Описание метрики для строки HELP.
+        label_names (tuple[str, ...]): Имена меток.
+
+    Methods:
+        set(value: float, *label_values: str) -> None:
+            Устанавливает значение для набора меток.
+        render() -> list[str]:
+            Возвращает строки метрики в текстовом формате Prometheus.
+
+    """
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.__lock = Lock()
+        self.__values: dict[tuple[str, ...], float] = {}
+        _registry.append(self)
+
+    def set(self, value: float, *label_values: str) -> None:
+        with self.__lock:
+            self.__values[label_values] = value
+
+    def render(self) -> list[str]:
+        with self.__lock:
+            values = list(self.__values.items())
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        for label_values, value in values:
+            lines.append(f'{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """
+    Гистограмма наблюдаемых значений с фиксированными корзинами.
+
+    Наблюдение стоит одного двоичного поиска и нескольких сложений под блокировкой,
+    накопительные значения корзин считаются только при выдаче метрик.
+
+    Attributes:
+        name (str): Имя метрики.
+        documentation (str): Описание метрики для строки HELP.
+        label_names (tuple[str, ...]): Имена меток.
+        buckets (tuple[float, ...]): Верхние границы корзин по возрастанию.
+
+    Methods:
+        observe(value: float, *label_values: str) -> None:
+            Учитывает наблюдаемое значение для набора меток.
+        render() -> list[str]:
+            Возвращает строки метрики в текстовом формате Prometheus.
+
+    """
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self.__lock = Lock()
+        # Для каждого набора меток: количество попаданий в корзины (последняя — +Inf), сумма и количество
+        self.__values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        _registry.append(self)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__values.get(label_values)
+            if series is None:
+                series = self.__values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> list[str]:
+        with self.__lock:
+            values = [(labels, list(counts), total[0]) for labels, (counts, total) in self.__values.items()]
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for label_values, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                le = f'le="{bound if isinstance(bound, str) else f"{bound:g}"}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, label_values, le)} {cumulative}')
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+def render_metrics() -> str:
+    """
+    Возвращает все зарегистрированные метрики в текстовом формате Prometheus.
+
+    Returns:
+        str: Текст для ответа на запрос /metrics.
+    """
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
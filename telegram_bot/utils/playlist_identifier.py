@@ -0,0 +1,52 @@
+import re
+
+
+# Идентификаторы плейлистов, которые возвращает playlists.list, с точной длиной, чтобы обычные слова
+# вроде PLEASE_HELP_ME не принимались за плейлист: обычные (PL + 16 или 32 символа), загрузки канала
+# (UU + 22 символа идентификатора канала, в том числе UULF, UUSH и т. п.), избранное (FL + 22)
+# и альбомы YouTube Music (OLAK5uy_ + 33). Миксы (RD) через API недоступны
+PLAYLIST_ID = (
+    r'(?:PL(?:[A-Za-z0-9_-]{32}|[A-Za-z0-9_-]{16})'
+    r'|UU(?:[A-Z]{2})?[A-Za-z0-9_-]{22}'
+    r'|FL[A-Za-z0-9_-]{22}'
+    r'|OLAK5uy_[A-Za-z0-9_-]{33})'
+)
+
+# Один проход по тексту находит и ссылки, и отдельные идентификаторы:
+# youtube.com (в том числе www., m. и music.) и youtu.be с параметром list=, а также идентификатор без ссылки.
+# Схема и поддомен не сопоставляются: поиск начинается с имени хоста, что заметно быстрее на длинных текстах.
+# Идентификатор должен заканчиваться на границе слова и в ссылке, поэтому слишком длинное значение list= отклоняется,
+# а не обрезается
+PLAYLIST_PATTERN = re.compile(
+    r'(?<![\w-])(?:'
+    r'(?:youtube\.com|youtu\.be)/\S*?[?&]list=(?P<url_id>' + PLAYLIST_ID + r')(?![\w-])'
+    r'|(?P<id>' + PLAYLIST_ID + r')(?![\w-])'
+    r')'
+)
+
+# Подстроки, без которых в тексте не может быть идентификатора плейлиста
+PLAYLIST_ID_MARKERS = ('PL', 'UU', 'FL', 'OLAK5uy_')
+
+PLAYLIST_ID_PATTERN = re.compile(PLAYLIST_ID)
+
+
+def extract_playlist_identifiers(text: str) -> list[str]:
+    """
+    Находит в тексте все ссылки на плейлисты YouTube и идентификаторы плейлистов.
+
+    Args:
+        text (str): Текст сообщения.
+
+    Returns:
+        list[str]: Идентификаторы плейлистов без повторов в порядке появления в тексте.
+    """
+    # Большинство сообщений без ссылок отсекается поиском подстрок, без запуска регулярного выражения
+    if not any(marker in text for marker in PLAYLIST_ID_MARKERS):
+        return []
+    # dict сохраняет порядок и убирает повторы
+    return list(dict.fromkeys(match['url_id'] or match['id'] for match in PLAYLIST_PATTERN.finditer(text)))
+
+
+def is_playlist_identifier(text: str) -> bool:
+    """Проверяет, что строка целиком является идентификатором плейлиста"""
+    return PLAYLIST_ID_PATTERN.fullmatch(text) is not None